@@ -20,106 +20,31 @@ Additional features:
 - Printout at the end of the program showing how often the subject switched
     their choice from own & computers choice in previous round.
 
+The logic of the game (biases, choice of the computer, scoring) lives in
+game_logic.py. psychopy is only imported once the game is started via main(),
+so importing this module doesn't open a window.
+
 The code has been checked to stick to the PEP 8 conventions using pycodestyle.
 """
 # %% imports
 
+import atexit
+import json
 import os
-import random
-from psychopy import event, core, visual
-
-# %% Window, text stimuli, paths to images and score_function
-
-win = visual.Window(color='black')
-
-welcome_text = """
-Welcome to my experiment. You will play matching pennies against the computer.
-
-Press any key to begin."""
-
-instruction_text = """You are the "even" player, i.e. you win a given round
-when the amount of heads and tails presented by you and the computer together
-is even. Press 'h' for head and 't' for tails.
-
-To exit, press q."""
-
-welcome = visual.TextStim(win, text=welcome_text)
-instruction = visual.TextStim(win, text=instruction_text)
-
-winner = visual.TextStim(win, text='YOU WIN!', pos=(0, 0.6), color='green')
-loser = visual.TextStim(win, text='YOU LOSE!', pos=(0, 0.6), color='red')
-
-txt_user = visual.TextStim(win, pos=(-0.5, 0.42), text='Your choice:')
-txt_com = visual.TextStim(win, pos=(0.5, 0.42), text="Computer's choice:")
-txt_continue = visual.TextStim(win, pos=(0, -0.85),
-                               text="Press any key to continue", height=0.08)
-
-# save path of images used later on
-f_heads = os.path.join("data", "penny_heads.png")
-f_tails = os.path.join("data", "penny_tails.png")
-
-
-def score_function(wins, losses):
-    """
-    Generates visual.text.TextStim with score of the current round and
-    specifies its location on the screen
-
-    Parameters
-    ----------
-    wins : int
-        stores the amount of wins of the subject
-    losses : int
-        stores the amount of losses of the subject
-
-    Returns
-    -------
-    score: visual.text.TextStim
-            Visual stimulus of the current score ready to be displayed
-    """
-    txt_score = """Score:
-{} - {}"""
-    txt_score = txt_score.format(wins, losses)
-    score = visual.TextStim(win, pos=(0, 0.86), text=txt_score)
-    return score
-
-# %% quit function and global quit key 'escape'
-
-
-# No Docstring for the quit function because it's exremely short & obvious.
-# It simply takes two functions as input and returns both. It is used below for
-# global event keys
-def quit_function(func_1, func_2):
-    return func_1 and func_2
-
-
-# clears global keys
-event.globalKeys.clear()
-# escape key can be used quit the experiment at any time also skipping the end
-# screen, probably most useful for experimenter despite reoccuring
-# AttributeError used as a faster exit option throughout the whole program
-event.globalKeys.add(key='escape', func=quit_function(core.quit, win.close))
-# Source for global event keys: https://www.psychopy.org/coder/globalKeys.html
-
-# %%Intro screens
-
-welcome.draw()
-win.flip()
-event.waitKeys()
-
-instruction.draw()
-txt_continue.draw()
-win.flip()
-event.waitKeys()
-
-# %% some self-explanatory variables
-
-wins = 0
-losses = 0
-rounds = 1
-choice_change_subject = 0
-choice_change_computer = 0
-prev_com_choice = 0
-prev_subj_choice = 0
+import time
+from types import SimpleNamespace
+
+from game_logic import choice_change_function, round_result_function
+from frame_timing import FlipRecorder
+from preloading import Preloader, wait_for
+from running_stats import RunningStats
+from session_history import SessionHistory
+from session_log import write_session_log
+from session_random import SessionRandom
+from strategies import compose_strategy
+from texture_cache import cached_texture, target_size_function
+from trial_logger import TrialLogger
+from trial_states import TrialStateMachine
 
 # %% bias variables
 
@@ -139,541 +64,784 @@ bias = 0.4
 # user could be asked to find out the bias of the computer which is changed at
 # times
 
-# change one of the following biases to True if you want that bias to be
-# implemented. To make the program flexible, the biases can be freely combined
-# amongst each other except for the frustrator, which cannot be combined with
-# another bias. Note that the effects of some biases cancel each other out or
+# add the names of the strategies you want the computer to use to the
+# "computer_strategies"-list, e.g. ['bias_heads']. To make the program
+# flexible, the biases can be freely combined amongst each other except for
+# the frustrator and the predictive opponents, which cannot be combined with
+# anything else. Note that the effects of some biases cancel each other out or
 # might cause the computer to stick to heads or tails indefinetely (depending
-# also on the value of bias). So choose wisely!
-
-# To bias the computer towards choosing heads more often, set the
-# "bias_heads"-variable to True (and perhaps adjust the bias above)
-bias_heads = False
-# To bias the computer towards choosing tails more often, set the
-# "bias_tails"-variable to True (and perhaps adjust the bias above)
-bias_tails = False
-
-# To bias the computer towards sticking to its own previous choice more often,
-# set the "bias_stick_to_prev_com_choice"-variable to True (and perhaps adjust
-# the bias above)
-bias_stick_to_prev_com_choice = False
-# To bias the computer towards switching from its own previous choice more
-# often, set the "bias_switch_from_prev_com_choice"-variable to True (and
-# perhaps adjust the bias above)
-bias_switch_from_prev_com_choice = False
-
-# To bias the computer towards sticking to the user's previous choice more
-# often, set the "bias_stick_to_prev_user_choice"-variable to True (and perhaps
-# adjust the bias above)
-bias_stick_to_prev_user_choice = False
-# To bias the computer towards switching from the user's previous choice more
-# often, set the "bias_switch_from_prev_com_choice"-variable to True (and
-# perhaps adjust the bias above)
-bias_switch_from_prev_user_choice = False
+# also on the value of bias). So choose wisely! New strategies can be added in
+# strategies.py.
+
+# 'bias_heads' biases the computer towards choosing heads more often,
+# 'bias_tails' towards choosing tails more often (perhaps adjust the bias
+# above).
+
+# 'bias_stick_to_prev_com_choice' biases the computer towards sticking to its
+# own previous choice more often, 'bias_switch_from_prev_com_choice' towards
+# switching from its own previous choice more often (perhaps adjust the bias
+# above).
+
+# 'bias_stick_to_prev_user_choice' biases the computer towards sticking to the
+# user's previous choice more often, 'bias_switch_from_prev_user_choice'
+# towards switching from the user's previous choice more often (perhaps adjust
+# the bias above).
 
 # In case you want to be evil and turn the computer into a frustrator, i.e. a
 # device that always chooses the opposite of the user and thus guarantees that
-# the user looses, set the "frustrator"-variable to True.
-frustrator = False
+# the user looses, use 'frustrator'.
+
+# Instead of the biases above, the computer can try to predict the user's next
+# choice from the user's and its own choices in the last rounds and choose the
+# opposite. 'ngram' bases the prediction on a fixed amount of rounds.
+# "ngram_length" is that amount and "ngram_decay" (between 0 and 1) determines
+# how quickly old rounds are forgotten (1 means never, see ngram_opponent.py).
+# 'context_tree' looks back as far as it is useful, up to "context_depth"
+# rounds, and never stores more than "context_nodes" contexts, so it suits
+# very long sessions (see context_tree_opponent.py)
+computer_strategies = []
+ngram_length = 4
+ngram_decay = 1.0
+context_depth = 12
+context_nodes = 10000
+
+# all random decisions of the computer come from a stream of random numbers
+# started with this seed. The seed of every session is saved to the data
+# folder (session_<date>_<time>.json), so to replay a session (e.g. with
+# MatchingPenniesEngine and the logged choices of the subject) or to play
+# against exactly the same computer again, set "seed" to that number. None
+# means a new random seed every time
+seed = None
+
+## As an adaptation of the program, one might use the data collected (as the
+# amount of attempts and reaction times, see TrialLogger) from user reacting to
+# frustrator in order to get e.g. some proxy of frustration tolerance or trust
+# in the experimenter
+
+# %% texts, paths to images and positions of the stimuli
 
-## As an adaptation of the program, one might collect data (as the amount of
-# attempts and reaction times) from user reacting to frustrator in order to get
-# e.g. some proxy of frustration tolerance or trust in the experimenter
+welcome_text = """
+Welcome to my experiment. You will play matching pennies against the computer.
 
-# %% several functions, start of loop and cut_off variable
+Press any key to begin."""
 
+instruction_text = """You are the "even" player, i.e. you win a given round
+when the amount of heads and tails presented by you and the computer together
+is even. Press 'h' for head and 't' for tails.
 
-def allowed_bias_combis(bias_heads, bias_tails, bias_stick_to_prev_com_choice,
-                        bias_switch_from_prev_com_choice,
-                        bias_stick_to_prev_user_choice,
-                        bias_switch_from_prev_user_choice, frustrator):
-    """
-    Checks if the combination of biases is valid, raises an error if not.
-    Closes win before raising the error to prevent win from getting stuck.
+To exit, press q."""
 
-    Parameters
-    ----------
-    bias_heads : bool
-        stores whether the computer should be biased towards choosing heads.
-    bias_tails : bool
-        stores whether the computer should be biased towards choosing tails.
-    bias_stick_to_prev_com_choice : bool
-        stores whether the computer should be biased towards sticking to its
-        previous choice.
-    bias_switch_from_prev_com_choice : bool
-        stores whether the computer should be biased towards switching from its
-        previous choice.
-    bias_stick_to_prev_user_choice : bool
-        stores whether the computer should be biased towards sticking to the
-        user's previous choice.
-    bias_switch_from_prev_user_choice : bool
-        stores whether the computer should be biased towards sticking to the
-        user's previous choice.
-    frustrator : bool
-        stores whether the computer should always choose the opposite of the
-        user.
+# infos for user at the end of each round (see main)
+game_info_text = """Up until round {}, you won {} times and lost {} times.
+You changed your own choice {} times. You changed {} times from the computer's
+choice in the previous round."""
 
-    Raises
-    ------
-    ValueError
-        raises an exception if the bias function frustrator is combined with
-        other functions. This is because the frustrator doesn't work with
-        probabilites and necessarily simply overwrites all other biases.
-    """
-    if frustrator is True:
-        if (bias_heads or bias_tails or bias_stick_to_prev_com_choice or
-            bias_switch_from_prev_com_choice or bias_stick_to_prev_user_choice
-                or bias_switch_from_prev_user_choice) is True:
-            win.close()
-            raise ValueError("""Frustrator is not compatible with other biases
-                             as it would simply cover all other possible
-                             effects""")
-
-
-# run the function right away to test for bad bias combis
-allowed_bias_combis(bias_heads, bias_tails, bias_stick_to_prev_com_choice,
-                    bias_switch_from_prev_com_choice,
-                    bias_stick_to_prev_user_choice,
-                    bias_switch_from_prev_user_choice, frustrator)
-
-
-# function to give error message for bad values of the bias and except for
-# that only returns the bias
-def bias_function(bias):
-    """
-    Simply returns the bias. Closes win before raising the error to prevent win
-    from getting stuck.
+# statistics of the user's play, shown below the game info (see
+# running_stats.py and stats_text_function)
+stats_text = """
+Your win rate is {} (95% confidence interval: {} to {}).
+After a win, you switched {} of the time, after a loss {}.
+Overall, you switched your choice in {} of the rounds.
+The randomness (entropy) of your choices is {} bits."""
 
-    Parameters
-    ----------
-    bias : float
-        the bias of the computer chosen by the experimenter.
+# save path of images used later on
+f_heads = os.path.join("data", "penny_heads.png")
+f_tails = os.path.join("data", "penny_tails.png")
 
-    Raises
-    ------
-    ValueError
-        raises an exception if the bias is smaller than -0.5 or bigger than 0.5
-        as this would in the end mean that the program had to calculate
-        probabilities smaller than 0 or bigger than 1.
+# size of the pennies on the screen (normalized units). The images are scaled
+# to the pixels they cover in the window once and saved in this folder, so
+# that the (much bigger) original images don't have to be decoded and
+# uploaded every time (see texture_cache.py)
+penny_size = (0.68, 0.92)
+texture_folder = os.path.join("data", "textures")
 
-    Returns
-    -------
-    bias : float
-        the bias of the computer chosen by the experimenter.
-    """
-    if bias < -0.5:
-        win.close()
-        raise ValueError("""You chose a value for bias that is smaller than
-                         -0.5. As the cut-off value is equal to 0.5, which is
-                         used to compute probabilities, adding a value smaller
-                         than -0.5 makes the probability negative. Probabilites
-                         however are always >= 0 (at least on standard
-                         interpretations of probabilities). Try a value that is
-                         between -0.5 and 0.5 instead!""")
-    if bias > 0.5:
-        win.close()
-        raise ValueError("""You chose a value for bias that is bigger than
-                         0.5. As the cut-off value is equal to 0.5, which is
-                         used to compute probabilities, adding a value bigger
-                         than 0.5 makes the probability > 1. Probabilites
-                         however are always <= 1 (at least on standard
-                         interpretations of probabilities). Try a value that is
-                         between -0.5 and 0.5 instead!""")
-    return bias
-
-
-def stick_to_prev_com_choice_function(prev_com_choice, cut_off, bias):
+# every round is logged to a csv file in this folder, named after the time
+# the game was started
+log_folder = "data"
+
+# set to True to record the timing of every flip of the window. The flips and
+# a summary per screen (intro, round, feedback, info, end) with the dropped
+# frames and percentiles of the time until the screen appeared are saved next
+# to the log of the rounds
+record_frame_timing = False
+
+# how long the feedback is shown (in seconds) before the subject can continue.
+# Longer waiting time for win than for loss for well-being of user
+delay_win = 1.5
+delay_loss = 1
+
+# positions of the subject's (left) and the computer's (right) penny
+pos_subject = (-0.5, -0.2)
+pos_computer = (0.5, -0.2)
+
+# %% functions for the stimuli
+
+
+def intro_stimuli_function(win, visual=None):
     """
-    Biases the computer towards sticking to its previous choice
+    Creates the stimuli of the intro screens, which are needed right after
+    the window has been opened. All other stimuli are created while the
+    subject reads them (see preload_function).
 
     Parameters
     ----------
-    prev_com_choice : str
-        stores the decision of the computer between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
+    win : visual.Window
+        the window the stimuli are displayed in.
+    visual : module, optional
+        psychopy.visual or the visual of a NullBackend (see null_backend.py).
+        The default is None, i.e. psychopy.visual.
 
     Returns
     -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards sticking to its previous choice.
+    stims : types.SimpleNamespace
+        the stimuli welcome, instruction and txt_continue.
     """
-    if prev_com_choice == 'h':
-        cut_off = cut_off + bias_function(bias)
-    else:
-        cut_off = round(cut_off - bias_function(bias), 2)
-    return cut_off
+    if visual is None:
+        from psychopy import visual
 
+    stims = SimpleNamespace()
+    stims.welcome = visual.TextStim(win, text=welcome_text)
+    stims.instruction = visual.TextStim(win, text=instruction_text)
+    stims.txt_continue = visual.TextStim(win, pos=(0, -0.85),
+                                         text="Press any key to continue",
+                                         height=0.08)
+    return stims
 
-def switch_from_prev_com_choice_function(prev_com_choice, cut_off, bias):
+
+def stimuli_function(win, stims, images, visual=None):
     """
-    Biases the computer towards switching from its previous choice
+    Creates all stimuli of the rounds once. Text stimuli that change every
+    round only get a new text later on (see set_text) and each penny image is
+    loaded (and uploaded as a texture) only once, instead of decoding the png
+    files again every round.
 
     Parameters
     ----------
-    prev_com_choice : str
-        stores the decision of the computer between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
+    win : visual.Window
+        the window the stimuli are displayed in.
+    stims : types.SimpleNamespace
+        the stimuli created by intro_stimuli_function, the new stimuli are
+        added to it.
+    images : dict
+        the paths of the penny images with 'h' and 't' as keys, e.g. the
+        scaled images of cached_texture.
+    visual : module, optional
+        psychopy.visual or the visual of a NullBackend (see null_backend.py).
+        The default is None, i.e. psychopy.visual.
 
     Returns
     -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards switching from its previous choice.
+    stims : types.SimpleNamespace
+        all stimuli of the game, e.g. stims.winner or stims.pennies['h'].
     """
-    if prev_com_choice == 'h':
-        cut_off = round(cut_off - bias_function(bias), 2)
-    else:
-        cut_off = cut_off + bias_function(bias)
-    return cut_off
+    if visual is None:
+        from psychopy import visual
+
+    stims.winner = visual.TextStim(win, text='YOU WIN!', pos=(0, 0.6),
+                                   color='green')
+    stims.loser = visual.TextStim(win, text='YOU LOSE!', pos=(0, 0.6),
+                                  color='red')
+
+    stims.txt_user = visual.TextStim(win, pos=(-0.5, 0.42),
+                                     text='Your choice:')
+    stims.txt_com = visual.TextStim(win, pos=(0.5, 0.42),
+                                    text="Computer's choice:")
+
+    # the scores for a win and for a loss are prepared before each keypress
+    stims.score_win = visual.TextStim(win, pos=(0, 0.86), text='')
+    stims.score_loss = visual.TextStim(win, pos=(0, 0.86), text='')
+    stims.stim_round = visual.TextStim(win, text='')
+    stims.game_info = visual.TextStim(win, text='')
 
+    stims.pennies = {choice: visual.ImageStim(win, size=penny_size,
+                                              image=images[choice])
+                     for choice in ['h', 't']}
+    return stims
 
-def bias_stick_to_prev_user_choice_function(prev_subj_choice, cut_off, bias):
+
+def set_text(stim, text):
     """
-    Biases the computer towards sticking to the user's previous choice
+    Changes the text of an existing visual.text.TextStim, but only if the text
+    actually differs from the one it already shows, as every change of the
+    text renders the stimulus again.
 
     Parameters
     ----------
-    prev_subj_choice : str
-        stores the decision of the subject between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
+    stim : visual.text.TextStim
+        the text stimulus to be updated.
+    text : str
+        the new text of the stimulus.
 
     Returns
     -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards sticking to the user's previous choice.
+    stim : visual.text.TextStim
+        the updated text stimulus, ready to be displayed.
     """
-    if prev_subj_choice == 'h':
-        cut_off = cut_off + bias_function(bias)
-    else:
-        cut_off = round(cut_off - bias_function(bias), 2)
-    return cut_off
+    if stim.text != text:
+        stim.text = text
+    return stim
 
 
-def bias_switch_from_prev_user_choice_function(prev_subj_choice,
-                                               cut_off, bias):
+def score_function(wins, losses, stim):
     """
-   Biases the computer towards switching from the user's previous choice
+    Updates a shared visual.text.TextStim with the score of the current
+    round. The position of the stimulus on the screen is set in
+    stimuli_function.
 
     Parameters
     ----------
-    prev_subj_choice : str
-        stores the decision of the subject between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
+    wins : int
+        stores the amount of wins of the subject
+    losses : int
+        stores the amount of losses of the subject
+    stim : visual.text.TextStim
+        the score stimulus to be updated, i.e. stims.score_win or
+        stims.score_loss.
 
     Returns
     -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards switching from the user's previous choice.
+    score: visual.text.TextStim
+            Visual stimulus of the current score ready to be displayed
     """
-    if prev_subj_choice == 'h':
-        cut_off = round(cut_off - bias_function(bias), 2)
-    else:
-        cut_off = cut_off + bias_function(bias)
-    return cut_off
+    txt_score = """Score:
+{} - {}"""
+    txt_score = txt_score.format(wins, losses)
+    return set_text(stim, txt_score)
 
 
-def bias_heads_function(cut_off, bias):
+def stats_text_function(stats):
     """
-    Biases the computer towards choosing heads
+    Fills stats_text with the current statistics of the subject's play.
+    Statistics that aren't defined yet are shown as '-'.
 
     Parameters
     ----------
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
+    stats : running_stats.RunningStats
+        the statistics of the subject's play.
 
     Returns
     -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards choosing heads.
+    txt_stats : str
+        the text to be added to the game info.
     """
-    cut_off = cut_off + bias_function(bias)
-    return cut_off
+    win_rate, low, high, switch_after_win, switch_after_loss, \
+        alternation_rate, entropy = stats.values()
+    values = [win_rate, low, high, switch_after_win, switch_after_loss,
+              alternation_rate]
+    texts = ['-' if value is None else '{:.0%}'.format(value)
+             for value in values]
+    texts.append('-' if entropy is None else '{:.2f}'.format(entropy))
+    return stats_text.format(*texts)
 
 
-def bias_tails_function(cut_off, bias):
+def draw_penny(stims, choice, pos):
     """
-    Biases the computer towards choosing tails
+    Moves the preloaded penny stimulus of the given choice to pos and gets it
+    ready to be displayed
 
     Parameters
     ----------
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
-
-    Returns
-    -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards choosing tails.
+    stims : types.SimpleNamespace
+        the stimuli created by stimuli_function.
+    choice : str
+        either 'h' for heads or 't' for tails.
+    pos : tuple
+        position of the penny on the screen, i.e. pos_subject or pos_computer.
     """
-    cut_off = round(cut_off - bias_function(bias), 2)
-    return cut_off
+    penny = stims.pennies[choice]
+    penny.pos = pos
+    penny.draw()
 
 
-def frustrator_function(choice_subject, choice_computer):
+def feedback_frame_function(win, stims, choice_subject, choice_computer,
+                            visual=None):
     """
-    Lets the computer always choose the opposite of the user
+    Draws everything of the feedback screen except for the score (i.e. the
+    labels, both pennies and the "winner" or "loser" text) to the back buffer
+    and captures it as a single visual.BufferImageStim
 
     Parameters
     ----------
+    win : visual.Window
+        the window the stimuli are displayed in.
+    stims : types.SimpleNamespace
+        the stimuli created by stimuli_function.
     choice_subject : str
-        stores the decision of the subject between heads and tails of the
-        current round.
+        the choice of the subject, either 'h' or 't'.
     choice_computer : str
-        stores the decision of the computer between heads and tails of the
-        current round.
+        the choice of the computer, either 'h' or 't'.
+    visual : module, optional
+        psychopy.visual or the visual of a NullBackend (see null_backend.py).
+        The default is None, i.e. psychopy.visual.
 
     Returns
     -------
-    choice_computer : str
-        updated version of the choice_computer variable described above. Now
-        always the opposite of choice_subject.
+    frame : visual.BufferImageStim
+        the whole feedback screen without the score as one image stimulus.
     """
-    if choice_subject == 'h':
-        choice_computer = 't'
+    if visual is None:
+        from psychopy import visual
+
+    stims.txt_user.draw()
+    stims.txt_com.draw()
+    stims.txt_continue.draw()
+    draw_penny(stims, choice_subject, pos_subject)
+    draw_penny(stims, choice_computer, pos_computer)
+    if choice_subject == choice_computer:
+        stims.winner.draw()
     else:
-        choice_computer = 'h'
-    return choice_computer
-
-
-while True:
+        stims.loser.draw()
+    frame = visual.BufferImageStim(win)
+    # remove the drawn stimuli again so that they don't show up on next flip
+    win.clearBuffer()
+    return frame
 
-    # The cut-off variable is (nearly) equal to the probability of the computer
-    # choosing heads. The variable is placed within the loop to avoid biases
-    # from the previous rounds to influence the next decisions by the computer
-    cut_off = 0.5
-
-# %% displays round info before the start of each round
-    round_txt = """This is round {}
 
+def preload_function(win, stims, background, visual=None):
+    """
+    Prepares everything the rounds need, step by step, to be run by a
+    Preloader (see preloading.py) while the subject reads the intro screens.
+    Yields after every step:
+    - the penny images are scaled to the size they are displayed at in the
+        background (see cached_texture)
+    - all stimuli are created (see stimuli_function)
+    - every stimulus is drawn once to the back buffer (which is cleared right
+        after), so that the first round doesn't take longer than the others
+    - there are only four possible feedback screens (subject h/t x computer
+        h/t), so they are all captured once (see feedback_frame_function).
+        Every round then only draws one of these images plus the score.
 
-To choose heads, press 'h'.
-To choose tails, press 't'."""
-    round_txt = round_txt.format(rounds)
-    stim_round = visual.TextStim(win, text=round_txt)
-    stim_round.draw()
-    win.flip()
-
-# %% choice user & two biases of the computer
-
-    # wait for & restrict keys
-    keys = event.waitKeys(keyList=(['h', 't', 'q', 'escape']))
-
-    # quit option
-    if keys[0] == 'q':
-        break
-
-    # count the amount of changes the subject makes in their decisions relative
-    # to their previous choice
-    if rounds > 1:
-        if prev_subj_choice != keys[0]:
-            choice_change_subject += 1
-
-        # biases the computer towards sticking to the user's previous choice
-        if bias_stick_to_prev_user_choice is True:
-            cut_off = bias_stick_to_prev_user_choice_function(prev_subj_choice,
-                                                              cut_off, bias)
-
-        # biases the computer towards switching from the user's previous choice
-        if bias_switch_from_prev_user_choice is True:
-            cut_off = bias_switch_from_prev_user_choice_function(prev_subj_choice,
-                                                                 cut_off, bias)
-
-    # choice_subject
-    choice_subject = keys[0]
-
-# %% choice computer
-
-    # count the amount of changes the subject makes in their decisions relative
-    # to the computer's previous choice
-    if rounds > 1:
-        if prev_com_choice != choice_subject:
-            choice_change_computer += 1
-
-        # biases the computer towards sticking to its previous choice
-        if bias_stick_to_prev_com_choice is True:
-            cut_off = stick_to_prev_com_choice_function(prev_com_choice,
-                                                        cut_off, bias)
-
-        # biases the computer towards switching from its previous choice
-        if bias_switch_from_prev_com_choice is True:
-            cut_off = switch_from_prev_com_choice_function(prev_com_choice,
-                                                           cut_off, bias)
-
-    # biases the computer towards heads
-    if bias_heads is True:
-        cut_off = bias_heads_function(cut_off, bias)
-
-    # biases the computer towards tails
-    if bias_tails is True:
-        cut_off = bias_tails_function(cut_off, bias)
-
-    # creates a random float
-    ran_float = random.random()
-
-    # use random float to determine the computer's choice
-    if ran_float < cut_off:
-        choice_computer = 'h'
-    elif ran_float > cut_off:
-        choice_computer = 't'
-    # just to be super fair and not give either 'h' or 't' a slight
-    # (negligible) advantage, in case ran_float == cut_off, there is a new
-    # random choice
-    else:
-        choice_computer = random.choice(['h', 't'])
-
-    # turns the computer into a frustrator
-    # aware of the fact that this simply overwrites the previous value of
-    # choice_computer
-    if frustrator is True:
-        choice_computer = frustrator_function(choice_subject, choice_computer)
-
-# %% Displays choice of user and computer as well as results
-
-    # get texts ready to be displayed
-    txt_user.draw()
-    txt_com.draw()
-    txt_continue.draw()
-
-    # gets image of heads ready to be displayed if user chooses head
-    if choice_subject == 'h':
-        heads = visual.ImageStim(win, size=(0.68, 0.92), pos=(-0.5, -0.2),
-                                 image=f_heads)
-        heads.draw()
-        # gets image of heads ready to be displayed if computer chooses head
-        if choice_computer == 'h':
-            heads = visual.ImageStim(win, size=(0.68, 0.92), pos=(0.5, -0.2),
-                                     image=f_heads)
-            heads.draw()
-            # raise wins by 1 and get "winner" text ready to be displayed
-            wins += 1
-            winner.draw()
-        # gets image of tails ready to be displayed if computer chooses tail
-        else:
-            tails = visual.ImageStim(win, size=(0.68, 0.92), pos=(0.5, -0.2),
-                                     image=f_tails)
-            tails.draw()
-            # raise losses by 1 and get "loser" text ready to be displayed
-            losses += 1
-            loser.draw()
-        # update the current score and get it ready to be displayed
-        score = score_function(wins, losses)
-        score.draw()
-        # prints everything on the screen and waits for key to be pressed
-        win.flip()
-
-    # gets image of tails of penny ready to be displayed if user chooses tails
-    else:
-        tails = visual.ImageStim(win, size=(0.68, 0.92), pos=(-0.5, -0.2),
-                                 image=f_tails)
-        tails.draw()
-        # gets image of penny ready to be displayed if computer chooses head
-        if choice_computer == 'h':
-            heads = visual.ImageStim(win, size=(0.68, 0.92), pos=(0.5, -0.2),
-                                     image=f_heads)
-            heads.draw()
-            # raise losses by 1 and get "loser" text ready to be displayed
-            losses += 1
-            loser.draw()
-        # gets image of tails ready to be displayed if computer chooses tail
-        else:
-            tails = visual.ImageStim(win, size=(0.68, 0.92), pos=(0.5, -0.2),
-                                     image=f_tails)
-            tails.draw()
-            # raise wins by 1 and get "winner" text ready to be displayed
-            wins += 1
-            winner.draw()
-        # update the current score and get it ready to be displayed
-        score = score_function(wins, losses)
-        score.draw()
-        # prints everything on the screen and waits key to be pressed
-        win.flip()
-
-    # longer waiting time for win than for loss for well-being of user
-    if choice_subject == choice_computer:
-        core.wait(1.5)
-    else:
-        core.wait(1)
-    response_key = event.waitKeys()
+    Parameters
+    ----------
+    win : visual.Window
+        the window the stimuli are displayed in.
+    stims : types.SimpleNamespace
+        the stimuli created by intro_stimuli_function.
+    background : callable
+        runs a function in a background thread, i.e. Preloader.background.
+    visual : module, optional
+        psychopy.visual or the visual of a NullBackend (see null_backend.py).
+        The default is None, i.e. psychopy.visual.
 
-    # quit option
-    if response_key[0] == 'q':
-        break
+    Returns
+    -------
+    feedback_frames : dict
+        the captured feedback screens with (choice_subject, choice_computer)
+        as keys.
+    """
+    target_size = target_size_function(win.size, penny_size)
+    images = {'h': background(cached_texture, f_heads, target_size,
+                              texture_folder),
+              't': background(cached_texture, f_tails, target_size,
+                              texture_folder)}
+    yield from wait_for(*images.values())
+
+    stimuli_function(win, stims, {choice: image.result()
+                                  for choice, image in images.items()},
+                     visual)
+    yield
+
+    for stim in [stims.winner, stims.loser, stims.txt_user, stims.txt_com,
+                 stims.score_win, stims.score_loss, stims.stim_round,
+                 stims.game_info, stims.pennies['h'], stims.pennies['t']]:
+        stim.draw()
+    win.clearBuffer()
+    yield
+
+    feedback_frames = {}
+    for subject_choice in ['h', 't']:
+        for computer_choice in ['h', 't']:
+            feedback_frames[subject_choice, computer_choice] = \
+                feedback_frame_function(win, stims, subject_choice,
+                                        computer_choice, visual)
+            yield
+    return feedback_frames
+
+# %% quit function
 
-# %% displays the infos of the game so far at the end of the round
 
-    # infos for user at the end of each round. Contains the number of rounds,
-    # wins, losses, changes from user's previous choice and changes from
-    # computer's previous choice
-    txt_game_info = """Up until round {}, you won {} times and lost {} times.
-You changed your own choice {} times. You changed {} times from the computer's
-choice in the previous round."""
-    txt_game_info = txt_game_info.format(rounds, wins, losses,
-                                         choice_change_subject,
-                                         choice_change_computer)
+# No Docstring for the quit function because it's exremely short & obvious.
+# It simply takes two functions as input and returns both. It is used below for
+# global event keys
+def quit_function(func_1, func_2):
+    return func_1 and func_2
 
-    # display result of the game so far to user
-    game_info = visual.TextStim(win, text=txt_game_info)
-    game_info.draw()
-    score.draw()
-    txt_continue.draw()
-    win.flip()
-    response_key = event.waitKeys()
+# %% the game
 
-    ## As an adaptation of the program, one might abstain from displaying the
-    # score and game_info and instead ask the user for her estimate on the
-    # amounts of wins & losses conditional on different waiting times for wins
-    # and losses (as determined above)
 
-    # raise rounds by 1, update previous com and subj response
-    rounds += 1
-    prev_com_choice = choice_computer
-    prev_subj_choice = choice_subject
+def main(backend=None):
+    """
+    Opens the window and runs the whole game: intro screens, the rounds until
+    the subject quits and the end screen.
 
-# %% displays the final score & some other information, finally closes win
+    Parameters
+    ----------
+    backend : null_backend.NullBackend, optional
+        replaces psychopy's event, core, visual and keyboard, e.g. to run the
+        game without a screen and with a scripted subject (see
+        null_backend.py). The default is None, i.e. psychopy.
 
-    # quit option
-    if response_key[0] == 'q':
-        break
+    Raises
+    ------
+    ValueError
+        raises an exception if the bias settings above are not valid (see
+        strategies.compose_strategy). This is checked before the window is
+        opened to prevent the window from getting stuck.
+    """
+    # psychopy is only imported here, so that importing this module (e.g. for
+    # testing) neither takes long nor opens a window
+    if backend is None:
+        from psychopy import event, core, visual
+        from psychopy.hardware import keyboard
+    else:
+        event, core, visual, keyboard = (backend.event, backend.core,
+                                         backend.visual, backend.keyboard)
+
+    # the strategies are checked right away to test for bad combinations and
+    # values of bias. Every cut-off that can occur is computed once here, each
+    # round then only looks up the cut-off for the previous choices
+    session_random = SessionRandom(seed)
+    strategy = compose_strategy(computer_strategies, bias,
+                                rng=session_random,
+                                ngram_length=ngram_length,
+                                ngram_decay=ngram_decay,
+                                context_depth=context_depth,
+                                context_nodes=context_nodes)
+
+    # the logger writes in the background, so the rounds aren't delayed by
+    # writing to the disk. Rounds logged before pressing 'escape' are also
+    # saved, as the logger finishes the file when the program exits
+    session_time = time.strftime("%Y%m%d_%H%M%S")
+    f_log = os.path.join(log_folder, "trials_{}.csv".format(session_time))
+    trial_logger = TrialLogger(f_log, extra_columns=RunningStats.columns)
+
+    # everything needed to replay the session
+    f_session = os.path.join(log_folder,
+                             "session_{}.json".format(session_time))
+    with open(f_session, 'w') as f:
+        json.dump(dict(session_random.info(), bias=bias,
+                       computer_strategies=computer_strategies), f)
+
+    win = visual.Window(color='black')
+
+    # duration of one frame, i.e. one refresh of the screen. All waiting
+    # times within the rounds are counted in frames
+    frame_rate = win.getActualFrameRate()
+    if frame_rate is None:
+        frame_period = win.monitorFramePeriod
+    else:
+        frame_period = 1 / frame_rate
+
+    # optional recording of the timing of every flip, saved at the end of the
+    # game or, after pressing 'escape', when the program exits
+    if record_frame_timing is True:
+        flip_recorder = FlipRecorder(frame_period)
+        f_flips = os.path.join(log_folder, "flips_{}.csv".format(session_time))
+
+        def write_flips():
+            flip_recorder.write(f_flips)
+            flip_recorder.write_summary(f_flips.replace(".csv",
+                                                        "_summary.csv"))
+        atexit.register(write_flips)
+    else:
+        flip_recorder = None
+
+    def flip(phase):
+        """
+        Flips the window and records the timing of the flip if
+        record_frame_timing is True.
+
+        Parameters
+        ----------
+        phase : str
+            the screen shown by the flip: 'intro', 'round', 'feedback',
+            'info' or 'end'.
+
+        Returns
+        -------
+        t_flip : float
+            time when the screen appeared, as returned by win.flip().
+        """
+        if flip_recorder is None:
+            return win.flip()
+        # win.flip() returns the time of core.monotonicClock (not of
+        # core.getTime), so the request is timed on the same clock
+        t_request = core.monotonicClock.getTime()
+        t_flip = win.flip()
+        flip_recorder.record(phase, t_request, t_flip)
+        return t_flip
+    # keypresses are timestamped by the keyboard backend itself (with
+    # sub-millisecond resolution), even though they are only polled once per
+    # frame. kb.clock is reset exactly when the round info appears
+    kb = keyboard.Keyboard()
+    # the keypresses are timestamped on the clock of core.getTime, the flips
+    # on core.monotonicClock. The difference between both clocks is constant,
+    # so the time of the keypress is logged on the clock of the flips (like
+    # the display of the round info)
+    clock_offset = core.getTime() - core.monotonicClock.getTime()
+
+    # clears global keys
+    event.globalKeys.clear()
+    # escape key can be used quit the experiment at any time also skipping the
+    # end screen, probably most useful for experimenter despite reoccuring
+    # AttributeError used as a faster exit option throughout the whole program
+    event.globalKeys.add(key='escape',
+                         func=quit_function(core.quit, win.close))
+    # Source for global event keys:
+    # https://www.psychopy.org/coder/globalKeys.html
+
+    # %% Intro screens
+
+    # everything else is prepared while the subject reads the intro screens
+    stims = intro_stimuli_function(win, visual)
+    preloader = Preloader()
+    preloader.start(preload_function(win, stims, preloader.background,
+                                     visual))
+
+    def wait_keys():
+        """
+        Waits for a keypress like kb.waitKeys, but runs the steps of the
+        preloader in the meantime. Nothing is flipped, so the screen stays
+        the same.
+        """
+        kb.clearEvents()
+        while not kb.getKeys():
+            if not preloader.step():
+                core.wait(0.01)
+
+    stims.welcome.draw()
+    flip('intro')
+    wait_keys()
+
+    stims.instruction.draw()
+    stims.txt_continue.draw()
+    flip('intro')
+    wait_keys()
+
+    # the first round only starts once everything is prepared
+    feedback_frames = preloader.finish()
+
+    # %% some self-explanatory variables
+
+    wins = 0
+    losses = 0
+    rounds = 1
+    choice_change_subject = 0
+    choice_change_computer = 0
+    prev_com_choice = 0
+    prev_subj_choice = 0
+
+    # all rounds of the session, a few bytes per round (see
+    # session_history.py)
+    history = SessionHistory()
+    # all rounds are also saved in a binary session log for analyses across
+    # many sessions (see session_log.py) once the subject quits or, after
+    # pressing 'escape', when the program exits
+    f_session_log = os.path.join(log_folder,
+                                 "session_{}.pennies".format(session_time))
+
+    def write_log():
+        write_session_log(f_session_log, history, strategy,
+                          session_random.info())
+    atexit.register(write_log)
+
+    # statistics of the subject's play for the game info and the log, updated
+    # in constant time every round (see running_stats.py)
+    stats = RunningStats()
+
+    # longer waiting time for win than for loss for well-being of user,
+    # counted in frames of the screen
+    delay_frames_win = round(delay_win / frame_period)
+    delay_frames_loss = round(delay_loss / frame_period)
+
+    # the screen is drawn and flipped once per frame. states decides when the
+    # next screen of the round is shown (see trial_states.py)
+    states = TrialStateMachine()
+
+    while True:
+
+        # %% prepares a new round (in the frame before it is displayed)
+        if states.phase == 'round' and states.frames == 0:
+
+            # displays round info before the start of each round
+            round_txt = """This is round {}
 
-amount_rounds = wins + losses
 
-txt_end = """
+To choose heads, press 'h'.
+To choose tails, press 't'."""
+            round_txt = round_txt.format(rounds)
+            set_text(stims.stim_round, round_txt)
+
+            # The computer's choice only depends on the previous rounds (apart
+            # from e.g. the frustrator), so it is computed (and the feedback
+            # prepared) before the round info is displayed, so that nothing is
+            # left to compute after the keypress.
+
+            # The cut-off variable is (nearly) equal to the probability of the
+            # computer choosing heads. It only depends on the previous round,
+            # so biases from earlier rounds don't influence the next decisions
+            # by the computer. The predictive opponents don't use a cut-off
+            cut_off = strategy.cut_off(prev_com_choice, prev_subj_choice)
+            choice_computer = strategy.choose(prev_com_choice,
+                                              prev_subj_choice,
+                                              session_random.random())
+
+            # both possible scores are set before the keypress. Drawing them
+            # once to the back buffer (which is cleared right after) renders
+            # their text
+            score_function(wins + 1, losses, stims.score_win)
+            score_function(wins, losses + 1, stims.score_loss)
+            stims.score_win.draw()
+            stims.score_loss.draw()
+            win.clearBuffer()
+
+            # feedback stores the computer's choice, the precaptured feedback
+            # screen and the score for either possible choice of the subject
+            feedback = {}
+            delay_frames = {}
+            for key in ['h', 't']:
+                # e.g. the frustrator simply overwrites the previous value of
+                # choice_computer
+                key_computer = strategy.respond(key, choice_computer)
+                if key == key_computer:
+                    feedback[key] = (key_computer,
+                                     feedback_frames[key, key_computer],
+                                     stims.score_win)
+                    delay_frames[key] = delay_frames_win
+                else:
+                    feedback[key] = (key_computer,
+                                     feedback_frames[key, key_computer],
+                                     stims.score_loss)
+                    delay_frames[key] = delay_frames_loss
+            states.new_round(delay_frames)
+
+            # the reaction time is measured from the flip showing the round
+            # info, keys pressed before that flip are discarded
+            kb.clearEvents()
+            polled = 0
+            win.callOnFlip(kb.clock.reset)
+
+        # %% draws the screen of the current phase and flips the window
+
+        if states.phase == 'round':
+            stims.stim_round.draw()
+            t_flip = flip('round')
+            if states.frames == 0:
+                t_round_onset = t_flip
+        elif states.phase in ['delay', 'feedback']:
+            # the prepared feedback screen (labels, both pennies and the
+            # "winner" or "loser" text) and score
+            frame.draw()
+            score.draw()
+            flip('feedback')
+        else:
+            stims.game_info.draw()
+            score.draw()
+            stims.txt_continue.draw()
+            flip('info')
+
+        # the keys are polled once every frame, their exact time is still
+        # known from the keyboard backend. Until the end of the delay, the
+        # keys stay in the keyboard's buffer (clear=False), so that the
+        # release of the choice key can be collected then. Only the keys
+        # pressed since the previous frame are passed on
+        if states.phase in ['round', 'delay']:
+            keys = kb.getKeys(waitRelease=False, clear=False)
+            new_keys = keys[polled:]
+            polled = len(keys)
+        else:
+            new_keys = kb.getKeys(waitRelease=False)
+        phase = states.update(new_keys)
+
+        # quit option
+        if phase == 'quit':
+            break
+
+        # %% choice user, shown as feedback from the next frame on
+        if phase == 'delay':
+            # choice_subject, reaction time since the display of the round
+            # info and time of the keypress
+            choice_key = states.choice_key
+            choice_subject = choice_key.name
+            rt = choice_key.rt
+            t_response = choice_key.tDown - clock_offset
+
+            # count the amount of changes the subject makes in their decisions
+            # relative to their previous choice and to the computer's previous
+            # choice
+            choice_change_subject, choice_change_computer = \
+                choice_change_function(rounds, choice_subject,
+                                       prev_subj_choice, prev_com_choice,
+                                       choice_change_subject,
+                                       choice_change_computer)
+
+            # picks the prepared feedback screen and score, so only drawing is
+            # left to be done
+            choice_computer, frame, score = feedback[choice_subject]
+
+            # raise wins or losses by 1
+            wins, losses = round_result_function(choice_subject,
+                                                 choice_computer, wins, losses)
+            history.append(choice_subject, choice_computer, rt)
+            stats.update(choice_subject, choice_computer)
+
+            # e.g. the predictive opponents learn from every round
+            strategy.observe(choice_subject, choice_computer)
+
+        # %% end of the waiting time, the round is logged in this idle frame
+        elif phase == 'feedback':
+            # how long the choice key was held down, known once it was
+            # released (nearly always during the waiting time). The keys
+            # pressed during the waiting time are discarded
+            released = kb.getKeys(keyList=[choice_subject], waitRelease=True)
+            if released:
+                key_duration = released[0].duration
+            else:
+                key_duration = None
+            kb.clearEvents()
+
+            # only buffers the round, the file is written in the background
+            if choice_subject == choice_computer:
+                result = 'win'
+            else:
+                result = 'loss'
+            trial_logger.log(rounds, choice_subject, choice_computer, cut_off,
+                             result, rt, t_round_onset, t_response,
+                             key_duration, stats.values())
+
+        # %% displays the infos of the game so far from the next frame on
+        elif phase == 'info':
+            # infos for user at the end of each round. Contains the number of
+            # rounds, wins, losses, changes from user's previous choice and
+            # changes from computer's previous choice, followed by the
+            # statistics of the subject's play
+            txt_game_info = game_info_text.format(rounds, wins, losses,
+                                                  choice_change_subject,
+                                                  choice_change_computer)
+            txt_game_info += stats_text_function(stats)
+            set_text(stims.game_info, txt_game_info)
+
+            ## As an adaptation of the program, one might abstain from
+            # displaying the score and game_info and instead ask the user for
+            # her estimate on the amounts of wins & losses conditional on
+            # different waiting times for wins and losses (as determined
+            # above)
+
+        # %% next round
+        elif phase == 'round':
+            # raise rounds by 1, update previous com and subj response
+            rounds += 1
+            prev_com_choice = choice_computer
+            prev_subj_choice = choice_subject
+
+    write_log()
+    atexit.unregister(write_log)
+
+    # %% displays the final score & some other information, finally closes win
+
+    amount_rounds = wins + losses
+
+    txt_end = """
 
 You played {} rounds.
 
@@ -686,9 +854,17 @@ The final score is:
 
 Thanks a lot for your participation!""".format(amount_rounds, wins, losses)
 
-stim_end = visual.TextStim(win, text=txt_end)
-stim_end.draw()
-win.flip()
-core.wait(6)
+    stim_end = visual.TextStim(win, text=txt_end)
+    stim_end.draw()
+    flip('end')
+    core.wait(6)
+
+    win.close()
+    trial_logger.close()
+    if flip_recorder is not None:
+        write_flips()
+        atexit.unregister(write_flips)
+
 
-win.close()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Simulation of many sessions of the matching pennies game at once.
+
+simulate_sessions computes the choices of the computer for N sessions with T
+rounds each using numpy arrays instead of playing round after round as the
+MatchingPenniesEngine (game_engine.py) does. The results follow exactly the
+same rules as the main program, i.e. the cut-offs are the ones of the
+composed ComputerStrategy (see strategies.py).
+
+Choices are stored as booleans: True for heads ('h') and False for tails
+('t').
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from strategies import compose_strategy, strategy_names_function
+
+# %% functions
+
+
+def choices_to_array(choices):
+    """
+    Converts choices given as 'h' and 't' into a boolean array
+
+    Parameters
+    ----------
+    choices : array_like
+        choices as 'h' and 't' or already as booleans (True for heads). May
+        be empty.
+
+    Raises
+    ------
+    ValueError
+        raises an exception if a choice given as a string is neither 'h' nor
+        't'.
+
+    Returns
+    -------
+    heads : numpy.ndarray
+        boolean array of the same shape, True where the choice is heads.
+    """
+    choices = np.asarray(choices)
+    if choices.dtype.kind == 'O':
+        # e.g. an object array of 'h' and 't', which would all be True as
+        # booleans. The type is taken from the values instead
+        choices = np.asarray(choices.tolist())
+    if choices.size == 0:
+        return np.zeros(choices.shape, dtype=bool)
+    if choices.dtype.kind in 'US':
+        choices = choices.astype(str)
+        heads = choices == 'h'
+        if not (heads | (choices == 't')).all():
+            raise ValueError("Choices have to be 'h' or 't'")
+        return heads
+    return choices.astype(bool)
+
+
+def cut_off_arrays_function(strategy):
+    """
+    Turns the cut-offs of a strategies.ComputerStrategy into an array
+
+    Parameters
+    ----------
+    strategy : strategies.ComputerStrategy
+        the composed strategy of the computer.
+
+    Returns
+    -------
+    first_cut_off : float
+        the cut-off in the first round.
+    cut_offs : numpy.ndarray
+        2 x 2 array of the cut-offs in all other rounds, indexed by
+        [prev computer choice is heads, prev subject choice is heads].
+    """
+    table = strategy.cut_offs
+    cut_offs = np.empty((2, 2))
+    for prev_com in [False, True]:
+        for prev_subj in [False, True]:
+            cut_offs[int(prev_com), int(prev_subj)] = table[
+                'h' if prev_com else 't', 'h' if prev_subj else 't']
+    return table[0, 0], cut_offs
+
+
+def choose(cut_off, ran_floats, rng):
+    """
+    Vectorized version of game_logic.computer_choice_function
+
+    Parameters
+    ----------
+    cut_off : numpy.ndarray
+        the cut-offs.
+    ran_floats : numpy.ndarray
+        random floats of the same shape.
+    rng : numpy.random.Generator or session_random.SessionRandom
+        used to decide randomly in case a random float equals its cut-off.
+
+    Returns
+    -------
+    heads : numpy.ndarray
+        True where the computer chooses heads.
+    """
+    heads = ran_floats < cut_off
+    ties = ran_floats == cut_off
+    if ties.any():
+        heads[ties] = rng.random(int(ties.sum())) < 0.5
+    return heads
+
+
+def simulate_sessions(subject_choices, bias=0.4, bias_heads=False,
+                      bias_tails=False, bias_stick_to_prev_com_choice=False,
+                      bias_switch_from_prev_com_choice=False,
+                      bias_stick_to_prev_user_choice=False,
+                      bias_switch_from_prev_user_choice=False,
+                      frustrator=False, rng=None, ran_floats=None,
+                      strategy=None):
+    """
+    Plays N sessions with T rounds each against the computer.
+
+    Only if the computer is biased towards sticking to or switching from its
+    own previous choice, a round depends on the round before. Then the rounds
+    are computed one after another (but still for all sessions at once),
+    otherwise all rounds of all sessions are computed at once.
+
+    Parameters
+    ----------
+    subject_choices : array_like
+        N x T choices of the subject as 'h' and 't' or as booleans (True for
+        heads). A 1-dimensional sequence is treated as a single session.
+    bias : float, optional
+        the bias of the computer. The default is 0.4.
+    bias_heads, bias_tails, bias_stick_to_prev_com_choice,
+    bias_switch_from_prev_com_choice, bias_stick_to_prev_user_choice,
+    bias_switch_from_prev_user_choice, frustrator : bool, optional
+        store whether the respective bias is activated (see
+        game_logic.allowed_bias_combis). The default is False for all of them.
+    rng : numpy.random.Generator or session_random.SessionRandom, optional
+        source of the random floats. The default is a new, randomly seeded
+        generator. A single session simulated with a SessionRandom gives the
+        same results as the MatchingPenniesEngine with a SessionRandom of the
+        same seed.
+    ran_floats : array_like, optional
+        N x T random floats used instead of drawing them from rng, e.g. to
+        reproduce the results of the MatchingPenniesEngine.
+    strategy : strategies.ComputerStrategy, optional
+        the composed strategy of the computer, used instead of bias and the
+        bias variables. The default is None.
+
+    Raises
+    ------
+    ValueError
+        raises an exception if the bias or the combination of biases is not
+        valid, or if the strategy uses an opponent, whose choices depend on
+        all previous rounds and can't be computed for all sessions at once.
+
+    Returns
+    -------
+    result : types.SimpleNamespace
+        with the N x T arrays computer_choices (True for heads) and
+        subject_wins, and the arrays wins, losses, choice_change_subject and
+        choice_change_computer with one value per session.
+    """
+    if strategy is None:
+        names = strategy_names_function(
+            bias_heads, bias_tails, bias_stick_to_prev_com_choice,
+            bias_switch_from_prev_com_choice, bias_stick_to_prev_user_choice,
+            bias_switch_from_prev_user_choice, frustrator)
+        strategy = compose_strategy(names, bias)
+    if strategy.opponent is not None:
+        raise ValueError("Strategies with an opponent can't be simulated "
+                         "with numpy arrays, use the MatchingPenniesEngine")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    subject = np.atleast_2d(choices_to_array(subject_choices))
+    n_sessions, n_rounds = subject.shape
+    if ran_floats is None:
+        ran_floats = rng.random((n_sessions, n_rounds))
+    else:
+        ran_floats = np.asarray(ran_floats, dtype=float).reshape(subject.shape)
+
+    first_cut_off, cut_offs = cut_off_arrays_function(strategy)
+
+    respond = strategy.respond_array
+    if strategy.uses_prev_com_choice:
+        computer = np.empty_like(subject)
+        cut_off = np.full(n_sessions, first_cut_off)
+        for i in range(n_rounds):
+            computer[:, i] = choose(cut_off, ran_floats[:, i], rng)
+            if respond is not None:
+                computer[:, i] = respond(subject[:, i], computer[:, i])
+            cut_off = cut_offs[computer[:, i].astype(int),
+                               subject[:, i].astype(int)]
+    else:
+        # without a dependency on the computer's own previous choice, every
+        # cut-off is known in advance. The previous choice of the computer
+        # doesn't matter, so it can be set to any value, here tails
+        cut_off = np.empty(subject.shape)
+        cut_off[:, :1] = first_cut_off
+        cut_off[:, 1:] = cut_offs[0, subject[:, :-1].astype(int)]
+        computer = choose(cut_off, ran_floats, rng)
+        if respond is not None:
+            # e.g. the frustrator simply overwrites the choice of the
+            # computer
+            computer = respond(subject, computer)
+
+    subject_wins = subject == computer
+    wins = subject_wins.sum(axis=1)
+    return SimpleNamespace(
+        computer_choices=computer,
+        subject_wins=subject_wins,
+        wins=wins,
+        losses=n_rounds - wins,
+        choice_change_subject=(subject[:, 1:] != subject[:, :-1]).sum(axis=1),
+        choice_change_computer=(subject[:, 1:] != computer[:, :-1]).sum(
+            axis=1))
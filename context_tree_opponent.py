@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Computer opponent that predicts the subject's next choice with a context tree
+of limited size, for very long sessions.
+
+Like the NGramOpponent (ngram_opponent.py), the ContextTreeOpponent counts
+the subject's choices after the previous rounds (the context) and chooses the
+opposite of the more likely choice. But instead of always looking back a
+fixed amount of rounds, it keeps counts for contexts of every length up to
+max_depth and predicts with the longest context that has been seen often
+enough. A context one round longer than the longest known one is only added
+when it occurs, so the tree only grows where the subject's sequence actually
+goes.
+
+The amount of contexts (nodes) is limited to max_nodes. When a new node would
+exceed that limit, the node that was used least recently is removed, so the
+memory needed stays the same no matter how long the session is. Contexts
+that are rarely seen are removed first, the short contexts that are used
+every round are never removed.
+
+The opponent has the same interface as the simulated players (see
+player_agents.py): choose() returns 'h' or 't' and observe(choice_subject,
+choice_computer) shows it the result of the round.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import random
+import sys
+from collections import OrderedDict
+
+# %% opponent
+
+
+class ContextTreeOpponent:
+    """
+    Predicts the subject's next choice from contexts of varying length.
+
+    Parameters
+    ----------
+    max_depth : int, optional
+        the longest context in rounds. The default is 12.
+    max_nodes : int, optional
+        the most contexts kept at the same time. The default is 10000.
+    min_count : int, optional
+        how often a context has to be seen before it is used for predictions.
+        The default is 2.
+    rng : random.Random, optional
+        source of the random choices if both choices are equally likely. The
+        default is a new random.Random.
+
+    Attributes
+    ----------
+    nodes : collections.OrderedDict
+        the counts [heads, tails] of every context, least recently used
+        first. The key of a context of d rounds is its history (two bits per
+        round) with an additional bit at position 2 * d, so that contexts of
+        different lengths never share a key.
+    history : int
+        the last max_depth rounds, two bits per round (subject, computer),
+        the most recent round in the lowest bits.
+    rounds : int
+        the amount of rounds observed.
+    evicted : int
+        the amount of nodes removed to stay within max_nodes.
+    """
+
+    __slots__ = ('max_depth', 'max_nodes', 'min_count', 'nodes', 'history',
+                 'rounds', 'evicted', '_random')
+
+    def __init__(self, max_depth=12, max_nodes=10000, min_count=2, rng=None):
+        if max_nodes < max_depth + 2:
+            raise ValueError("max_nodes has to be at least max_depth + 2")
+        if rng is None:
+            rng = random.Random()
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.min_count = min_count
+        self.nodes = OrderedDict()
+        self.history = 0
+        self.rounds = 0
+        self.evicted = 0
+        self._random = rng.random
+
+    def _keys(self):
+        # keys of the contexts of length 0, 1, ... of the current history
+        for depth in range(min(self.rounds, self.max_depth) + 1):
+            mask = (1 << (2 * depth)) - 1
+            yield (self.history & mask) | (1 << (2 * depth))
+
+    def predict(self):
+        """
+        Predicts the subject's next choice with the longest context that has
+        been seen at least min_count times and isn't undecided.
+
+        Returns
+        -------
+        choice : str or None
+            'h' or 't', None if both are equally likely.
+        """
+        prediction = None
+        for key in self._keys():
+            node = self.nodes.get(key)
+            if node is None:
+                break
+            heads, tails = node
+            if heads + tails >= self.min_count:
+                if heads > tails:
+                    prediction = 'h'
+                elif tails > heads:
+                    prediction = 't'
+        return prediction
+
+    def choose(self):
+        """
+        Chooses the opposite of the predicted choice of the subject.
+
+        Returns
+        -------
+        choice_computer : str
+            'h' or 't'.
+        """
+        prediction = self.predict()
+        if prediction == 'h':
+            return 't'
+        if prediction == 't':
+            return 'h'
+        if self._random() < 0.5:
+            return 'h'
+        return 't'
+
+    def observe(self, choice_subject, choice_computer):
+        """
+        Counts the subject's choice for every known context of the current
+        history, adds the next longer context and adds the round to the
+        history.
+
+        Parameters
+        ----------
+        choice_subject, choice_computer : str
+            the decisions of the subject and the computer in this round.
+        """
+        subject_bit = choice_subject == 't'
+        nodes = self.nodes
+        path = []
+        for key in self._keys():
+            node = nodes.get(key)
+            if node is None:
+                # only one new (longer) context per round
+                node = [0, 0]
+                nodes[key] = node
+                node[subject_bit] += 1
+                break
+            node[subject_bit] += 1
+            path.append(key)
+
+        # the contexts of this round become the most recently used ones, the
+        # shorter ones more recently than the longer ones. That way a context
+        # is always removed before the shorter contexts it extends
+        for key in reversed(path):
+            nodes.move_to_end(key)
+        if len(nodes) > self.max_nodes:
+            nodes.popitem(last=False)
+            self.evicted += 1
+
+        mask = (1 << (2 * self.max_depth)) - 1
+        self.history = (((self.history << 2) | (subject_bit << 1) |
+                         (choice_computer == 't')) & mask)
+        self.rounds += 1
+
+    def memory_report(self):
+        """
+        Reports the size of the tree.
+
+        Returns
+        -------
+        report : dict
+            the amount of nodes, the limit, the amount of evicted nodes, the
+            amount of nodes per context length and an estimate of the memory
+            used by the tree in bytes.
+        """
+        depths = [0] * (self.max_depth + 1)
+        size = sys.getsizeof(self.nodes)
+        for key, node in self.nodes.items():
+            depths[(key.bit_length() - 1) // 2] += 1
+            size += (sys.getsizeof(key) + sys.getsizeof(node) +
+                     2 * sys.getsizeof(node[0]))
+        return {'nodes': len(self.nodes),
+                'max_nodes': self.max_nodes,
+                'evicted': self.evicted,
+                'nodes_per_depth': depths,
+                'bytes': size}
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Timing of the flips of the window.
+
+The FlipRecorder stores for every win.flip() when it was requested, when the
+new screen actually appeared and which screen (phase) of the game it showed.
+From that it counts the dropped frames, i.e. the refreshes of the screen that
+were missed, and summarises the timing of each phase with percentiles of the
+intervals between the flips and of the latencies (time from request to
+flip).
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import csv
+import math
+
+# %% functions
+
+
+def percentile_function(values, percent):
+    """
+    Computes a percentile of values with linear interpolation (as the default
+    of numpy.percentile does).
+
+    Parameters
+    ----------
+    values : list of float
+        the values, don't need to be sorted.
+    percent : float
+        the percentile between 0 and 100.
+
+    Returns
+    -------
+    percentile : float
+        the percentile, nan if there are no values.
+    """
+    if not values:
+        return math.nan
+    values = sorted(values)
+    position = (len(values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+# %% recorder
+
+
+class FlipRecorder:
+    """
+    Records the timing of every flip of the window.
+
+    A flip should show the new screen at the first refresh that is possible:
+    If it was requested in time for the refresh right after the previous
+    flip, that refresh (i.e. one frame period after the previous flip),
+    otherwise the first refresh after the request. Every further refresh that
+    passes until the screen actually appears counts as a dropped frame.
+
+    Parameters
+    ----------
+    frame_period : float
+        the duration of one refresh of the screen in seconds, e.g. 1/60.
+    tolerance : float, optional
+        fraction of a frame period by which a flip may be late due to
+        imprecise timestamps without counting as dropped. The default is 0.2.
+
+    Attributes
+    ----------
+    flips : list of tuple
+        (phase, t_request, t_flip, interval, dropped) of every flip. interval
+        is the time since the previous flip, dropped the amount of dropped
+        frames.
+    """
+
+    columns = ('phase', 't_request', 't_flip', 'interval', 'dropped')
+    percents = (50, 90, 99, 100)
+    measures = ('interval', 'latency')
+
+    def __init__(self, frame_period, tolerance=0.2):
+        self.frame_period = frame_period
+        self.tolerance = tolerance
+        self.flips = []
+
+    def record(self, phase, t_request, t_flip):
+        """
+        Stores the timing of one flip.
+
+        Parameters
+        ----------
+        phase : str
+            the screen shown by the flip, e.g. 'round' or 'feedback'.
+        t_request : float
+            time right before calling win.flip().
+        t_flip : float
+            time returned by win.flip(), i.e. when the screen appeared.
+
+        Returns
+        -------
+        dropped : int
+            the amount of frames dropped by this flip.
+        """
+        period = self.frame_period
+        if self.flips:
+            t_prev = self.flips[-1][2]
+            interval = t_flip - t_prev
+        else:
+            t_prev = -math.inf
+            interval = math.nan
+
+        if t_request < t_prev + period:
+            # continuous drawing, the flip should be exactly one period after
+            # the previous one
+            dropped = round(interval / period) - 1
+        else:
+            # the flip should appear within one period after the request
+            dropped = math.floor((t_flip - t_request) / period -
+                                 self.tolerance)
+        dropped = max(dropped, 0)
+
+        self.flips.append((phase, t_request, t_flip, interval, dropped))
+        return dropped
+
+    def summary_columns(self):
+        """
+        Returns the names of the percentiles in the summary, e.g.
+        'interval_p50', the 100th percentile is called e.g. 'interval_max'.
+
+        Returns
+        -------
+        columns : list of str
+            the percentiles of every measure, in the order of percents.
+        """
+        return ['{}_{}'.format(measure, 'max' if percent == 100 else
+                               'p{}'.format(percent))
+                for measure in self.measures for percent in self.percents]
+
+    def summary(self):
+        """
+        Summarises the flips of every phase.
+
+        Returns
+        -------
+        summary : dict
+            one dict per phase (and 'all' for all flips) with the amount of
+            flips, of dropped frames and the percentiles (see summary_columns)
+            of the intervals between the flips and of the latency (time from
+            request to flip) in seconds, e.g. summary['round']['interval_p99'].
+            The first flip has no interval and is left out of the intervals.
+        """
+        phases = {'all': []}
+        for flip in self.flips:
+            phases.setdefault(flip[0], []).append(flip)
+            phases['all'].append(flip)
+
+        columns = self.summary_columns()
+        summary = {}
+        for phase, flips in phases.items():
+            intervals = [interval for _, _, _, interval, _ in flips
+                         if not math.isnan(interval)]
+            latencies = [t_flip - t_request for
+                         _, t_request, t_flip, _, _ in flips]
+            percentiles = [percentile_function(values, percent)
+                           for values in (intervals, latencies)
+                           for percent in self.percents]
+            summary[phase] = {'flips': len(flips),
+                              'dropped': sum(flip[4] for flip in flips)}
+            summary[phase].update(zip(columns, percentiles))
+        return summary
+
+    def write(self, path):
+        """
+        Writes every flip to a csv file.
+
+        Parameters
+        ----------
+        path : str
+            path of the csv file.
+        """
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            writer.writerows(self.flips)
+
+    def write_summary(self, path):
+        """
+        Writes the summary (see summary) to a csv file with one row per phase.
+
+        Parameters
+        ----------
+        path : str
+            path of the csv file.
+        """
+        columns = ['phase', 'flips', 'dropped'] + self.summary_columns()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for phase, values in self.summary().items():
+                writer.writerow([phase] + [values[column] for column in
+                                           columns[1:]])
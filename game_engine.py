@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Headless version of the matching pennies game.
+
+The MatchingPenniesEngine plays the game exactly like the main program
+(assignment_psychopy.py), using the functions of game_logic.py, but without a
+window and without waiting for keys. The choices of the subject are simply
+passed to it or come from a simulated player (see player_agents.py), so bias
+settings can be tested for a huge amount of rounds. The computer plays a
+ComputerStrategy (see strategies.py), composed from the bias variables or
+passed to it directly.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import random
+
+from game_logic import computer_choice_function
+from session_history import SessionHistory
+from strategies import compose_strategy, strategy_names_function
+
+# %% engine
+
+
+class MatchingPenniesEngine:
+    """
+    State of a game of matching pennies. step plays a single round, run plays
+    a whole sequence of rounds at once.
+
+    Parameters
+    ----------
+    bias : float, optional
+        the bias of the computer (see game_logic.bias_function). The default
+        is 0.4 as in the main program.
+    bias_heads, bias_tails, bias_stick_to_prev_com_choice,
+    bias_switch_from_prev_com_choice, bias_stick_to_prev_user_choice,
+    bias_switch_from_prev_user_choice, frustrator : bool, optional
+        store whether the respective bias is activated (see
+        game_logic.allowed_bias_combis). The default is False for all of them.
+    rng : random.Random or session_random.SessionRandom, optional
+        source of the random floats of the computer. The default is the
+        global random module. With a SessionRandom with the seed logged by
+        the main program and the subject's logged choices, the computer makes
+        exactly the same choices as in the logged session.
+    opponent : object, optional
+        a strategy that chooses for the computer instead of the biases, with
+        the methods choose() and observe(choice_subject, choice_computer),
+        e.g. a NGramOpponent (see ngram_opponent.py). The default is None.
+    strategy : strategies.ComputerStrategy, optional
+        the composed strategy of the computer (see
+        strategies.compose_strategy), used instead of bias, the bias variables
+        and opponent. The default is None.
+    record_history : bool, optional
+        whether every round is recorded in the attribute history. The default
+        is False.
+
+    Raises
+    ------
+    ValueError
+        raises an exception if the bias or the combination of biases is not
+        valid, or if an opponent is combined with a bias.
+
+    Attributes
+    ----------
+    strategy : strategies.ComputerStrategy
+        the strategy of the computer.
+    history : session_history.SessionHistory or None
+        all rounds played since the last reset, if record_history is True.
+    wins, losses : int
+        the amount of wins and losses of the subject so far.
+    rounds : int
+        number of the next round, starting at 1.
+    prev_com_choice, prev_subj_choice : str
+        the decisions of the computer and the subject in the previous round
+        (0 before the first round, as in the main program).
+    choice_change_subject, choice_change_computer : int
+        how often the subject changed from their own and from the computer's
+        previous choice so far.
+    """
+
+    __slots__ = ('rng', 'strategy', 'bias', 'cut_offs', 'opponent',
+                 'record_history', 'history', 'wins', 'losses', 'rounds',
+                 'choice_change_subject', 'choice_change_computer',
+                 'prev_com_choice', 'prev_subj_choice')
+
+    def __init__(self, bias=0.4, bias_heads=False, bias_tails=False,
+                 bias_stick_to_prev_com_choice=False,
+                 bias_switch_from_prev_com_choice=False,
+                 bias_stick_to_prev_user_choice=False,
+                 bias_switch_from_prev_user_choice=False, frustrator=False,
+                 rng=None, opponent=None, strategy=None,
+                 record_history=False):
+        if rng is None:
+            rng = random
+        self.rng = rng
+        if strategy is None:
+            names = strategy_names_function(
+                bias_heads, bias_tails, bias_stick_to_prev_com_choice,
+                bias_switch_from_prev_com_choice,
+                bias_stick_to_prev_user_choice,
+                bias_switch_from_prev_user_choice, frustrator)
+            strategy = compose_strategy(names, bias, opponent=opponent,
+                                        rng=rng)
+        self.strategy = strategy
+        self.bias = strategy.bias
+        # every possible cut-off is computed once, each round only looks its
+        # cut-off up (see strategies.ComputerStrategy)
+        self.cut_offs = strategy.cut_offs
+        self.opponent = strategy.opponent
+        self.record_history = record_history
+        self.reset()
+
+    def reset(self):
+        """
+        Sets the state back to the start of a game.
+        """
+        self.wins = 0
+        self.losses = 0
+        self.rounds = 1
+        self.choice_change_subject = 0
+        self.choice_change_computer = 0
+        self.prev_com_choice = 0
+        self.prev_subj_choice = 0
+        if self.record_history is True:
+            self.history = SessionHistory()
+        else:
+            self.history = None
+
+    def cut_off(self):
+        """
+        Looks up the cut-off of the next round for the current state.
+
+        Returns
+        -------
+        cut_off : float or None
+            (nearly) the probability of the computer choosing heads, None if
+            an opponent chooses for the computer.
+        """
+        return self.strategy.cut_off(self.prev_com_choice,
+                                     self.prev_subj_choice)
+
+    def step(self, choice_subject):
+        """
+        Plays one round.
+
+        Parameters
+        ----------
+        choice_subject : str
+            the decision of the subject, either 'h' or 't'.
+
+        Returns
+        -------
+        choice_computer : str
+            the decision of the computer, either 'h' or 't'.
+        """
+        choice_computer = self.strategy(choice_subject, self.prev_com_choice,
+                                        self.prev_subj_choice,
+                                        self.rng.random())
+
+        if self.rounds > 1:
+            if self.prev_subj_choice != choice_subject:
+                self.choice_change_subject += 1
+            if self.prev_com_choice != choice_subject:
+                self.choice_change_computer += 1
+        if choice_subject == choice_computer:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+        self.rounds += 1
+        self.prev_com_choice = choice_computer
+        self.prev_subj_choice = choice_subject
+        if self.history is not None:
+            self.history.append(choice_subject, choice_computer)
+        return choice_computer
+
+    def run(self, subject_choices):
+        """
+        Plays one round per choice of the subject. Gives the same results as
+        calling step for every choice, but keeps the state in local variables.
+
+        Parameters
+        ----------
+        subject_choices : iterable of str
+            the decisions of the subject, each either 'h' or 't'.
+
+        Returns
+        -------
+        computer_choices : list of str
+            the decisions of the computer, one per round.
+        """
+        if self.opponent is not None:
+            # the opponent's methods are called every round anyway, so there
+            # is nothing to gain from the loop below
+            return [self.step(choice) for choice in subject_choices]
+
+        if self.history is not None:
+            # the choices are needed again for the history
+            subject_choices = list(subject_choices)
+
+        ran = self.rng.random
+        tie_rng = self.strategy.rng
+        respond = self.strategy.respond
+        wins = self.wins
+        losses = self.losses
+        rounds = self.rounds
+        change_subject = self.choice_change_subject
+        change_computer = self.choice_change_computer
+        prev_com = self.prev_com_choice
+        prev_subj = self.prev_subj_choice
+
+        cut_offs = self.cut_offs
+        computer_choices = []
+        append = computer_choices.append
+
+        for choice_subject in subject_choices:
+            choice_computer = computer_choice_function(
+                cut_offs[prev_com, prev_subj], ran(), tie_rng)
+            choice_computer = respond(choice_subject, choice_computer)
+
+            if rounds > 1:
+                if prev_subj != choice_subject:
+                    change_subject += 1
+                if prev_com != choice_subject:
+                    change_computer += 1
+            if choice_subject == choice_computer:
+                wins += 1
+            else:
+                losses += 1
+
+            rounds += 1
+            prev_com = choice_computer
+            prev_subj = choice_subject
+            append(choice_computer)
+
+        self.wins = wins
+        self.losses = losses
+        self.rounds = rounds
+        self.choice_change_subject = change_subject
+        self.choice_change_computer = change_computer
+        self.prev_com_choice = prev_com
+        self.prev_subj_choice = prev_subj
+        if self.history is not None:
+            self.history.extend(subject_choices, computer_choices)
+        return computer_choices
+
+    def play(self, player, n_rounds):
+        """
+        Lets a simulated subject (see player_agents.py) play against the
+        computer.
+
+        Parameters
+        ----------
+        player : object
+            the subject, with the methods choose() returning 'h' or 't' and
+            observe(choice_subject, choice_computer).
+        n_rounds : int
+            the amount of rounds to be played.
+
+        Returns
+        -------
+        engine : MatchingPenniesEngine
+            the engine itself, with the wins, losses and choice changes of
+            the subject updated.
+        """
+        choose = player.choose
+        observe = player.observe
+        step = self.step
+        for i in range(n_rounds):
+            choice_subject = choose()
+            observe(choice_subject, step(choice_subject))
+        return self
@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""
+Game logic of the matching pennies game, i.e. everything that decides the
+computer's choice and scores a round, but nothing that is displayed.
+
+This module doesn't import psychopy, so the functions can be imported by the
+main program (assignment_psychopy.py), the tests and any simulation without
+opening a window.
+
+The game, the engine and the simulations compose the computer's strategies
+with strategies.compose_strategy, which builds on the bias functions below.
+allowed_bias_combis, cut_off_function and cut_off_table_function are the
+reference implementation of the original bias settings (one bool per bias):
+they aren't used by the game, but test_strategies checks that the composed
+strategies accept the same combinations and compute the same cut-offs.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import random
+
+# %% check of the bias settings
+
+
+def allowed_bias_combis(bias_heads, bias_tails, bias_stick_to_prev_com_choice,
+                        bias_switch_from_prev_com_choice,
+                        bias_stick_to_prev_user_choice,
+                        bias_switch_from_prev_user_choice, frustrator):
+    """
+    Checks if the combination of biases is valid, raises an error if not.
+    Reference implementation, the game checks its strategies with
+    strategies.compose_strategy.
+
+    Parameters
+    ----------
+    bias_heads : bool
+        stores whether the computer should be biased towards choosing heads.
+    bias_tails : bool
+        stores whether the computer should be biased towards choosing tails.
+    bias_stick_to_prev_com_choice : bool
+        stores whether the computer should be biased towards sticking to its
+        previous choice.
+    bias_switch_from_prev_com_choice : bool
+        stores whether the computer should be biased towards switching from its
+        previous choice.
+    bias_stick_to_prev_user_choice : bool
+        stores whether the computer should be biased towards sticking to the
+        user's previous choice.
+    bias_switch_from_prev_user_choice : bool
+        stores whether the computer should be biased towards sticking to the
+        user's previous choice.
+    frustrator : bool
+        stores whether the computer should always choose the opposite of the
+        user.
+
+    Raises
+    ------
+    ValueError
+        raises an exception if the bias function frustrator is combined with
+        other functions. This is because the frustrator doesn't work with
+        probabilites and necessarily simply overwrites all other biases.
+    """
+    if frustrator is True:
+        if (bias_heads or bias_tails or bias_stick_to_prev_com_choice or
+            bias_switch_from_prev_com_choice or bias_stick_to_prev_user_choice
+                or bias_switch_from_prev_user_choice) is True:
+            raise ValueError("""Frustrator is not compatible with other biases
+                             as it would simply cover all other possible
+                             effects""")
+
+
+# %% bias functions
+
+
+# function to give error message for bad values of the bias and except for
+# that only returns the bias
+def bias_function(bias):
+    """
+    Simply returns the bias or raises an error for bad values of the bias.
+
+    Parameters
+    ----------
+    bias : float
+        the bias of the computer chosen by the experimenter.
+
+    Raises
+    ------
+    ValueError
+        raises an exception if the bias is smaller than -0.5 or bigger than 0.5
+        as this would in the end mean that the program had to calculate
+        probabilities smaller than 0 or bigger than 1.
+
+    Returns
+    -------
+    bias : float
+        the bias of the computer chosen by the experimenter.
+    """
+    if bias < -0.5:
+        raise ValueError("""You chose a value for bias that is smaller than
+                         -0.5. As the cut-off value is equal to 0.5, which is
+                         used to compute probabilities, adding a value smaller
+                         than -0.5 makes the probability negative. Probabilites
+                         however are always >= 0 (at least on standard
+                         interpretations of probabilities). Try a value that is
+                         between -0.5 and 0.5 instead!""")
+    if bias > 0.5:
+        raise ValueError("""You chose a value for bias that is bigger than
+                         0.5. As the cut-off value is equal to 0.5, which is
+                         used to compute probabilities, adding a value bigger
+                         than 0.5 makes the probability > 1. Probabilites
+                         however are always <= 1 (at least on standard
+                         interpretations of probabilities). Try a value that is
+                         between -0.5 and 0.5 instead!""")
+    return bias
+
+
+def stick_to_prev_com_choice_function(prev_com_choice, cut_off, bias):
+    """
+    Biases the computer towards sticking to its previous choice
+
+    Parameters
+    ----------
+    prev_com_choice : str
+        stores the decision of the computer between heads and tails of the
+        previous round.
+    cut_off : float
+        stores a value which is used to compute the choice of the computer.
+        If a random generated float is smaller than the cut_off, the computer's
+        decision is heads, otherwise it is tails.
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+
+    Returns
+    -------
+    cut_off : float
+        updated version of the cut_off variable described above to bias the
+        computer towards sticking to its previous choice.
+    """
+    if prev_com_choice == 'h':
+        cut_off = cut_off + bias_function(bias)
+    else:
+        cut_off = round(cut_off - bias_function(bias), 2)
+    return cut_off
+
+
+def switch_from_prev_com_choice_function(prev_com_choice, cut_off, bias):
+    """
+    Biases the computer towards switching from its previous choice
+
+    Parameters
+    ----------
+    prev_com_choice : str
+        stores the decision of the computer between heads and tails of the
+        previous round.
+    cut_off : float
+        stores a value which is used to compute the choice of the computer.
+        If a random generated float is smaller than the cut_off, the computer's
+        decision is heads, otherwise it is tails.
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+
+    Returns
+    -------
+    cut_off : float
+        updated version of the cut_off variable described above to bias the
+        computer towards switching from its previous choice.
+    """
+    if prev_com_choice == 'h':
+        cut_off = round(cut_off - bias_function(bias), 2)
+    else:
+        cut_off = cut_off + bias_function(bias)
+    return cut_off
+
+
+def bias_stick_to_prev_user_choice_function(prev_subj_choice, cut_off, bias):
+    """
+    Biases the computer towards sticking to the user's previous choice
+
+    Parameters
+    ----------
+    prev_subj_choice : str
+        stores the decision of the subject between heads and tails of the
+        previous round.
+    cut_off : float
+        stores a value which is used to compute the choice of the computer.
+        If a random generated float is smaller than the cut_off, the computer's
+        decision is heads, otherwise it is tails.
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+
+    Returns
+    -------
+    cut_off : float
+        updated version of the cut_off variable described above to bias the
+        computer towards sticking to the user's previous choice.
+    """
+    if prev_subj_choice == 'h':
+        cut_off = cut_off + bias_function(bias)
+    else:
+        cut_off = round(cut_off - bias_function(bias), 2)
+    return cut_off
+
+
+def bias_switch_from_prev_user_choice_function(prev_subj_choice,
+                                               cut_off, bias):
+    """
+   Biases the computer towards switching from the user's previous choice
+
+    Parameters
+    ----------
+    prev_subj_choice : str
+        stores the decision of the subject between heads and tails of the
+        previous round.
+    cut_off : float
+        stores a value which is used to compute the choice of the computer.
+        If a random generated float is smaller than the cut_off, the computer's
+        decision is heads, otherwise it is tails.
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+
+    Returns
+    -------
+    cut_off : float
+        updated version of the cut_off variable described above to bias the
+        computer towards switching from the user's previous choice.
+    """
+    if prev_subj_choice == 'h':
+        cut_off = round(cut_off - bias_function(bias), 2)
+    else:
+        cut_off = cut_off + bias_function(bias)
+    return cut_off
+
+
+def bias_heads_function(cut_off, bias):
+    """
+    Biases the computer towards choosing heads
+
+    Parameters
+    ----------
+    cut_off : float
+        stores a value which is used to compute the choice of the computer.
+        If a random generated float is smaller than the cut_off, the computer's
+        decision is heads, otherwise it is tails.
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+
+    Returns
+    -------
+    cut_off : float
+        updated version of the cut_off variable described above to bias the
+        computer towards choosing heads.
+    """
+    cut_off = cut_off + bias_function(bias)
+    return cut_off
+
+
+def bias_tails_function(cut_off, bias):
+    """
+    Biases the computer towards choosing tails
+
+    Parameters
+    ----------
+    cut_off : float
+        stores a value which is used to compute the choice of the computer.
+        If a random generated float is smaller than the cut_off, the computer's
+        decision is heads, otherwise it is tails.
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+
+    Returns
+    -------
+    cut_off : float
+        updated version of the cut_off variable described above to bias the
+        computer towards choosing tails.
+    """
+    cut_off = round(cut_off - bias_function(bias), 2)
+    return cut_off
+
+
+def frustrator_function(choice_subject, choice_computer):
+    """
+    Lets the computer always choose the opposite of the user
+
+    Parameters
+    ----------
+    choice_subject : str
+        stores the decision of the subject between heads and tails of the
+        current round.
+    choice_computer : str
+        stores the decision of the computer between heads and tails of the
+        current round.
+
+    Returns
+    -------
+    choice_computer : str
+        updated version of the choice_computer variable described above. Now
+        always the opposite of choice_subject.
+    """
+    if choice_subject == 'h':
+        choice_computer = 't'
+    else:
+        choice_computer = 'h'
+    return choice_computer
+
+
+# %% functions used in every round
+
+
+def cut_off_function(rounds, prev_com_choice, prev_subj_choice, bias,
+                     bias_heads=False, bias_tails=False,
+                     bias_stick_to_prev_com_choice=False,
+                     bias_switch_from_prev_com_choice=False,
+                     bias_stick_to_prev_user_choice=False,
+                     bias_switch_from_prev_user_choice=False):
+    """
+    Computes the cut-off of the current round by applying all the biases that
+    are activated to the default value of 0.5. The biases depending on the
+    previous round are only applied from the second round on. Reference
+    implementation, the game uses the table of strategies.ComputerStrategy.
+
+    Parameters
+    ----------
+    rounds : int
+        number of the current round, starting at 1.
+    prev_com_choice : str
+        stores the decision of the computer between heads and tails of the
+        previous round.
+    prev_subj_choice : str
+        stores the decision of the subject between heads and tails of the
+        previous round.
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+    bias_heads, bias_tails, bias_stick_to_prev_com_choice,
+    bias_switch_from_prev_com_choice, bias_stick_to_prev_user_choice,
+    bias_switch_from_prev_user_choice : bool, optional
+        store whether the respective bias is activated (see
+        allowed_bias_combis). The default is False for all of them.
+
+    Returns
+    -------
+    cut_off : float
+        the value which is used to compute the choice of the computer. It is
+        (nearly) equal to the probability of the computer choosing heads.
+    """
+    cut_off = 0.5
+    if rounds > 1:
+        # biases the computer towards sticking to the user's previous choice
+        if bias_stick_to_prev_user_choice is True:
+            cut_off = bias_stick_to_prev_user_choice_function(prev_subj_choice,
+                                                              cut_off, bias)
+
+        # biases the computer towards switching from the user's previous choice
+        if bias_switch_from_prev_user_choice is True:
+            cut_off = bias_switch_from_prev_user_choice_function(
+                prev_subj_choice, cut_off, bias)
+
+        # biases the computer towards sticking to its previous choice
+        if bias_stick_to_prev_com_choice is True:
+            cut_off = stick_to_prev_com_choice_function(prev_com_choice,
+                                                        cut_off, bias)
+
+        # biases the computer towards switching from its previous choice
+        if bias_switch_from_prev_com_choice is True:
+            cut_off = switch_from_prev_com_choice_function(prev_com_choice,
+                                                           cut_off, bias)
+
+    # biases the computer towards heads
+    if bias_heads is True:
+        cut_off = bias_heads_function(cut_off, bias)
+
+    # biases the computer towards tails
+    if bias_tails is True:
+        cut_off = bias_tails_function(cut_off, bias)
+    return cut_off
+
+
+def cut_off_table_function(bias, **biases):
+    """
+    Computes every cut-off that can occur with the given biases once, so that
+    every round only has to look its cut-off up instead of calling all the
+    bias functions again. The cut-off only depends on whether it's the first
+    round and on the previous choices of the computer and the subject.
+    Reference implementation of ComputerStrategy.cut_offs (strategies.py).
+
+    Parameters
+    ----------
+    bias : float
+        stores a value to bias the computer to the extend of the value.
+    **biases : bool
+        the activated biases as keyword arguments of cut_off_function, e.g.
+        bias_heads=True.
+
+    Returns
+    -------
+    cut_offs : dict
+        the cut-offs with (prev_com_choice, prev_subj_choice) as keys. The
+        cut-off of the first round has the key (0, 0), as both previous
+        choices are 0 before the first round.
+    """
+    cut_offs = {(0, 0): cut_off_function(1, 0, 0, bias, **biases)}
+    for prev_com_choice in ['h', 't']:
+        for prev_subj_choice in ['h', 't']:
+            cut_offs[prev_com_choice, prev_subj_choice] = cut_off_function(
+                2, prev_com_choice, prev_subj_choice, bias, **biases)
+    return cut_offs
+
+
+def computer_choice_function(cut_off, ran_float, rng=random):
+    """
+    Determines the choice of the computer from the cut-off and a random float
+
+    Parameters
+    ----------
+    cut_off : float
+        if ran_float is smaller than the cut_off, the computer's decision is
+        heads, otherwise it is tails.
+    ran_float : float
+        a random float between 0 and 1, e.g. from random.random().
+    rng : random.Random or session_random.SessionRandom, optional
+        used for a new random choice in case ran_float equals the cut-off.
+        The default is the global random module.
+
+    Returns
+    -------
+    choice_computer : str
+        the decision of the computer, either 'h' or 't'.
+    """
+    if ran_float < cut_off:
+        choice_computer = 'h'
+    elif ran_float > cut_off:
+        choice_computer = 't'
+    # just to be super fair and not give either 'h' or 't' a slight
+    # (negligible) advantage, in case ran_float == cut_off, there is a new
+    # random choice
+    else:
+        choice_computer = rng.choice(['h', 't'])
+    return choice_computer
+
+
+def choice_change_function(rounds, choice_subject, prev_subj_choice,
+                           prev_com_choice, choice_change_subject,
+                           choice_change_computer):
+    """
+    Counts the changes the subject makes in their decisions relative to their
+    own and to the computer's previous choice
+
+    Parameters
+    ----------
+    rounds : int
+        number of the current round, starting at 1. Nothing is counted in the
+        first round.
+    choice_subject : str
+        the decision of the subject in the current round.
+    prev_subj_choice : str
+        the decision of the subject in the previous round.
+    prev_com_choice : str
+        the decision of the computer in the previous round.
+    choice_change_subject : int
+        how often the subject changed from their own previous choice so far.
+    choice_change_computer : int
+        how often the subject changed from the computer's previous choice so
+        far.
+
+    Returns
+    -------
+    choice_change_subject : int
+        updated version of choice_change_subject.
+    choice_change_computer : int
+        updated version of choice_change_computer.
+    """
+    if rounds > 1:
+        if prev_subj_choice != choice_subject:
+            choice_change_subject += 1
+        if prev_com_choice != choice_subject:
+            choice_change_computer += 1
+    return choice_change_subject, choice_change_computer
+
+
+def round_result_function(choice_subject, choice_computer, wins, losses):
+    """
+    Scores a round. As the subject is the 'even' player, they win if both
+    pennies match.
+
+    Parameters
+    ----------
+    choice_subject : str
+        the decision of the subject in the current round.
+    choice_computer : str
+        the decision of the computer in the current round.
+    wins : int
+        stores the amount of wins of the subject
+    losses : int
+        stores the amount of losses of the subject
+
+    Returns
+    -------
+    wins : int
+        updated amount of wins.
+    losses : int
+        updated amount of losses.
+    """
+    if choice_subject == choice_computer:
+        wins += 1
+    else:
+        losses += 1
+    return wins, losses
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Computer opponent that predicts the subject's next choice from the last k
+rounds.
+
+Unlike the biases (see game_logic.py and strategies.py), which only look one
+round back, the NGramOpponent counts how often the subject chose heads and
+tails after each possible history of the last k rounds (choices of both
+players) and chooses the opposite of the more likely choice. As the computer
+is the 'odd' player, it wins whenever the pennies don't match.
+
+The history is packed into an integer with two bits per round, so the counts
+are a flat list indexed by the history. Updating the counts and choosing take
+constant time, independent of k and of the length of the session.
+
+The opponent has the same interface as the simulated players (see
+player_agents.py): choose() returns 'h' or 't' and observe(choice_subject,
+choice_computer) shows it the result of the round. It is registered as the
+strategy 'ngram' (see strategies.py), so it can be used in the main program
+(computer_strategies = ['ngram'] in assignment_psychopy.py) and in
+MatchingPenniesEngine (strategy or opponent).
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import random
+
+# %% opponent
+
+
+class NGramOpponent:
+    """
+    Predicts the subject's next choice from the last k rounds.
+
+    Parameters
+    ----------
+    k : int, optional
+        the amount of previous rounds the prediction is based on. The default
+        is 4.
+    decay : float, optional
+        factor by which old observations lose weight each round, between 0
+        and 1. With 1 (the default), all rounds count equally, with smaller
+        values the opponent adapts faster to changes of the subject.
+    rng : random.Random, optional
+        source of the random choices if both choices are equally likely. The
+        default is a new random.Random.
+
+    Attributes
+    ----------
+    counts : list of float
+        the weighted counts of heads (even index) and tails (odd index) for
+        every history, i.e. counts[2 * history] and counts[2 * history + 1].
+    history : int
+        the last k rounds, two bits per round (subject, computer), the most
+        recent round in the lowest bits.
+    """
+
+    __slots__ = ('k', 'decay', 'counts', 'history', '_mask', '_weight',
+                 '_random')
+
+    # the weight of new observations grows every round instead of shrinking
+    # all counts (which would take time proportional to the amount of
+    # counts). Once it gets this large, all counts are scaled down
+    max_weight = 1e100
+
+    def __init__(self, k=4, decay=1.0, rng=None):
+        if not 0 < decay <= 1:
+            raise ValueError("decay has to be bigger than 0 and at most 1")
+        if rng is None:
+            rng = random.Random()
+        self.k = k
+        self.decay = decay
+        self.counts = [0.0] * (2 * 4 ** k)
+        self.history = 0
+        self._mask = 4 ** k - 1
+        self._weight = 1.0
+        self._random = rng.random
+
+    def predict(self):
+        """
+        Predicts the subject's next choice.
+
+        Returns
+        -------
+        choice : str or None
+            'h' or 't', None if both are equally likely.
+        """
+        index = 2 * self.history
+        heads = self.counts[index]
+        tails = self.counts[index + 1]
+        if heads > tails:
+            return 'h'
+        if tails > heads:
+            return 't'
+        return None
+
+    def choose(self):
+        """
+        Chooses the opposite of the predicted choice of the subject.
+
+        Returns
+        -------
+        choice_computer : str
+            'h' or 't'.
+        """
+        prediction = self.predict()
+        if prediction == 'h':
+            return 't'
+        if prediction == 't':
+            return 'h'
+        if self._random() < 0.5:
+            return 'h'
+        return 't'
+
+    def observe(self, choice_subject, choice_computer):
+        """
+        Counts the subject's choice for the current history and adds the
+        round to the history.
+
+        Parameters
+        ----------
+        choice_subject, choice_computer : str
+            the decisions of the subject and the computer in this round.
+        """
+        subject_bit = choice_subject == 't'
+        self.counts[2 * self.history + subject_bit] += self._weight
+
+        if self.decay < 1:
+            self._weight /= self.decay
+            if self._weight > self.max_weight:
+                self.counts = [count / self._weight for count in self.counts]
+                self._weight = 1.0
+
+        self.history = (((self.history << 2) | (subject_bit << 1) |
+                         (choice_computer == 't')) & self._mask)
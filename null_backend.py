@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the real game (assignment_psychopy.main) without a screen and without a
+subject.
+
+NullBackend replaces the parts of psychopy the game uses: visual.Window and
+the stimuli don't draw anything, flips return immediately, event.globalKeys
+only stores the global keys and core.wait sleeps for a fraction of the time
+(time_scale, no time at all by default). Like in psychopy, win.flip() returns
+the time of core.monotonicClock, so the timing of the flips can be recorded
+(see frame_timing.py).
+
+The keyboard presses the keys of a script instead of waiting for a subject:
+one entry is pressed in every frame, i.e. after every flip (or core.wait,
+e.g. on the intro screens), at the first time the game polls the keyboard.
+None means that no key is pressed in that frame. Like a real key, a pressed
+key stays down for a few frames (hold) and its duration is None until it is
+released. Only keys still in the buffer get their duration, a key taken with
+clear=True while it was down stays without one. Once the script has run
+out, 'q' is pressed, which ends the game like a subject quitting.
+
+key_script turns a sequence of choices into such a script: both intro
+screens are continued (with enough frames in between to release the key),
+every choice is followed by enough empty frames for the feedback delay and two
+keys to continue past the feedback and the game info. The script is written
+before the rounds are played and the keyboard doesn't learn the computer's
+choices, so only players that don't react to the results (e.g. RandomPlayer
+and BiasedPlayer of player_agents.py) can be turned into a script. Reactive
+players play against MatchingPenniesEngine (game_engine.py) instead.
+
+Everything but the drawing is the real game: the strategy of the computer,
+the scores, the game info and the statistics, the logs and the end screen.
+Running this module plays a given amount of rounds and prints how long a
+round takes:
+
+    python null_backend.py --rounds 100000
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import itertools
+import time
+from types import SimpleNamespace
+
+# %% clock, window and stimuli
+
+
+class NullClock:
+    """
+    Counts the seconds since it was created or last reset, like
+    psychopy.core.Clock. All clocks are based on time.perf_counter, which is
+    what core.getTime returns.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+
+    def reset(self):
+        self._start = time.perf_counter()
+
+    def getTime(self):
+        return time.perf_counter() - self._start
+
+
+class NullWindow:
+    """
+    A window that doesn't show anything, like psychopy.visual.Window.
+
+    Parameters
+    ----------
+    clock : NullClock
+        the clock the times of the flips are taken from, i.e.
+        core.monotonicClock.
+    on_flip : callable, optional
+        called after every flip. The default is None.
+    size : tuple of int, optional
+        width and height in pixels. The default is (800, 600).
+    frame_rate : float, optional
+        the refresh rate reported to the game. All waiting times within the
+        rounds are counted in frames, so a lower frame rate means fewer
+        frames per round. The default is 60.
+
+    Attributes
+    ----------
+    flips : int
+        the amount of flips so far.
+    draws : int
+        the amount of stimuli drawn so far.
+    """
+
+    def __init__(self, clock, on_flip=None, size=(800, 600), frame_rate=60.0,
+                 **options):
+        self.clock = clock
+        self.on_flip = on_flip
+        self.size = size
+        self.frame_rate = frame_rate
+        self.monitorFramePeriod = 1 / frame_rate
+        self.flips = 0
+        self.draws = 0
+        self._on_flip = []
+
+    def getActualFrameRate(self):
+        return self.frame_rate
+
+    def callOnFlip(self, function, *args):
+        self._on_flip.append((function, args))
+
+    def flip(self):
+        """
+        Calls the functions passed to callOnFlip, like a real flip.
+
+        Returns
+        -------
+        t_flip : float
+            the time of the flip on clock.
+        """
+        t_flip = self.clock.getTime()
+        for function, args in self._on_flip:
+            function(*args)
+        self._on_flip.clear()
+        self.flips += 1
+        if self.on_flip is not None:
+            self.on_flip()
+        return t_flip
+
+    def clearBuffer(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class NullStim:
+    """
+    Any stimulus (TextStim, ImageStim, BufferImageStim), which keeps its
+    attributes (e.g. text and pos) but doesn't draw anything.
+    """
+
+    def __init__(self, win, text='', **options):
+        self.win = win
+        self.text = text
+        self.__dict__.update(options)
+
+    def draw(self):
+        self.win.draws += 1
+
+
+class NullGlobalKeys:
+    """
+    Stores the global keys (psychopy.event.globalKeys), which are never
+    pressed.
+    """
+
+    def __init__(self):
+        self.keys = {}
+
+    def clear(self):
+        self.keys.clear()
+
+    def add(self, key, func, **options):
+        self.keys[key] = func
+
+# %% scripted keyboard
+
+
+class ScriptedKey:
+    """
+    A keypress with the attributes of psychopy's KeyPress that the game uses.
+    duration is None until the key is released.
+    """
+
+    __slots__ = ('name', 'rt', 'tDown', 'duration')
+
+    def __init__(self, name, rt, t_down):
+        self.name = name
+        self.rt = rt
+        self.tDown = t_down
+        self.duration = None
+
+
+class ScriptedKeyboard:
+    """
+    Presses the keys of a script, like psychopy.hardware.keyboard.Keyboard.
+
+    Parameters
+    ----------
+    keys : iterable
+        one key name or None per frame (see module docstring).
+    frame : callable, optional
+        returns the number of the current frame. The default is None, i.e.
+        every poll of the keyboard is a new frame.
+    hold : int, optional
+        the amount of frames a key stays down. The default is 1, i.e. it is
+        released in the next frame.
+
+    Attributes
+    ----------
+    clock : NullClock
+        the reaction times are measured from its last reset.
+    pressed : int
+        the amount of keys pressed so far.
+    """
+
+    def __init__(self, keys, frame=None, hold=1):
+        self._keys = iter(keys)
+        self._frame = frame
+        self._polls = 0
+        self._last_frame = None
+        self.hold = hold
+        self.clock = NullClock()
+        self.pressed = 0
+        # the keys not taken by getKeys yet, and the keys still down with
+        # the frame they were pressed in
+        self._buffer = []
+        self._down = []
+
+    def _press(self):
+        """
+        Presses the next key of the script (and releases the keys held long
+        enough) once per frame.
+        """
+        if self._frame is None:
+            self._polls += 1
+            frame = self._polls
+        else:
+            frame = self._frame()
+        if frame == self._last_frame:
+            return
+        self._last_frame = frame
+
+        t_now = time.perf_counter()
+        for key, pressed in list(self._down):
+            if frame - pressed >= self.hold:
+                if key in self._buffer:
+                    key.duration = t_now - key.tDown
+                self._down.remove((key, pressed))
+        name = next(self._keys, 'q')
+        if name is not None:
+            key = ScriptedKey(name, self.clock.getTime(), t_now)
+            self._buffer.append(key)
+            self._down.append((key, frame))
+            self.pressed += 1
+
+    def clearEvents(self):
+        """
+        Discards the keys not taken yet.
+        """
+        self._buffer.clear()
+
+    def getKeys(self, keyList=None, waitRelease=True, clear=True):
+        """
+        Returns the keys pressed so far, like psychopy's Keyboard.getKeys.
+
+        Parameters
+        ----------
+        keyList : list of str, optional
+            only these keys are returned. The default is None, i.e. all keys.
+        waitRelease : bool, optional
+            whether only released keys are returned. The default is True.
+        clear : bool, optional
+            whether the returned keys are removed from the buffer. The
+            default is True.
+
+        Returns
+        -------
+        keys : list of ScriptedKey
+            the keys, oldest first.
+        """
+        self._press()
+        keys = [key for key in self._buffer
+                if (keyList is None or key.name in keyList) and
+                (not waitRelease or key.duration is not None)]
+        if clear:
+            for key in keys:
+                self._buffer.remove(key)
+        return keys
+
+
+def key_script(choices, delay_frames, hold=1):
+    """
+    Turns the choices of a subject into a script for ScriptedKeyboard.
+
+    Parameters
+    ----------
+    choices : iterable of str
+        'h' or 't' for every round, may be a generator. The choices can't
+        depend on the results of the rounds (see module docstring).
+    delay_frames : int
+        the amount of frames the feedback is shown before the subject can
+        continue, the longer one of a win and a loss.
+    hold : int, optional
+        the amount of frames a key stays down (see ScriptedKeyboard). The
+        default is 1.
+
+    Yields
+    ------
+    key : str or None
+        the key pressed in each frame, None for no key.
+    """
+    # the welcome and the instruction screen wait until the key is released
+    for screen in range(2):
+        yield 'space'
+        yield from itertools.repeat(None, hold)
+    for choice in choices:
+        yield choice
+        yield from itertools.repeat(None, delay_frames)
+        # past the feedback and the game info to the next round
+        yield 'space'
+        yield 'space'
+    yield 'q'
+
+# %% backend
+
+
+class NullBackend:
+    """
+    Replaces the psychopy modules event, core, visual and keyboard for
+    assignment_psychopy.main(backend=...).
+
+    Parameters
+    ----------
+    keys : iterable
+        the script of the keyboard (see key_script).
+    frame_rate : float, optional
+        the refresh rate of the window. The default is 60.
+    time_scale : float, optional
+        core.wait sleeps for this fraction of the time. The default is 0, no
+        waiting at all.
+    hold : int, optional
+        the amount of frames a key stays down. The default is 1.
+
+    Attributes
+    ----------
+    windows : list of NullWindow
+        the windows opened by the game.
+    keyboards : list of ScriptedKeyboard
+        the keyboards created by the game.
+    """
+
+    def __init__(self, keys, frame_rate=60.0, time_scale=0.0, hold=1):
+        self.windows = []
+        self.keyboards = []
+        # flips and calls of core.wait, the keyboard presses one key of the
+        # script per frame
+        self.frames = 0
+        self._keys = keys
+        self._time_scale = time_scale
+        monotonic_clock = NullClock()
+
+        def window(**options):
+            win = NullWindow(monotonic_clock, self._next_frame,
+                             frame_rate=frame_rate, **options)
+            self.windows.append(win)
+            return win
+
+        def keyboard(**options):
+            kb = ScriptedKeyboard(self._keys, lambda: self.frames, hold)
+            self.keyboards.append(kb)
+            return kb
+
+        self.visual = SimpleNamespace(Window=window, TextStim=NullStim,
+                                      ImageStim=NullStim,
+                                      BufferImageStim=NullStim)
+        self.event = SimpleNamespace(globalKeys=NullGlobalKeys())
+        self.core = SimpleNamespace(wait=self.wait, getTime=time.perf_counter,
+                                    monotonicClock=monotonic_clock,
+                                    quit=self.quit)
+        self.keyboard = SimpleNamespace(Keyboard=keyboard)
+
+    def _next_frame(self):
+        self.frames += 1
+
+    def wait(self, secs):
+        self._next_frame()
+        if self._time_scale > 0:
+            time.sleep(secs * self._time_scale)
+
+    def quit(self):
+        raise SystemExit
+
+# %% throughput of the game
+
+
+def main():
+    """
+    Plays a given amount of rounds of a random subject with the real game and
+    prints the time per round.
+    """
+    import argparse
+    import os
+    import tempfile
+
+    import assignment_psychopy
+    from player_agents import RandomPlayer
+
+    parser = argparse.ArgumentParser(description=main.__doc__.strip())
+    parser.add_argument('--rounds', type=int, default=100000)
+    parser.add_argument('--frame-rate', type=float, default=60.0,
+                        help='refresh rate of the window, lower rates mean '
+                        'fewer frames during the feedback delay')
+    parser.add_argument('--log-folder', default=None,
+                        help='folder of the logs, a new temporary folder by '
+                        'default')
+    args = parser.parse_args()
+
+    if args.log_folder is None:
+        args.log_folder = tempfile.mkdtemp(prefix='pennies_')
+    os.makedirs(args.log_folder, exist_ok=True)
+    assignment_psychopy.log_folder = args.log_folder
+
+    player = RandomPlayer()
+    choices = (player.choose() for i in range(args.rounds))
+    delay = max(assignment_psychopy.delay_win, assignment_psychopy.delay_loss)
+    backend = NullBackend(key_script(choices, round(delay * args.frame_rate)),
+                          frame_rate=args.frame_rate)
+
+    t_start = time.perf_counter()
+    assignment_psychopy.main(backend=backend)
+    duration = time.perf_counter() - t_start
+
+    win = backend.windows[0]
+    print("{} rounds in {:.2f} s: {:.1f} us per round, {:.2f} us per frame "
+          "({} frames)".format(args.rounds, duration,
+                               duration / max(args.rounds, 1) * 1e6,
+                               duration / max(win.flips, 1) * 1e6, win.flips))
+    print("logs saved to", args.log_folder)
+
+
+if __name__ == '__main__':
+    main()
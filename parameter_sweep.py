@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Sweep over all bias settings of the computer.
+
+The biases of the computer can be combined in many ways (see the bias
+variables in assignment_psychopy.py), some of which cancel each other out or
+lock the computer into heads or tails. sweep simulates every combination of
+biases accepted by strategies.compose_strategy for a grid of values of
+bias against several player models and reports the expected win rate and
+switch rates of each setting. The simulations are distributed over several
+processes, each simulation gets its own independent stream of random
+numbers (a child of the SessionRandom of the seed, see session_random.py), so
+the results don't depend on the amount of processes. The seed and the
+spawn_key of that stream are stored in every row, so every row can be
+reproduced on its own: SessionRandom(seed, spawn_key=spawn_key) gives the
+same random numbers (in the csv file, spawn_key is written as a tuple, e.g.
+"(3,)"). The frustrator ignores bias, so it is only simulated once per
+player model, with an empty bias.
+
+Run it from the command line, e.g.:
+    python parameter_sweep.py --sessions 1000 --rounds 100 --out sweep.csv
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_simulation import simulate_sessions
+from session_random import SessionRandom
+from strategies import compose_strategy, strategy_names_function
+
+# %% variables
+
+bias_names = ['bias_heads', 'bias_tails', 'bias_stick_to_prev_com_choice',
+              'bias_switch_from_prev_com_choice',
+              'bias_stick_to_prev_user_choice',
+              'bias_switch_from_prev_user_choice', 'frustrator']
+
+# values of bias from -0.5 to 0.5 in steps of 0.1
+bias_values = [round(i / 10, 1) for i in range(-5, 6)]
+
+# %% player models
+# each model gets a SessionRandom (or a numpy.random.Generator) and the
+# amount of sessions and rounds and returns the choices of the subject (True
+# for heads). The models don't react to the computer, so all rounds can be
+# simulated at once. The reactive players of player_agents.py play one round
+# at a time against MatchingPenniesEngine and aren't part of the sweep
+
+
+def random_player(rng, n_sessions, n_rounds):
+    """Chooses heads and tails with equal probability."""
+    return rng.random((n_sessions, n_rounds)) < 0.5
+
+
+def heads_player(rng, n_sessions, n_rounds):
+    """Chooses heads with a probability of 0.7."""
+    return rng.random((n_sessions, n_rounds)) < 0.7
+
+
+def alternating_player(rng, n_sessions, n_rounds):
+    """Switches every round, starting randomly with heads or tails."""
+    start = rng.random((n_sessions, 1)) < 0.5
+    return start ^ (np.arange(n_rounds) % 2 == 1)
+
+
+def sticky_player(rng, n_sessions, n_rounds):
+    """Repeats their previous choice with a probability of 0.8."""
+    switches = rng.random((n_sessions, n_rounds)) < 0.2
+    switches[:, 0] = rng.random(n_sessions) < 0.5
+    return np.logical_xor.accumulate(switches, axis=1)
+
+
+player_models = {'random': random_player,
+                 'heads': heads_player,
+                 'alternating': alternating_player,
+                 'sticky': sticky_player}
+
+# %% functions
+
+
+def bias_combis_function():
+    """
+    Lists all combinations of biases that compose_strategy accepts
+
+    Returns
+    -------
+    combis : list of dict
+        every valid combination, with the names of the bias variables as keys
+        and True or False as values.
+    """
+    combis = []
+    for values in itertools.product([False, True], repeat=len(bias_names)):
+        combi = dict(zip(bias_names, values))
+        try:
+            compose_strategy(strategy_names_function(**combi))
+        except ValueError:
+            continue
+        combis.append(combi)
+    return combis
+
+
+def simulate_setting(task):
+    """
+    Simulates one setting, i.e. one combination of biases and one value of
+    bias against one player model. Runs in the worker processes.
+
+    Parameters
+    ----------
+    task : tuple
+        (biases, bias, player, n_sessions, n_rounds, seed, spawn_key), the
+        last two identifying the stream of random numbers of the setting.
+        bias is None for the frustrator.
+
+    Returns
+    -------
+    row : dict
+        the setting, the seed and spawn_key, the win rate of the subject and
+        the switch rates, i.e. how often (per round after the first) the
+        subject switched from their own and from the computer's previous
+        choice and how often the computer switched from its own previous
+        choice.
+    """
+    biases, bias, player, n_sessions, n_rounds, seed, spawn_key = task
+    rng = SessionRandom(seed, spawn_key=spawn_key)
+
+    subject_choices = player_models[player](rng, n_sessions, n_rounds)
+    if bias is None:
+        result = simulate_sessions(subject_choices, rng=rng, **biases)
+    else:
+        result = simulate_sessions(subject_choices, bias=bias, rng=rng,
+                                   **biases)
+
+    computer = result.computer_choices
+    changes = max(n_rounds - 1, 1) * n_sessions
+    row = dict(biases)
+    row.update({
+        'bias': bias,
+        'player': player,
+        'seed': seed,
+        'spawn_key': tuple(spawn_key),
+        'win_rate': result.wins.sum() / (n_rounds * n_sessions),
+        'switch_rate_subject': result.choice_change_subject.sum() / changes,
+        'switch_rate_from_computer':
+            result.choice_change_computer.sum() / changes,
+        'switch_rate_computer':
+            (computer[:, 1:] != computer[:, :-1]).sum() / changes})
+    return row
+
+
+def sweep(biases=None, players=None, n_sessions=1000, n_rounds=100,
+          seed=None, workers=None):
+    """
+    Simulates every combination of biases for every value of bias against
+    every player model.
+
+    Parameters
+    ----------
+    biases : list of float, optional
+        the values of bias. The default is bias_values (-0.5 to 0.5).
+    players : list of str, optional
+        names of the player models. The default is all of player_models.
+    n_sessions : int, optional
+        the amount of simulated sessions per setting. The default is 1000.
+    n_rounds : int, optional
+        the amount of rounds per session. The default is 100.
+    seed : int, optional
+        the seed all random numbers are derived from. The default is None,
+        i.e. a random seed.
+    workers : int, optional
+        the amount of processes. The default is the amount of CPUs. With 1,
+        everything runs in this process.
+
+    Returns
+    -------
+    rows : list of dict
+        one row per setting (see simulate_setting), in the order of the
+        settings. The frustrator has one row per player model, with bias
+        None.
+    """
+    if biases is None:
+        biases = bias_values
+    if players is None:
+        players = list(player_models)
+
+    # the frustrator doesn't depend on bias, so it is only simulated once
+    settings = [(combi, bias, player)
+                for combi in bias_combis_function()
+                for bias in ([None] if combi['frustrator'] else biases)
+                for player in players]
+    # every setting gets its own independent stream of random numbers. Only
+    # the seed and the key of the stream are sent to the processes
+    streams = SessionRandom(seed).spawn(len(settings))
+    tasks = [(combi, bias, player, n_sessions, n_rounds, stream.seed,
+              stream.spawn_key)
+             for (combi, bias, player), stream in zip(settings, streams)]
+
+    if workers == 1:
+        return [simulate_setting(task) for task in tasks]
+    if workers is None:
+        workers = os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        return list(executor.map(simulate_setting, tasks,
+                                 chunksize=chunksize))
+
+
+def write_table(rows, path):
+    """
+    Writes the results of sweep to a csv file
+
+    Parameters
+    ----------
+    rows : list of dict
+        the results of sweep.
+    path : str
+        path of the csv file.
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    """
+    Runs the sweep with the settings given on the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default='sweep.csv')
+    args = parser.parse_args()
+
+    rows = sweep(n_sessions=args.sessions, n_rounds=args.rounds,
+                 seed=args.seed, workers=args.workers)
+    write_table(rows, args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Simulated subjects for the matching pennies game.
+
+Every player has the same interface: choose() returns the key the subject
+would press, 'h' or 't', and observe(choice_subject, choice_computer) shows
+them the result of the round. The players can be passed to
+MatchingPenniesEngine.play (game_engine.py), which keeps track of the wins,
+losses and the choice changes exactly like the main program.
+
+The players keep their state in a few attributes (__slots__) and don't
+create new objects when choosing, so they can play millions of rounds.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import random
+
+# %% players
+
+
+class RandomPlayer:
+    """
+    Chooses heads and tails with equal probability.
+
+    Parameters
+    ----------
+    rng : random.Random, optional
+        source of the random numbers. The default is a new random.Random.
+    """
+
+    __slots__ = ('_random',)
+
+    def __init__(self, rng=None):
+        if rng is None:
+            rng = random.Random()
+        self._random = rng.random
+
+    def choose(self):
+        if self._random() < 0.5:
+            return 'h'
+        return 't'
+
+    def observe(self, choice_subject, choice_computer):
+        pass
+
+
+class BiasedPlayer:
+    """
+    Chooses heads with a fixed probability.
+
+    Parameters
+    ----------
+    p_heads : float
+        the probability of choosing heads.
+    rng : random.Random, optional
+        source of the random numbers. The default is a new random.Random.
+    """
+
+    __slots__ = ('p_heads', '_random')
+
+    def __init__(self, p_heads, rng=None):
+        if rng is None:
+            rng = random.Random()
+        self.p_heads = p_heads
+        self._random = rng.random
+
+    def choose(self):
+        if self._random() < self.p_heads:
+            return 'h'
+        return 't'
+
+    def observe(self, choice_subject, choice_computer):
+        pass
+
+
+class WinStayLoseShiftPlayer:
+    """
+    Repeats their choice after a win and switches after a loss. Chooses
+    randomly in the first round.
+
+    Parameters
+    ----------
+    rng : random.Random, optional
+        source of the random numbers. The default is a new random.Random.
+    """
+
+    __slots__ = ('_next', '_random')
+
+    def __init__(self, rng=None):
+        if rng is None:
+            rng = random.Random()
+        self._random = rng.random
+        self._next = None
+
+    def choose(self):
+        if self._next is None:
+            if self._random() < 0.5:
+                return 'h'
+            return 't'
+        return self._next
+
+    def observe(self, choice_subject, choice_computer):
+        if choice_subject == choice_computer:
+            self._next = choice_subject
+        elif choice_subject == 'h':
+            self._next = 't'
+        else:
+            self._next = 'h'
+
+
+class AlternatingPlayer:
+    """
+    Switches their choice every round.
+
+    Parameters
+    ----------
+    first : str, optional
+        the choice in the first round. The default is 'h'.
+    """
+
+    __slots__ = ('_next',)
+
+    def __init__(self, first='h'):
+        self._next = first
+
+    def choose(self):
+        return self._next
+
+    def observe(self, choice_subject, choice_computer):
+        if choice_subject == 'h':
+            self._next = 't'
+        else:
+            self._next = 'h'
+
+
+class CopyComputerPlayer:
+    """
+    Chooses what the computer chose in the previous round, heads in the first
+    round.
+    """
+
+    __slots__ = ('_next',)
+
+    def __init__(self):
+        self._next = 'h'
+
+    def choose(self):
+        return self._next
+
+    def observe(self, choice_subject, choice_computer):
+        self._next = choice_computer
+
+
+class QLearningPlayer:
+    """
+    Learns which choice wins most often after each choice of the computer in
+    the previous round (Q-learning with a reward of 1 for a win and 0 for a
+    loss). Chooses the better choice, except for a random choice with the
+    probability epsilon.
+
+    Parameters
+    ----------
+    alpha : float, optional
+        the learning rate. The default is 0.1.
+    epsilon : float, optional
+        the probability of a random choice. The default is 0.1.
+    rng : random.Random, optional
+        source of the random numbers. The default is a new random.Random.
+
+    Attributes
+    ----------
+    values : list of float
+        the learned value of heads and tails (index 0 and 1) after the
+        computer chose heads (0, 1), tails (2, 3) and in the first round
+        (4, 5).
+    """
+
+    __slots__ = ('alpha', 'epsilon', 'values', '_state', '_random')
+
+    def __init__(self, alpha=0.1, epsilon=0.1, rng=None):
+        if rng is None:
+            rng = random.Random()
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.values = [0.5] * 6
+        self._state = 4
+        self._random = rng.random
+
+    def choose(self):
+        if self._random() < self.epsilon:
+            if self._random() < 0.5:
+                return 'h'
+            return 't'
+        values = self.values
+        state = self._state
+        if values[state] > values[state + 1]:
+            return 'h'
+        if values[state] < values[state + 1]:
+            return 't'
+        if self._random() < 0.5:
+            return 'h'
+        return 't'
+
+    def observe(self, choice_subject, choice_computer):
+        index = self._state
+        if choice_subject == 't':
+            index += 1
+        if choice_subject == choice_computer:
+            reward = 1
+        else:
+            reward = 0
+        self.values[index] += self.alpha * (reward - self.values[index])
+        if choice_computer == 'h':
+            self._state = 0
+        else:
+            self._state = 2
+
+
+# all players by name, e.g. to let each of them play against the engine
+players = {'random': RandomPlayer,
+           'biased': BiasedPlayer,
+           'win_stay_lose_shift': WinStayLoseShiftPlayer,
+           'alternating': AlternatingPlayer,
+           'copy_computer': CopyComputerPlayer,
+           'q_learning': QLearningPlayer}
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Preparation of the game in small steps while the subject reads the intro
+screens.
+
+Stimuli can only be created on the thread that draws the window, so they
+can't simply be created in a background thread. Instead, the preparation is
+written as a generator function that yields after every short step (e.g.
+after creating a stimulus). While the intro screens wait for a key, the
+Preloader runs one step at a time in between checking the keyboard. Work that
+doesn't need the window (e.g. scaling images, see texture_cache.py) runs in a
+background thread via background, and the generator waits for its result by
+yielding until it is done.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# %% preloader
+
+
+class Preloader:
+    """
+    Runs a generator of preparation steps one step at a time.
+
+    Parameters
+    ----------
+    workers : int, optional
+        the amount of background threads. The default is 2.
+
+    Attributes
+    ----------
+    result : object
+        what the generator returned, once it is done.
+    steps : int
+        the amount of steps run so far.
+    """
+
+    def __init__(self, workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._generator = None
+        self.result = None
+        self.steps = 0
+
+    def background(self, function, *args):
+        """
+        Runs function(*args) in a background thread.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            done once the function has finished, future.result() returns its
+            result.
+        """
+        return self._executor.submit(function, *args)
+
+    def start(self, generator):
+        """
+        Sets the generator whose steps are run by step and finish.
+        """
+        self._generator = generator
+
+    @property
+    def done(self):
+        return self._generator is None
+
+    def step(self):
+        """
+        Runs the next step of the generator.
+
+        Returns
+        -------
+        ran : bool
+            False if there was nothing left to do.
+        """
+        if self._generator is None:
+            return False
+        try:
+            next(self._generator)
+        except StopIteration as stop:
+            self.result = stop.value
+            self._generator = None
+            self._executor.shutdown(wait=False)
+        except BaseException:
+            # e.g. a missing image, the game can't start without it
+            self._generator = None
+            self._executor.shutdown(wait=False)
+            raise
+        self.steps += 1
+        return True
+
+    def finish(self):
+        """
+        Runs all remaining steps, e.g. before the first round starts.
+
+        Returns
+        -------
+        result : object
+            what the generator returned.
+        """
+        while self.step():
+            pass
+        return self.result
+
+
+def wait_for(*futures):
+    """
+    Yields until all futures are done, for use in generators run by a
+    Preloader: yield from wait_for(future).
+    """
+    # waiting a moment before each check keeps finish from spinning
+    while len(wait(futures, timeout=0.001).not_done) > 0:
+        yield
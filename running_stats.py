@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Statistics of the subject's play, updated round by round.
+
+RunningStats keeps a few counters that are updated in constant time after
+each round, so all statistics are available at any point of the session
+without going through the previous rounds again, no matter how long the
+session is. The main program shows them on the game info screen and logs them
+with every round (see TrialLogger).
+
+The statistics are:
+- the win rate of the subject with a confidence interval (Wilson score
+    interval)
+- how often the subject switched their choice after a win and after a loss
+- how often the subject switched their choice at all (alternation rate)
+- the entropy of the subject's choices in bits, i.e. 1 if heads and tails
+    were chosen equally often and 0 if only one of them was chosen
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import math
+
+# %% statistics
+
+
+def rate_function(count, amount):
+    """
+    Divides count by amount, None if amount is 0
+    """
+    if amount == 0:
+        return None
+    return count / amount
+
+
+class RunningStats:
+    """
+    Statistics of the subject's play, see the description of this module.
+    Statistics that aren't defined yet (e.g. the switches after a loss before
+    the first loss) are None.
+
+    Attributes
+    ----------
+    rounds, wins, heads : int
+        the amount of rounds, wins and choices of heads so far.
+    switches : int
+        how often the subject chose differently than in the previous round.
+    after_win, switches_after_win : int
+        the amount of rounds after a win and how often the subject switched
+        in them. after_loss and switches_after_loss likewise after a loss.
+    """
+
+    __slots__ = ('rounds', 'wins', 'heads', 'switches', 'after_win',
+                 'switches_after_win', 'after_loss', 'switches_after_loss',
+                 '_prev_choice', '_prev_win')
+
+    # names of the values returned by values, e.g. for the TrialLogger
+    columns = ('win_rate', 'win_rate_low', 'win_rate_high',
+               'switch_after_win', 'switch_after_loss', 'alternation_rate',
+               'entropy')
+
+    def __init__(self):
+        self.rounds = 0
+        self.wins = 0
+        self.heads = 0
+        self.switches = 0
+        self.after_win = 0
+        self.switches_after_win = 0
+        self.after_loss = 0
+        self.switches_after_loss = 0
+        self._prev_choice = None
+        self._prev_win = None
+
+    def update(self, choice_subject, choice_computer):
+        """
+        Adds one round.
+
+        Parameters
+        ----------
+        choice_subject, choice_computer : str
+            the decisions of the subject and the computer, 'h' or 't'.
+        """
+        win = choice_subject == choice_computer
+        if self._prev_choice is not None:
+            switch = choice_subject != self._prev_choice
+            self.switches += switch
+            if self._prev_win:
+                self.after_win += 1
+                self.switches_after_win += switch
+            else:
+                self.after_loss += 1
+                self.switches_after_loss += switch
+        self.rounds += 1
+        self.wins += win
+        self.heads += choice_subject == 'h'
+        self._prev_choice = choice_subject
+        self._prev_win = win
+
+    @property
+    def win_rate(self):
+        return rate_function(self.wins, self.rounds)
+
+    def win_rate_interval(self, z=1.96):
+        """
+        Wilson score interval of the win rate.
+
+        Parameters
+        ----------
+        z : float, optional
+            quantile of the normal distribution. The default is 1.96, i.e. a
+            95% confidence interval.
+
+        Returns
+        -------
+        low, high : float or None
+            the limits of the interval.
+        """
+        n = self.rounds
+        if n == 0:
+            return None, None
+        p = self.wins / n
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = (z / (1 + z * z / n) *
+                  math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)))
+        return center - margin, center + margin
+
+    @property
+    def switch_after_win(self):
+        return rate_function(self.switches_after_win, self.after_win)
+
+    @property
+    def switch_after_loss(self):
+        return rate_function(self.switches_after_loss, self.after_loss)
+
+    @property
+    def alternation_rate(self):
+        return rate_function(self.switches, max(self.rounds - 1, 0))
+
+    @property
+    def entropy(self):
+        p = rate_function(self.heads, self.rounds)
+        if p is None:
+            return None
+        entropy = 0.0
+        for q in [p, 1 - p]:
+            if q > 0:
+                entropy -= q * math.log2(q)
+        return entropy
+
+    def values(self):
+        """
+        Returns all statistics in the order of columns.
+        """
+        low, high = self.win_rate_interval()
+        return (self.win_rate, low, high, self.switch_after_win,
+                self.switch_after_loss, self.alternation_rate, self.entropy)
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Analysis of the choices of many sessions at once.
+
+All functions work on the rounds of all sessions one after the other in flat
+arrays, like the columns of a (joined) session log (see session_log.py), and
+the first round of each session (starts, plus the amount of rounds at the
+end). Sessions of equal length, e.g. from simulate_sessions
+(batch_simulation.py), can be turned into this form with flatten_sessions.
+Nothing loops over the sessions, all sessions are computed at once with numpy.
+
+Choices are booleans: True for heads and False for tails. Values that aren't
+defined for a session (e.g. the win-stay rate of a session without wins) are
+nan.
+
+analyse_sessions computes everything for a session log and responsiveness
+compares the subjects' play between the settings of the computer (bias and
+strategies).
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+from types import SimpleNamespace
+
+import numpy as np
+
+# %% helpers
+
+
+def flatten_sessions(subject_choices, computer_choices):
+    """
+    Turns N sessions of T rounds each into the flat form of a session log
+
+    Parameters
+    ----------
+    subject_choices, computer_choices : numpy.ndarray
+        N x T choices (True for heads).
+
+    Returns
+    -------
+    log : types.SimpleNamespace
+        with the flat arrays subject_choices, computer_choices and
+        subject_wins, starts and sessions (empty settings).
+    """
+    subject = np.atleast_2d(subject_choices).astype(bool)
+    computer = np.atleast_2d(computer_choices).astype(bool)
+    n_sessions, n_rounds = subject.shape
+    return SimpleNamespace(
+        subject_choices=subject.ravel(), computer_choices=computer.ravel(),
+        subject_wins=(subject == computer).ravel(),
+        starts=np.arange(n_sessions + 1) * n_rounds,
+        sessions=[{} for i in range(n_sessions)])
+
+
+def sessions_function(starts):
+    """
+    Returns the amount of sessions, the session of every round and whether
+    each round (except for the first one) belongs to the same session as the
+    round before.
+    """
+    starts = np.asarray(starts)
+    n_sessions = len(starts) - 1
+    index = np.repeat(np.arange(n_sessions), np.diff(starts))
+    follows = index[1:] == index[:-1]
+    return n_sessions, index, follows
+
+
+def divide(counts, amounts):
+    """
+    Divides counts by amounts, nan where amounts is 0
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(amounts > 0, counts / amounts, np.nan)
+
+# %% analyses
+
+
+def transition_matrices(choices, starts, normalize=True):
+    """
+    How often each choice followed each choice, per session.
+
+    Parameters
+    ----------
+    choices : numpy.ndarray
+        the choices of all sessions (True for heads).
+    starts : array_like
+        the first round of each session and the amount of rounds at the end.
+    normalize : bool, optional
+        whether the probabilities (rows summing up to 1) are returned instead
+        of the counts. The default is True.
+
+    Returns
+    -------
+    transitions : numpy.ndarray
+        n_sessions x 2 x 2, [session, previous choice, next choice] with 0
+        for tails and 1 for heads.
+    """
+    choices = np.asarray(choices, dtype=bool)
+    n_sessions, index, follows = sessions_function(starts)
+    prev = choices[:-1][follows].astype(np.int64)
+    next_ = choices[1:][follows].astype(np.int64)
+    counts = np.bincount(index[1:][follows] * 4 + prev * 2 + next_,
+                         minlength=n_sessions * 4).reshape(n_sessions, 2, 2)
+    if not normalize:
+        return counts
+    return divide(counts, counts.sum(axis=2, keepdims=True))
+
+
+def win_stay_lose_shift(subject_choices, subject_wins, starts):
+    """
+    How often the subject repeated their choice after a win and switched
+    after a loss, per session.
+
+    Parameters
+    ----------
+    subject_choices, subject_wins : numpy.ndarray
+        the choices (True for heads) and results of all sessions.
+    starts : array_like
+        the first round of each session and the amount of rounds at the end.
+
+    Returns
+    -------
+    win_stay, lose_shift : numpy.ndarray
+        the rates of each session.
+    """
+    subject = np.asarray(subject_choices, dtype=bool)
+    wins = np.asarray(subject_wins, dtype=bool)
+    n_sessions, index, follows = sessions_function(starts)
+    session = index[1:][follows]
+    prev_win = wins[:-1][follows]
+    stay = (subject[1:] == subject[:-1])[follows]
+
+    def count(weights):
+        return np.bincount(session, weights=weights, minlength=n_sessions)
+
+    win_stay = divide(count(prev_win & stay), count(prev_win))
+    lose_shift = divide(count(~prev_win & ~stay), count(~prev_win))
+    return win_stay, lose_shift
+
+
+def run_lengths(choices, starts, max_length=None):
+    """
+    Distribution of the lengths of the runs (the same choice several times
+    in a row), per session.
+
+    Parameters
+    ----------
+    choices : numpy.ndarray
+        the choices of all sessions (True for heads).
+    starts : array_like
+        the first round of each session and the amount of rounds at the end.
+    max_length : int, optional
+        longer runs are counted as runs of max_length. The default is None,
+        i.e. the longest run.
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        n_sessions x max_length, the amount of runs of length 1, 2, ... of
+        each session.
+    """
+    choices = np.asarray(choices, dtype=bool)
+    n_sessions, index, follows = sessions_function(starts)
+    new_run = np.ones(len(choices), dtype=bool)
+    new_run[1:] = (choices[1:] != choices[:-1]) | ~follows
+    run_starts = np.flatnonzero(new_run)
+    lengths = np.diff(np.append(run_starts, len(choices)))
+    if max_length is None:
+        max_length = int(lengths.max()) if len(lengths) else 1
+    lengths = np.minimum(lengths, max_length)
+    counts = np.bincount(index[run_starts] * max_length + lengths - 1,
+                         minlength=n_sessions * max_length)
+    return counts.reshape(n_sessions, max_length)
+
+
+def sequence_entropy(choices, starts, length=1):
+    """
+    Entropy of the patterns of length consecutive choices, per session, in
+    bits per choice. 1 means that all patterns occur equally often, i.e. the
+    choices are unpredictable from each other, lower values mean that some
+    patterns are preferred.
+
+    Parameters
+    ----------
+    choices : numpy.ndarray
+        the choices of all sessions (True for heads).
+    starts : array_like
+        the first round of each session and the amount of rounds at the end.
+    length : int, optional
+        the length of the patterns. The default is 1, i.e. the entropy of the
+        single choices.
+
+    Returns
+    -------
+    entropy : numpy.ndarray
+        the entropy of each session.
+    """
+    choices = np.asarray(choices, dtype=bool)
+    n_sessions, index, follows = sessions_function(starts)
+    n_windows = max(len(choices) - length + 1, 0)
+    # every pattern as a number, the first choice in the lowest bit
+    codes = np.zeros(n_windows, dtype=np.int64)
+    for j in range(length):
+        codes |= choices[j:j + n_windows].astype(np.int64) << j
+    valid = index[:n_windows] == index[length - 1:length - 1 + n_windows]
+    patterns = 2 ** length
+    counts = np.bincount(index[:n_windows][valid] * patterns + codes[valid],
+                         minlength=n_sessions * patterns)
+    counts = counts.reshape(n_sessions, patterns)
+    p = divide(counts, counts.sum(axis=1, keepdims=True))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(counts > 0, -p * np.log2(p), 0)
+    entropy = terms.sum(axis=1) / length
+    entropy[counts.sum(axis=1) == 0] = np.nan
+    return entropy
+
+
+def analyse_sessions(log, entropy_length=3):
+    """
+    Computes all analyses for every session of a session log.
+
+    Parameters
+    ----------
+    log : types.SimpleNamespace
+        a session log (see session_log.read_session_log) or the result of
+        flatten_sessions.
+    entropy_length : int, optional
+        the length of the patterns of sequence_entropy. The default is 3.
+
+    Returns
+    -------
+    analysis : types.SimpleNamespace
+        per session: rounds, win_rate, heads_rate, alternation_rate,
+        win_stay, lose_shift, transitions, run_lengths and entropy.
+    """
+    subject = np.asarray(log.subject_choices, dtype=bool)
+    wins = np.asarray(log.subject_wins, dtype=bool)
+    starts = np.asarray(log.starts)
+    n_sessions, index, follows = sessions_function(starts)
+    rounds = np.diff(starts)
+    switches = np.bincount(index[1:][follows],
+                           weights=(subject[1:] != subject[:-1])[follows],
+                           minlength=n_sessions)
+    win_stay, lose_shift = win_stay_lose_shift(subject, wins, starts)
+    return SimpleNamespace(
+        rounds=rounds,
+        win_rate=divide(np.bincount(index, weights=wins,
+                                    minlength=n_sessions), rounds),
+        heads_rate=divide(np.bincount(index, weights=subject,
+                                      minlength=n_sessions), rounds),
+        alternation_rate=divide(switches, rounds - 1),
+        win_stay=win_stay,
+        lose_shift=lose_shift,
+        transitions=transition_matrices(subject, starts),
+        run_lengths=run_lengths(subject, starts),
+        entropy=sequence_entropy(subject, starts, entropy_length))
+
+
+def config_function(session):
+    """
+    Returns the setting of the computer of a session (from the header of a
+    session log) as a hashable key: (bias, strategies).
+    """
+    return (session.get('bias'),
+            tuple(session.get('computer_strategies', ())))
+
+
+def responsiveness(analysis, sessions,
+                   names=('win_rate', 'heads_rate', 'alternation_rate',
+                          'win_stay', 'lose_shift', 'entropy')):
+    """
+    Compares how the subjects played against each setting of the computer.
+
+    Parameters
+    ----------
+    analysis : types.SimpleNamespace
+        the result of analyse_sessions.
+    sessions : list of dict
+        the settings of the sessions, e.g. log.sessions of a session log.
+    names : tuple of str, optional
+        the analyses to be compared. The default is all analyses with one
+        value per session.
+
+    Returns
+    -------
+    result : types.SimpleNamespace
+        configs (the settings as (bias, strategies)), sessions (the amount
+        of sessions of each setting) and for each name the mean over the
+        sessions of each setting (sessions where the value is nan are left
+        out) and its difference to the mean over all sessions, e.g. win_rate
+        and win_rate_difference.
+    """
+    keys = [config_function(session) for session in sessions]
+    configs = sorted(set(keys), key=repr)
+    lookup = {config: i for i, config in enumerate(configs)}
+    group = np.array([lookup[key] for key in keys], dtype=np.int64)
+    result = SimpleNamespace(configs=configs,
+                             sessions=np.bincount(group,
+                                                  minlength=len(configs)))
+    for name in names:
+        values = np.asarray(getattr(analysis, name), dtype=float)
+        valid = ~np.isnan(values)
+        means = divide(np.bincount(group[valid], weights=values[valid],
+                                   minlength=len(configs)),
+                       np.bincount(group[valid], minlength=len(configs)))
+        setattr(result, name, means)
+        setattr(result, name + '_difference', means - values[valid].mean()
+                if valid.any() else means)
+    return result
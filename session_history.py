@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Compact record of every round of a session.
+
+The main program and the MatchingPenniesEngine (game_engine.py) only need the
+previous round to go on, but analyses need the whole sequence of choices. A
+SessionHistory stores the choices of both players and the result of every
+round in one byte each and the reaction time as a 32 bit float, i.e. 7 bytes
+per round instead of several python objects per round. The arrays grow by
+doubling their size, so adding a round takes constant time on average.
+
+The properties return numpy views of the rounds so far, without copying
+them. Choices are stored like in batch_simulation.py: True for heads ('h')
+and False for tails ('t').
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import numpy as np
+
+from batch_simulation import choices_to_array
+
+# %% history
+
+
+class SessionHistory:
+    """
+    The choices, results and reaction times of all rounds of a session.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        the amount of rounds space is reserved for at the start. The default
+        is 1024.
+
+    Attributes
+    ----------
+    rounds : int
+        the amount of rounds recorded.
+    """
+
+    __slots__ = ('rounds', '_subject', '_computer', '_wins', '_rts')
+
+    def __init__(self, capacity=1024):
+        capacity = max(capacity, 1)
+        self.rounds = 0
+        self._subject = np.zeros(capacity, dtype=np.uint8)
+        self._computer = np.zeros(capacity, dtype=np.uint8)
+        self._wins = np.zeros(capacity, dtype=np.uint8)
+        self._rts = np.full(capacity, np.nan, dtype=np.float32)
+
+    def __len__(self):
+        return self.rounds
+
+    def _grow(self, capacity):
+        # doubles the capacity until it fits, copying the rounds so far once
+        new_capacity = len(self._subject)
+        while new_capacity < capacity:
+            new_capacity *= 2
+        for name in ['_subject', '_computer', '_wins']:
+            array = np.zeros(new_capacity, dtype=np.uint8)
+            array[:self.rounds] = getattr(self, name)[:self.rounds]
+            setattr(self, name, array)
+        rts = np.full(new_capacity, np.nan, dtype=np.float32)
+        rts[:self.rounds] = self._rts[:self.rounds]
+        self._rts = rts
+
+    def append(self, choice_subject, choice_computer, rt=None):
+        """
+        Records one round.
+
+        Parameters
+        ----------
+        choice_subject, choice_computer : str
+            the decisions of the subject and the computer, 'h' or 't'.
+        rt : float, optional
+            the reaction time of the subject in seconds. The default is None,
+            stored as nan.
+        """
+        index = self.rounds
+        if index == len(self._subject):
+            self._grow(index + 1)
+        self._subject[index] = choice_subject == 'h'
+        self._computer[index] = choice_computer == 'h'
+        self._wins[index] = choice_subject == choice_computer
+        if rt is not None:
+            self._rts[index] = rt
+        self.rounds = index + 1
+
+    def extend(self, subject_choices, computer_choices, rts=None):
+        """
+        Records many rounds at once.
+
+        Parameters
+        ----------
+        subject_choices, computer_choices : array_like
+            the decisions of the subject and the computer, as 'h' and 't' or
+            as booleans (True for heads).
+        rts : array_like, optional
+            the reaction times in seconds. The default is None, stored as
+            nan.
+        """
+        subject = choices_to_array(subject_choices).ravel()
+        computer = choices_to_array(computer_choices).ravel()
+        start = self.rounds
+        end = start + len(subject)
+        if end > len(self._subject):
+            self._grow(end)
+        self._subject[start:end] = subject
+        self._computer[start:end] = computer
+        self._wins[start:end] = subject == computer
+        if rts is not None:
+            self._rts[start:end] = rts
+        self.rounds = end
+
+    # views of the rounds so far. They stay valid, but don't show rounds
+    # added after the arrays had to grow
+
+    @property
+    def subject_choices(self):
+        """numpy.ndarray of bool: the subject's choices, True for heads."""
+        return self._subject[:self.rounds].view(bool)
+
+    @property
+    def computer_choices(self):
+        """numpy.ndarray of bool: the computer's choices, True for heads."""
+        return self._computer[:self.rounds].view(bool)
+
+    @property
+    def subject_wins(self):
+        """numpy.ndarray of bool: True for the rounds won by the subject."""
+        return self._wins[:self.rounds].view(bool)
+
+    @property
+    def rts(self):
+        """numpy.ndarray of float32: the reaction times in seconds."""
+        return self._rts[:self.rounds]
+
+    @property
+    def nbytes(self):
+        """int: the memory reserved for the rounds in bytes."""
+        return (self._subject.nbytes + self._computer.nbytes +
+                self._wins.nbytes + self._rts.nbytes)
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Binary log of whole sessions, for analyses across many sessions.
+
+The csv files of the TrialLogger are easy to read, but parsing thousands of
+them takes long. A session log stores the rounds column by column in a binary
+file:
+- a header: 8 bytes b'PENNIES1', the length of the json part as 8 byte
+    integer and the json part itself, which contains the amount of rounds,
+    the columns (name, numpy dtype and position in the file) and the
+    settings of each session (e.g. bias, strategies and seed)
+- the columns, each starting at a multiple of 64 bytes: choice of the
+    subject, choice of the computer and the result (uint8, 1 for heads or a
+    win of the subject) and the cut-off and the reaction time (float32, nan
+    if unknown)
+
+read_session_log maps the file into memory and returns the columns as numpy
+arrays without copying or even reading them. concatenate_session_logs joins
+many session logs into a single one (also from the command line, see main),
+so that thousands of sessions can be loaded at once instead of keeping
+thousands of files open. The start of each session is stored in the header.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import json
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+
+# %% format
+
+magic = b'PENNIES1'
+
+# name and numpy dtype of every column, in the order they are stored
+log_columns = (('subject_choices', 'u1'), ('computer_choices', 'u1'),
+               ('subject_wins', 'u1'), ('cut_offs', '<f4'), ('rts', '<f4'))
+
+alignment = 64
+
+
+def aligned(offset):
+    """
+    Rounds offset up to the next multiple of alignment
+    """
+    return -(-offset // alignment) * alignment
+
+# %% writing
+
+
+def cut_offs_function(strategy, history):
+    """
+    Computes the cut-off of every round of a recorded session from the
+    choices of the previous rounds.
+
+    Parameters
+    ----------
+    strategy : strategies.ComputerStrategy or None
+        the strategy the computer played.
+    history : session_history.SessionHistory
+        the recorded rounds.
+
+    Returns
+    -------
+    cut_offs : numpy.ndarray of float32
+        the cut-off of every round, nan for opponents without cut-offs.
+    """
+    cut_offs = np.full(len(history), np.nan, dtype=np.float32)
+    if strategy is None or not strategy.cut_offs or len(history) == 0:
+        return cut_offs
+    table = np.empty((2, 2), dtype=np.float32)
+    for prev_com in [False, True]:
+        for prev_subj in [False, True]:
+            table[int(prev_com), int(prev_subj)] = strategy.cut_offs[
+                'h' if prev_com else 't', 'h' if prev_subj else 't']
+    cut_offs[0] = strategy.cut_offs[0, 0]
+    cut_offs[1:] = table[history.computer_choices[:-1].astype(int),
+                         history.subject_choices[:-1].astype(int)]
+    return cut_offs
+
+
+def create_log(path, sessions, starts):
+    """
+    Creates a session log of the right size with an empty column for every
+    log_column and maps it into memory to fill the columns in.
+
+    Parameters
+    ----------
+    path : str
+        path of the file. An existing file is overwritten.
+    sessions : list of dict
+        the settings of each session, stored in the header.
+    starts : list of int
+        the first round of each session and the amount of rounds at the end.
+
+    Returns
+    -------
+    columns : dict
+        writable numpy arrays backed by the file, with the names of the
+        columns as keys.
+    """
+    rounds = starts[-1]
+    header = {'rounds': rounds, 'columns': [], 'sessions': sessions,
+              'starts': starts}
+    # the columns start after the header, whose length depends on the
+    # positions of the columns. Starting with no header at all, the positions
+    # are moved back until the header fits in front of them
+    start = 0
+    while True:
+        header['columns'] = []
+        offset = start
+        for name, dtype in log_columns:
+            header['columns'].append([name, dtype, offset])
+            offset = aligned(offset + rounds * np.dtype(dtype).itemsize)
+        data = json.dumps(header).encode()
+        if aligned(len(magic) + 8 + len(data)) <= start:
+            break
+        start = aligned(len(magic) + 8 + len(data))
+
+    with open(path, 'wb') as f:
+        f.write(magic)
+        f.write(struct.pack('<Q', len(data)))
+        f.write(data)
+        f.truncate(offset)
+    return columns_function(header, np.memmap(path, dtype=np.uint8,
+                                              mode='r+'))
+
+
+def columns_function(header, data):
+    """
+    Splits the mapped file of a session log into its columns (without
+    copying them)
+    """
+    columns = {}
+    for name, dtype, offset in header['columns']:
+        size = header['rounds'] * np.dtype(dtype).itemsize
+        columns[name] = data[offset:offset + size].view(dtype)
+    return columns
+
+
+def write_session_log(path, history, strategy=None, info=None):
+    """
+    Writes one session to a session log.
+
+    Parameters
+    ----------
+    path : str
+        path of the file. An existing file is overwritten.
+    history : session_history.SessionHistory
+        the recorded rounds of the session.
+    strategy : strategies.ComputerStrategy, optional
+        the strategy the computer played. Its bias and names are stored in
+        the header and its cut-offs are logged. The default is None.
+    info : dict, optional
+        further settings stored in the header, e.g. the seed (see
+        SessionRandom.info). The default is None.
+    """
+    session = {}
+    if strategy is not None:
+        session.update(bias=strategy.bias, computer_strategies=strategy.names)
+    if info is not None:
+        session.update(info)
+    columns = create_log(path, [session], [0, len(history)])
+    columns['subject_choices'][:] = history.subject_choices
+    columns['computer_choices'][:] = history.computer_choices
+    columns['subject_wins'][:] = history.subject_wins
+    columns['cut_offs'][:] = cut_offs_function(strategy, history)
+    columns['rts'][:] = history.rts
+
+# %% reading
+
+
+def read_header(path):
+    """
+    Reads the header of a session log
+
+    Raises
+    ------
+    ValueError
+        raises an exception if the file is not a session log.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError("{} is not a session log".format(path))
+        length, = struct.unpack('<Q', f.read(8))
+        return json.loads(f.read(length))
+
+
+def read_session_log(path):
+    """
+    Maps a session log into memory.
+
+    Parameters
+    ----------
+    path : str
+        path of the file.
+
+    Raises
+    ------
+    ValueError
+        raises an exception if the file is not a session log.
+
+    Returns
+    -------
+    log : types.SimpleNamespace
+        the header, the settings of the sessions (sessions), the first
+        round of each session (starts, see session_index) and the amount of
+        rounds and the columns as read-only numpy arrays backed by the file:
+        subject_choices,
+        computer_choices and subject_wins as bool and cut_offs and rts as
+        float32. The data is only read from the disk when it is used.
+    """
+    header = read_header(path)
+    log = SimpleNamespace(header=header, rounds=header['rounds'],
+                          sessions=header['sessions'],
+                          starts=np.array(header['starts']))
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    for name, column in columns_function(header, data).items():
+        setattr(log, name, column)
+    for name in ['subject_choices', 'computer_choices', 'subject_wins']:
+        setattr(log, name, getattr(log, name).view(bool))
+    return log
+
+
+def session_index(log):
+    """
+    Returns the number of the session of every round of a (concatenated)
+    session log.
+    """
+    return np.repeat(np.arange(len(log.sessions)), np.diff(log.starts))
+
+# %% concatenation
+
+
+def concatenate_session_logs(paths, path):
+    """
+    Joins session logs into a single session log, e.g. all sessions of a
+    study.
+
+    Parameters
+    ----------
+    paths : list of str
+        paths of the session logs, in the order they are joined.
+    path : str
+        path of the joined session log. An existing file is overwritten.
+    """
+    # only the headers are read first, then every session is copied into
+    # the joined file and closed again before the next one is opened
+    headers = [read_header(f) for f in paths]
+    sessions = []
+    starts = [0]
+    for header in headers:
+        sessions.extend(header['sessions'])
+        starts.extend(starts[-1] + start for start in header['starts'][1:])
+    columns = create_log(path, sessions, starts)
+
+    start = 0
+    for f in paths:
+        log = read_session_log(f)
+        end = start + log.rounds
+        for name, dtype in log_columns:
+            columns[name][start:end] = getattr(log, name)
+        start = end
+        del log
+
+
+def main():
+    """
+    Joins the session logs given on the command line, e.g.:
+        python session_log.py data/*.pennies --out all.pennies
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description=concatenate_session_logs
+                                     .__doc__.strip().split('\n')[0])
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+    concatenate_session_logs(args.paths, args.out)
+
+
+if __name__ == '__main__':
+    main()
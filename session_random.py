@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Reproducible source of random numbers for one session.
+
+A SessionRandom is seeded explicitly (or picks a random seed and remembers
+it), so a session can be replayed exactly: with the same seed and the same
+choices of the subject, the computer makes the same choices again (see
+MatchingPenniesEngine in game_engine.py). spawn creates independent child
+streams, e.g. one per simulation run in parallel, which can also be
+recreated from the seed and their spawn_key.
+
+The random floats are generated by numpy in blocks, each call of random()
+only reads the next float of the current block. random(size) returns an array
+of the next floats of the same stream, so simulating a session with numpy
+arrays (batch_simulation.py) or round by round gives the same results.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import numpy as np
+
+# %% random source
+
+
+class SessionRandom:
+    """
+    Random floats between 0 and 1 from a seeded stream, generated in blocks.
+    Can be used instead of the random module, random.Random or a
+    numpy.random.Generator wherever only random() and choice() are used.
+
+    Parameters
+    ----------
+    seed : int, optional
+        the seed of the stream. The default is None, i.e. a random seed,
+        which is stored in the attribute seed afterwards.
+    block_size : int, optional
+        the amount of floats generated at once. The default is 4096.
+    spawn_key : tuple of int, optional
+        identifies a child stream (see spawn). The default is (), i.e. the
+        stream of the seed itself.
+
+    Attributes
+    ----------
+    seed : int
+        the seed, to be logged for replaying the session.
+    spawn_key : tuple of int
+        the key of the child stream.
+    """
+
+    __slots__ = ('seed', 'spawn_key', 'block_size', '_seed_sequence',
+                 '_generator', '_block', '_index')
+
+    def __init__(self, seed=None, block_size=4096, spawn_key=()):
+        seed_sequence = np.random.SeedSequence(seed, spawn_key=spawn_key)
+        self.seed = seed_sequence.entropy
+        self.spawn_key = tuple(spawn_key)
+        self.block_size = block_size
+        self._seed_sequence = seed_sequence
+        self._generator = np.random.default_rng(seed_sequence)
+        self._block = memoryview(np.empty(0))
+        self._index = 0
+
+    def _refill(self):
+        # a memoryview returns its elements as python floats, which is faster
+        # than indexing the numpy array itself
+        self._block = memoryview(self._generator.random(self.block_size))
+        self._index = 0
+
+    def random(self, size=None):
+        """
+        Returns the next random float, or an array of the next floats.
+
+        Parameters
+        ----------
+        size : int or tuple of int, optional
+            the shape of the array. The default is None, i.e. a single float.
+
+        Returns
+        -------
+        ran_float : float or numpy.ndarray
+            random float(s) between 0 (included) and 1 (excluded).
+        """
+        if size is None:
+            index = self._index
+            if index == len(self._block):
+                self._refill()
+                index = 0
+            self._index = index + 1
+            return self._block[index]
+
+        amount = int(np.prod(size))
+        # first the rest of the current block, then directly from the
+        # generator, which continues exactly where the block ends
+        rest = np.asarray(self._block[self._index:])[:amount]
+        self._index += len(rest)
+        floats = np.concatenate(
+            [rest, self._generator.random(amount - len(rest))])
+        return floats.reshape(size)
+
+    def choice(self, seq):
+        """
+        Returns a random element of a non-empty sequence, like
+        random.choice.
+        """
+        return seq[int(self.random() * len(seq))]
+
+    def spawn(self, amount):
+        """
+        Creates independent child streams, e.g. for simulations run in
+        parallel. Every call creates new children.
+
+        Parameters
+        ----------
+        amount : int
+            the amount of child streams.
+
+        Returns
+        -------
+        children : list of SessionRandom
+            the child streams, each with the same seed as this stream and its
+            own spawn_key.
+        """
+        return [SessionRandom(self.seed, self.block_size, child.spawn_key)
+                for child in self._seed_sequence.spawn(amount)]
+
+    def info(self):
+        """
+        Returns what is needed to recreate the stream, to be logged.
+
+        Returns
+        -------
+        info : dict
+            the seed and the spawn_key.
+        """
+        return {'seed': self.seed, 'spawn_key': list(self.spawn_key)}
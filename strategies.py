@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of the strategies of the computer.
+
+Every strategy is registered under a name with register_strategy. There are
+three kinds of strategies:
+- 'cut_off': changes the cut-off (i.e. nearly the probability of the computer
+    choosing heads), like the biases towards heads or towards sticking to the
+    previous choice. Several of them can be combined, they are applied in the
+    order they were registered.
+- 'override': changes the computer's choice after the subject has chosen,
+    like the frustrator.
+- 'opponent': makes the computer's choice on its own, like the predictive
+    opponents. The registered function creates the opponent object.
+
+compose_strategy checks a combination of strategies once and turns it into a
+single ComputerStrategy, which is used by the main program, the
+MatchingPenniesEngine and simulate_sessions. All cut-offs that can occur are
+computed in advance, so no strategy is checked again during the rounds. New
+strategies can be added by registering them, without changing any of these.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import random
+
+from game_logic import (bias_function, bias_heads_function,
+                        bias_stick_to_prev_user_choice_function,
+                        bias_switch_from_prev_user_choice_function,
+                        bias_tails_function, computer_choice_function,
+                        frustrator_function,
+                        stick_to_prev_com_choice_function,
+                        switch_from_prev_com_choice_function)
+
+# %% registry
+
+# all registered strategies by name, in the order they were registered
+strategy_registry = {}
+
+
+def register_strategy(name, kind='cut_off', previous=None, exclusive=False,
+                      vectorized=None):
+    """
+    Registers a strategy of the computer under the given name. Used as a
+    decorator of the function of the strategy.
+
+    Parameters
+    ----------
+    name : str
+        the name of the strategy, e.g. 'bias_heads'.
+    kind : str, optional
+        'cut_off', 'override' or 'opponent' (see the description of this
+        module). The default is 'cut_off'.
+        The function of a 'cut_off' strategy gets (cut_off, bias,
+        prev_com_choice, prev_subj_choice) and returns the new cut-off, the
+        function of an 'override' strategy gets (choice_subject,
+        choice_computer) and returns the new choice of the computer and the
+        function of an 'opponent' strategy gets rng and the options passed to
+        compose_strategy as keyword arguments and returns an object with the
+        methods choose() and observe(choice_subject, choice_computer).
+    previous : str, optional
+        for 'cut_off' strategies, 'com' or 'subj' if the strategy depends on
+        the previous choice of the computer or of the subject. Such
+        strategies are not applied in the first round. The default is None.
+    exclusive : bool, optional
+        whether the strategy can't be combined with any other strategy. The
+        default is False.
+    vectorized : callable, optional
+        for 'override' strategies, the same function for numpy arrays of
+        choices (True for heads), used by simulate_sessions. The default is
+        None.
+
+    Returns
+    -------
+    decorator : callable
+        registers the function and returns it unchanged.
+    """
+    if kind not in ['cut_off', 'override', 'opponent']:
+        raise ValueError("Unknown kind of strategy: {}".format(kind))
+
+    def decorator(function):
+        strategy_registry[name] = {'name': name, 'kind': kind,
+                                   'function': function,
+                                   'previous': previous,
+                                   'exclusive': exclusive,
+                                   'vectorized': vectorized}
+        return function
+    return decorator
+
+# %% the strategies of the computer
+# registered in the same order as the biases are applied in
+# game_logic.cut_off_function
+
+
+@register_strategy('bias_stick_to_prev_user_choice', previous='subj')
+def stick_to_prev_user_choice_strategy(cut_off, bias, prev_com_choice,
+                                       prev_subj_choice):
+    return bias_stick_to_prev_user_choice_function(prev_subj_choice,
+                                                   cut_off, bias)
+
+
+@register_strategy('bias_switch_from_prev_user_choice', previous='subj')
+def switch_from_prev_user_choice_strategy(cut_off, bias, prev_com_choice,
+                                          prev_subj_choice):
+    return bias_switch_from_prev_user_choice_function(prev_subj_choice,
+                                                      cut_off, bias)
+
+
+@register_strategy('bias_stick_to_prev_com_choice', previous='com')
+def stick_to_prev_com_choice_strategy(cut_off, bias, prev_com_choice,
+                                      prev_subj_choice):
+    return stick_to_prev_com_choice_function(prev_com_choice, cut_off, bias)
+
+
+@register_strategy('bias_switch_from_prev_com_choice', previous='com')
+def switch_from_prev_com_choice_strategy(cut_off, bias, prev_com_choice,
+                                         prev_subj_choice):
+    return switch_from_prev_com_choice_function(prev_com_choice, cut_off,
+                                                bias)
+
+
+@register_strategy('bias_heads')
+def heads_strategy(cut_off, bias, prev_com_choice, prev_subj_choice):
+    return bias_heads_function(cut_off, bias)
+
+
+@register_strategy('bias_tails')
+def tails_strategy(cut_off, bias, prev_com_choice, prev_subj_choice):
+    return bias_tails_function(cut_off, bias)
+
+
+@register_strategy('frustrator', kind='override', exclusive=True,
+                   vectorized=lambda subject, computer: ~subject)
+def frustrator_strategy(choice_subject, choice_computer):
+    return frustrator_function(choice_subject, choice_computer)
+
+
+@register_strategy('ngram', kind='opponent', exclusive=True)
+def ngram_strategy(rng, ngram_length=4, ngram_decay=1.0, **options):
+    from ngram_opponent import NGramOpponent
+    return NGramOpponent(ngram_length, ngram_decay, rng)
+
+
+@register_strategy('context_tree', kind='opponent', exclusive=True)
+def context_tree_strategy(rng, context_depth=12, context_nodes=10000,
+                          **options):
+    from context_tree_opponent import ContextTreeOpponent
+    return ContextTreeOpponent(context_depth, context_nodes, rng=rng)
+
+# %% composition
+
+
+def strategy_names_function(bias_heads=False, bias_tails=False,
+                            bias_stick_to_prev_com_choice=False,
+                            bias_switch_from_prev_com_choice=False,
+                            bias_stick_to_prev_user_choice=False,
+                            bias_switch_from_prev_user_choice=False,
+                            frustrator=False):
+    """
+    Turns the bias variables (see game_logic.allowed_bias_combis) into the
+    names of the strategies.
+
+    Returns
+    -------
+    names : list of str
+        the names of the activated biases.
+    """
+    flags = {'bias_heads': bias_heads, 'bias_tails': bias_tails,
+             'bias_stick_to_prev_com_choice': bias_stick_to_prev_com_choice,
+             'bias_switch_from_prev_com_choice':
+                 bias_switch_from_prev_com_choice,
+             'bias_stick_to_prev_user_choice': bias_stick_to_prev_user_choice,
+             'bias_switch_from_prev_user_choice':
+                 bias_switch_from_prev_user_choice,
+             'frustrator': frustrator}
+    return [name for name, flag in flags.items() if flag is True]
+
+
+def compose_strategy(names, bias=0.4, opponent=None, rng=None, **options):
+    """
+    Checks a combination of strategies and composes it into a single
+    ComputerStrategy.
+
+    Parameters
+    ----------
+    names : list of str
+        the names of the registered strategies, e.g. ['bias_heads'] or
+        ['frustrator']. An empty list means a computer choosing randomly.
+    bias : float, optional
+        the bias of the computer (see game_logic.bias_function). The default
+        is 0.4.
+    opponent : object, optional
+        an already created opponent (with the methods choose() and
+        observe(choice_subject, choice_computer)), used like an exclusive
+        'opponent' strategy. The default is None.
+    rng : random.Random or session_random.SessionRandom, optional
+        source of the random decisions of the strategy itself, i.e. in case
+        a random float equals the cut-off and of the opponents. The default
+        is the global random module.
+    **options
+        passed to the functions of the 'opponent' strategies, e.g.
+        ngram_length=4.
+
+    Raises
+    ------
+    ValueError
+        raises an exception if a name isn't registered, if an exclusive
+        strategy (e.g. the frustrator) is combined with another strategy or
+        if the bias is not valid.
+
+    Returns
+    -------
+    strategy : ComputerStrategy
+        the composed strategy.
+    """
+    for name in names:
+        if name not in strategy_registry:
+            raise ValueError("Unknown strategy: {}. Registered strategies "
+                             "are: {}".format(name,
+                                              ', '.join(strategy_registry)))
+    names = [name for name in strategy_registry if name in names]
+    amount = len(names) + (opponent is not None)
+    for name in names:
+        if strategy_registry[name]['exclusive'] and amount > 1:
+            raise ValueError("""{} is not compatible with other strategies
+                             as it would simply cover all other possible
+                             effects""".format(name))
+    if opponent is not None and amount > 1:
+        raise ValueError("""An opponent is not compatible with other
+                         strategies as it makes the computer's choice on its
+                         own""")
+    bias_function(bias)
+    if rng is None:
+        rng = random
+
+    components = [strategy_registry[name] for name in names]
+    for component in components:
+        if component['kind'] == 'opponent':
+            opponent = component['function'](rng=rng, **options)
+    return ComputerStrategy(names, bias, components, opponent, rng)
+
+
+class ComputerStrategy:
+    """
+    A composed combination of strategies of the computer (see
+    compose_strategy).
+
+    A round uses it in three steps: choose gives the computer's choice before
+    the subject's choice is known, respond gives the final choice once it is
+    known and observe shows the result to the strategy. Calling the strategy
+    does all three steps at once.
+
+    Attributes
+    ----------
+    names : list of str
+        the names of the strategies.
+    bias : float
+        the bias of the computer.
+    cut_offs : dict
+        every cut-off that can occur, with (prev_com_choice,
+        prev_subj_choice) as keys and (0, 0) for the first round (see
+        game_logic.cut_off_table_function). Empty for opponents.
+    uses_prev_com_choice : bool
+        whether the cut-off depends on the computer's previous choice.
+    opponent : object or None
+        the opponent making the computer's choice, if any.
+    rng : random.Random or session_random.SessionRandom
+        source of the random decisions of the strategy itself.
+    respond_array : callable or None
+        respond for numpy arrays (see register_strategy), None if respond
+        doesn't change the choice.
+    """
+
+    def __init__(self, names, bias, components, opponent=None, rng=random):
+        self.names = names
+        self.bias = bias
+        self.opponent = opponent
+        self.rng = rng
+        self.cut_offs = {}
+        self.uses_prev_com_choice = False
+        self.respond_array = None
+
+        if opponent is not None:
+            self.choose = self._choose_opponent
+            self.observe = opponent.observe
+        else:
+            cut_off_functions = [component for component in components
+                                 if component['kind'] == 'cut_off']
+            self.cut_offs = self._cut_off_table(cut_off_functions)
+            self.uses_prev_com_choice = any(
+                component['previous'] == 'com'
+                for component in cut_off_functions)
+            self.choose = self._choose_cut_off
+            self.observe = self._observe_nothing
+
+        self.respond = self._keep
+        for component in components:
+            if component['kind'] == 'override':
+                self.respond = component['function']
+                self.respond_array = component['vectorized']
+
+    def _cut_off_table(self, cut_off_functions):
+        situations = [(0, 0)] + [(prev_com_choice, prev_subj_choice)
+                                 for prev_com_choice in ['h', 't']
+                                 for prev_subj_choice in ['h', 't']]
+        cut_offs = {}
+        for prev_com_choice, prev_subj_choice in situations:
+            cut_off = 0.5
+            for component in cut_off_functions:
+                if component['previous'] is not None and prev_com_choice == 0:
+                    continue
+                cut_off = component['function'](cut_off, self.bias,
+                                                prev_com_choice,
+                                                prev_subj_choice)
+            cut_offs[prev_com_choice, prev_subj_choice] = cut_off
+        return cut_offs
+
+    def cut_off(self, prev_com_choice, prev_subj_choice):
+        """
+        Looks up the cut-off after the given previous choices (0 for both in
+        the first round).
+
+        Returns
+        -------
+        cut_off : float or None
+            (nearly) the probability of the computer choosing heads, None for
+            opponents.
+        """
+        return self.cut_offs.get((prev_com_choice, prev_subj_choice))
+
+    def _choose_cut_off(self, prev_com_choice, prev_subj_choice, ran_float):
+        return computer_choice_function(
+            self.cut_offs[prev_com_choice, prev_subj_choice], ran_float,
+            self.rng)
+
+    def _choose_opponent(self, prev_com_choice, prev_subj_choice, ran_float):
+        return self.opponent.choose()
+
+    @staticmethod
+    def _keep(choice_subject, choice_computer):
+        return choice_computer
+
+    @staticmethod
+    def _observe_nothing(choice_subject, choice_computer):
+        pass
+
+    def __call__(self, choice_subject, prev_com_choice, prev_subj_choice,
+                 ran_float):
+        """
+        Plays the computer's part of one round.
+
+        Parameters
+        ----------
+        choice_subject : str
+            the decision of the subject in this round.
+        prev_com_choice, prev_subj_choice : str
+            the decisions of the computer and the subject in the previous
+            round (0 before the first round).
+        ran_float : float
+            a random float between 0 and 1.
+
+        Returns
+        -------
+        choice_computer : str
+            the decision of the computer, either 'h' or 't'.
+        """
+        choice_computer = self.respond(
+            choice_subject,
+            self.choose(prev_com_choice, prev_subj_choice, ran_float))
+        self.observe(choice_subject, choice_computer)
+        return choice_computer
@@ -8,296 +8,22 @@ The code has been checked to stick to the PEP 8 conventions using pycodestyle.
 # %% Setup: Imports, functions and variables
 
 import random
+import sys
 # Even if you usually have pytest installed, you may need to install pytest
 # again in the virtual environment for psychopy
 import pytest
 
-# copy paste of the functions that are to be tested as importing the functions
-# unfortunately runs the whole assignment_psychopy program and opens the win
-# just as in the original program.
-
-
-def allowed_bias_combis(bias_heads, bias_tails, bias_stick_to_prev_com_choice,
-                        bias_switch_from_prev_com_choice,
-                        bias_stick_to_prev_user_choice,
-                        bias_switch_from_prev_user_choice, frustrator):
-    """
-    Checks if the combination of biases is valid, raises an error if not.
-    Closes win before raising the error to prevent win from getting stuck.
-
-    Parameters
-    ----------
-    bias_heads : bool
-        stores whether the computer should be biased towards choosing heads.
-    bias_tails : bool
-        stores whether the computer should be biased towards choosing tails.
-    bias_stick_to_prev_com_choice : bool
-        stores whether the computer should be biased towards sticking to its
-        previous choice.
-    bias_switch_from_prev_com_choice : bool
-        stores whether the computer should be biased towards switching from its
-        previous choice.
-    bias_stick_to_prev_user_choice : bool
-        stores whether the computer should be biased towards sticking to the
-        user's previous choice.
-    bias_switch_from_prev_user_choice : bool
-        stores whether the computer should be biased towards sticking to the
-        user's previous choice.
-    frustrator : bool
-        stores whether the computer should always choose the opposite of the
-        user.
-
-    Raises
-    ------
-    ValueError
-        raises an exception if the bias function frustrator is combined with
-        other functions. This is because the frustrator doesn't work with
-        probabilites and necessarily simply overwrites all other biases.
-    """
-    if frustrator is True:
-        if (bias_heads or bias_tails or bias_stick_to_prev_com_choice or
-            bias_switch_from_prev_com_choice or bias_stick_to_prev_user_choice
-                or bias_switch_from_prev_user_choice) is True:
-            # win.close()
-            raise ValueError("""Frustrator is not compatible with other biases
-                             as it would simply cover all other possible
-                             effects""")
-
-
-# function to give error message for bad values of the bias and except for
-# that only returns the bias
-def bias_function(bias):
-    """
-    Simply returns the bias. Closes win before raising the error to prevent win
-    from getting stuck.
-
-    Parameters
-    ----------
-    bias : float
-        the bias of the computer chosen by the experimenter.
-
-    Raises
-    ------
-    ValueError
-        raises an exception if the bias is smaller than -0.5 or bigger than 0.5
-        as this would in the end mean that the program had to calculate
-        probabilities smaller than 0 or bigger than 1.
-
-    Returns
-    -------
-    bias : float
-        the bias of the computer chosen by the experimenter.
-    """
-    if bias < -0.5:
-        # win.close()
-        raise ValueError("""You chose a value for bias that is smaller than
-                         -0.5. As the cut-off value is equal to 0.5, which is
-                         used to compute probabilities, adding a value smaller
-                         than -0.5 makes the probability negative. Probabilites
-                         however are always >= 0 (at least on standard
-                         interpretations of probabilities). Try a value that is
-                         between -0.5 and 0.5 instead!""")
-    if bias > 0.5:
-        # win.close()
-        raise ValueError("""You chose a value for bias that is bigger than
-                         0.5. As the cut-off value is equal to 0.5, which is
-                         used to compute probabilities, adding a value bigger
-                         than 0.5 makes the probability > 1. Probabilites
-                         however are always <= 1 (at least on standard
-                         interpretations of probabilities). Try a value that is
-                         between -0.5 and 0.5 instead!""")
-    return bias
-
-
-def stick_to_prev_com_choice_function(prev_com_choice, cut_off, bias):
-    """
-    Biases the computer towards sticking to its previous choice
-
-    Parameters
-    ----------
-    prev_com_choice : str
-        stores the decision of the computer between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is
-        heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
-
-    Returns
-    -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards sticking to its previous choice.
-    """
-    if prev_com_choice == 'h':
-        cut_off = cut_off + bias_function(bias)
-    else:
-        cut_off = round(cut_off - bias_function(bias), 2)
-    return cut_off
-
-
-def switch_from_prev_com_choice_function(prev_com_choice, cut_off, bias):
-    """
-    Biases the computer towards switching from its previous choice
-
-    Parameters
-    ----------
-    prev_com_choice : str
-        stores the decision of the computer between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is
-        heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
-
-    Returns
-    -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards switching from its previous choice.
-    """
-    if prev_com_choice == 'h':
-        cut_off = round(cut_off - bias_function(bias), 2)
-    else:
-        cut_off = cut_off + bias_function(bias)
-    return cut_off
-
-
-def bias_stick_to_prev_user_choice_function(prev_subj_choice, cut_off, bias):
-    """
-    Biases the computer towards sticking to the user's previous choice
-
-    Parameters
-    ----------
-    prev_subj_choice : str
-        stores the decision of the subject between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
-
-    Returns
-    -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards sticking to the user's previous choice.
-    """
-    if prev_subj_choice == 'h':
-        cut_off = cut_off + bias_function(bias)
-    else:
-        cut_off = round(cut_off - bias_function(bias), 2)
-    return cut_off
-
-
-def bias_switch_from_prev_user_choice_function(prev_subj_choice,
-                                               cut_off, bias):
-    """
-   Biases the computer towards switching from the user's previous choice
-
-    Parameters
-    ----------
-    prev_subj_choice : str
-        stores the decision of the subject between heads and tails of the
-        previous round.
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
-
-    Returns
-    -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards switching from the user's previous choice.
-    """
-    if prev_subj_choice == 'h':
-        cut_off = round(cut_off - bias_function(bias), 2)
-    else:
-        cut_off = cut_off + bias_function(bias)
-    return cut_off
-
-
-def bias_heads_function(cut_off, bias):
-    """
-    Biases the computer towards choosing heads
-
-    Parameters
-    ----------
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
-
-    Returns
-    -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards choosing heads.
-    """
-    cut_off = cut_off + bias_function(bias)
-    return cut_off
-
-
-def bias_tails_function(cut_off, bias):
-    """
-    Biases the computer towards choosing tails
-
-    Parameters
-    ----------
-    cut_off : float
-        stores a value which is used to compute the choice of the computer.
-        If a random generated float is smaller than the cut_off, the computer's
-        decision is heads, otherwise it is tails.
-    bias : float
-        stores a value to bias the computer to the extend of the value.
-
-    Returns
-    -------
-    cut_off : float
-        updated version of the cut_off variable described above to bias the
-        computer towards choosing tails.
-    """
-    cut_off = round(cut_off - bias_function(bias), 2)
-    return cut_off
-
-
-def frustrator_function(choice_subject, choice_computer):
-    """
-    Lets the computer always choose the opposite of the user
-
-    Parameters
-    ----------
-    choice_subject : str
-        stores the decision of the subject between heads and tails of the
-        current round.
-    choice_computer : str
-        stores the decision of the computer between heads and tails of the
-        current round.
-
-    Returns
-    -------
-    choice_computer : str
-        updated version of the choice_computer variable described above. Now
-        always the opposite of choice_subject.
-    """
-    if choice_subject == 'h':
-        choice_computer = 't'
-    else:
-        choice_computer = 'h'
-    return choice_computer
+# the functions are imported from game_logic, which (unlike
+# assignment_psychopy) doesn't import psychopy or open a window
+from game_logic import (allowed_bias_combis, bias_function,
+                        stick_to_prev_com_choice_function,
+                        switch_from_prev_com_choice_function,
+                        bias_stick_to_prev_user_choice_function,
+                        bias_switch_from_prev_user_choice_function,
+                        bias_heads_function, bias_tails_function,
+                        frustrator_function, cut_off_function,
+                        cut_off_table_function, computer_choice_function,
+                        choice_change_function, round_result_function)
 
 
 cut_off = 0.5
@@ -439,6 +165,93 @@ def test_frustrator_function():
         assert frustrator_function(choice_subject, choice_computer) == 'h'
 
 
+# test of the function combining all activated biases to the cut-off
+def test_cut_off_function():
+
+    prev_com_choice = random.choice(['h', 't'])
+    prev_subj_choice = random.choice(['h', 't'])
+
+    # no bias at all and the biases depending on the previous round in the
+    # first round leave the cut-off at 0.5
+    assert cut_off_function(random.randint(1, 10), prev_com_choice,
+                            prev_subj_choice, bias) == 0.5
+    assert cut_off_function(1, prev_com_choice, prev_subj_choice, bias,
+                            bias_stick_to_prev_com_choice=True) == 0.5
+
+    expected = stick_to_prev_com_choice_function(prev_com_choice, cut_off,
+                                                 bias)
+    assert cut_off_function(2, prev_com_choice, prev_subj_choice, bias,
+                            bias_stick_to_prev_com_choice=True) == expected
+
+    expected = bias_heads_function(
+        bias_switch_from_prev_user_choice_function(prev_subj_choice, cut_off,
+                                                   bias), bias)
+    assert cut_off_function(2, prev_com_choice, prev_subj_choice, bias,
+                            bias_heads=True,
+                            bias_switch_from_prev_user_choice=True) == expected
+
+
+# test whether the table contains the same cut-offs as cut_off_function
+def test_cut_off_table_function():
+
+    biases = {'bias_heads': random.choice([True, False]),
+              'bias_tails': random.choice([True, False]),
+              'bias_stick_to_prev_com_choice': random.choice([True, False]),
+              'bias_switch_from_prev_com_choice': random.choice([True, False]),
+              'bias_stick_to_prev_user_choice': random.choice([True, False]),
+              'bias_switch_from_prev_user_choice': random.choice([True,
+                                                                  False])}
+    cut_offs = cut_off_table_function(bias, **biases)
+
+    assert cut_offs[0, 0] == cut_off_function(1, 0, 0, bias, **biases)
+    prev_com_choice = random.choice(['h', 't'])
+    prev_subj_choice = random.choice(['h', 't'])
+    assert (cut_offs[prev_com_choice, prev_subj_choice] ==
+            cut_off_function(random.randint(2, 10), prev_com_choice,
+                             prev_subj_choice, bias, **biases))
+
+
+# test of the function determining the computer's choice
+def test_computer_choice_function():
+
+    ran_float = random.random()
+
+    if ran_float < cut_off:
+        assert computer_choice_function(cut_off, ran_float) == 'h'
+    elif ran_float > cut_off:
+        assert computer_choice_function(cut_off, ran_float) == 't'
+    assert computer_choice_function(cut_off, cut_off) in ['h', 't']
+
+
+# test of the function counting the subject's changes of their choice
+def test_choice_change_function():
+
+    assert choice_change_function(1, 'h', 't', 't', 0, 0) == (0, 0)
+    assert choice_change_function(2, 'h', 't', 't', 3, 5) == (4, 6)
+    assert choice_change_function(2, 'h', 'h', 't', 3, 5) == (3, 6)
+    assert choice_change_function(2, 'h', 't', 'h', 3, 5) == (4, 5)
+
+
+# test of the function scoring a round
+def test_round_result_function():
+
+    choice_subject = random.choice(['h', 't'])
+    choice_computer = random.choice(['h', 't'])
+
+    if choice_subject == choice_computer:
+        assert round_result_function(choice_subject, choice_computer,
+                                     2, 3) == (3, 3)
+    else:
+        assert round_result_function(choice_subject, choice_computer,
+                                     2, 3) == (2, 4)
+
+
+# importing the game logic must neither need psychopy nor open a window
+def test_game_logic_without_psychopy():
+
+    assert 'psychopy' not in sys.modules
+
+
 # %% actual tests
 
 test_bias_heads_function()
@@ -453,3 +266,7 @@ for repeats in range(50):
     test_bias_stick_to_prev_user_choice_function()
     test_bias_switch_from_prev_user_choice_function()
     test_frustrator_function()
+    test_cut_off_function()
+    test_cut_off_table_function()
+    test_computer_choice_function()
+    test_round_result_function()
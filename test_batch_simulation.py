@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the simulation of many sessions at once.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and variables
+
+import random
+
+import numpy as np
+import pytest
+
+from batch_simulation import choices_to_array, simulate_sessions
+from game_engine import MatchingPenniesEngine
+
+biases = ['bias_heads', 'bias_tails', 'bias_stick_to_prev_com_choice',
+          'bias_switch_from_prev_com_choice',
+          'bias_stick_to_prev_user_choice',
+          'bias_switch_from_prev_user_choice']
+
+
+class FloatsRandom:
+    """
+    Replaces random.Random in the MatchingPenniesEngine, returns given floats.
+    """
+
+    def __init__(self, floats):
+        self.floats = iter(floats)
+
+    def random(self):
+        return next(self.floats)
+
+# %% defines test functions
+
+
+# every session has to give exactly the same result as the engine given the
+# same random floats
+@pytest.mark.parametrize('repeat', range(10))
+def test_same_as_engine(repeat):
+
+    settings = {name: random.choice([True, False]) for name in biases}
+    rng = np.random.default_rng(repeat)
+    subject_choices = rng.choice(['h', 't'], size=(20, 50))
+    ran_floats = rng.random((20, 50))
+
+    result = simulate_sessions(subject_choices, bias=0.3,
+                               ran_floats=ran_floats, **settings)
+
+    for i in range(20):
+        engine = MatchingPenniesEngine(bias=0.3,
+                                       rng=FloatsRandom(ran_floats[i]),
+                                       **settings)
+        computer_choices = engine.run(subject_choices[i])
+        assert (result.computer_choices[i] ==
+                (np.array(computer_choices) == 'h')).all()
+        assert result.wins[i] == engine.wins
+        assert result.losses[i] == engine.losses
+        assert result.choice_change_subject[i] == engine.choice_change_subject
+        assert (result.choice_change_computer[i] ==
+                engine.choice_change_computer)
+
+
+def test_frustrator():
+
+    result = simulate_sessions(np.ones((5, 30), dtype=bool), frustrator=True)
+
+    assert (result.wins == 0).all()
+    assert (result.losses == 30).all()
+
+
+def test_single_session():
+
+    result = simulate_sessions(['h', 't', 'h'], bias=0.5, bias_tails=True)
+
+    assert result.computer_choices.shape == (1, 3)
+    assert result.computer_choices.sum() == 0
+    assert result.choice_change_subject[0] == 2
+
+
+def test_choices_to_array():
+
+    heads = choices_to_array(np.array(['h', 't', 'h'], dtype=object))
+    assert heads.tolist() == [True, False, True]
+    assert choices_to_array([[b'h'], [b't']]).tolist() == [[True], [False]]
+    assert choices_to_array([True, 0]).tolist() == [True, False]
+    assert choices_to_array([]).shape == (0,)
+    with pytest.raises(ValueError):
+        choices_to_array(['h', 'heads'])
+
+
+# sessions without rounds are simply empty
+def test_no_rounds():
+
+    for biases in [{}, {'bias_stick_to_prev_com_choice': True}]:
+        result = simulate_sessions(np.zeros((3, 0), dtype=bool), **biases)
+        assert result.computer_choices.shape == (3, 0)
+        assert result.wins.tolist() == [0, 0, 0]
+        assert result.losses.tolist() == [0, 0, 0]
+        assert result.choice_change_subject.tolist() == [0, 0, 0]
+    assert simulate_sessions([]).wins.tolist() == [0]
+
+
+def test_bad_settings():
+
+    with pytest.raises(ValueError):
+        simulate_sessions(['h'], bias=-0.6)
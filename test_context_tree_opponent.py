@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the opponent predicting the subject's choice with a context tree.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import random
+
+import pytest
+
+from context_tree_opponent import ContextTreeOpponent
+from game_engine import MatchingPenniesEngine
+from player_agents import AlternatingPlayer, RandomPlayer
+
+# %% defines test functions
+
+
+# the tree grows by at most one context per round
+def test_growth():
+
+    opponent = ContextTreeOpponent(max_depth=3)
+    opponent.observe('h', 'h')
+    assert len(opponent.nodes) == 1
+    opponent.observe('h', 'h')
+    assert len(opponent.nodes) == 2
+    for i in range(10):
+        opponent.observe('h', 'h')
+    # the same context every round: one node per length up to max_depth
+    assert len(opponent.nodes) == 4
+    assert opponent.predict() == 'h'
+
+
+# a repeating pattern longer than one round has to be learned
+def test_pattern():
+
+    opponent = ContextTreeOpponent(max_depth=6)
+    pattern = ['h', 'h', 't', 'h', 't', 't']
+    for i in range(300):
+        opponent.observe(pattern[i % 6], 'h')
+    assert opponent.predict() == pattern[300 % 6]
+
+
+# the amount of nodes never exceeds max_nodes, only the longest contexts are
+# removed
+def test_memory_limit():
+
+    opponent = ContextTreeOpponent(max_depth=10, max_nodes=200,
+                                   rng=random.Random(0))
+    engine = MatchingPenniesEngine(opponent=opponent)
+    engine.play(RandomPlayer(random.Random(0)), 20000)
+
+    report = opponent.memory_report()
+    assert report['nodes'] == 200
+    assert report['evicted'] > 0
+    assert sum(report['nodes_per_depth']) == 200
+    assert report['nodes_per_depth'][:3] == [1, 4, 16]
+    assert report['bytes'] > 0
+
+
+def test_against_alternating_player():
+
+    engine = MatchingPenniesEngine(opponent=ContextTreeOpponent())
+    engine.play(AlternatingPlayer(), 1000)
+
+    assert engine.wins / 1000 < 0.05
+
+
+def test_bad_settings():
+
+    with pytest.raises(ValueError):
+        ContextTreeOpponent(max_depth=10, max_nodes=5)
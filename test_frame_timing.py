@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the recording of the timing of flips.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and variables
+
+import csv
+import math
+
+import pytest
+
+from frame_timing import FlipRecorder, percentile_function
+
+period = 1 / 60
+
+# %% defines test functions
+
+
+def test_percentile_function():
+
+    assert percentile_function([3, 1, 2], 50) == 2
+    assert percentile_function([1, 2], 50) == 1.5
+    assert percentile_function([1, 2, 3, 4], 100) == 4
+    assert math.isnan(percentile_function([], 50))
+
+
+# flips requested right after the previous one have to appear exactly one
+# period later
+def test_continuous_flips():
+
+    recorder = FlipRecorder(period)
+    assert recorder.record('round', 0, 0.01) == 0
+    assert recorder.record('round', 0.011, 0.01 + period) == 0
+    # two frames dropped
+    assert recorder.record('round', 0.01 + period + 0.001,
+                           0.01 + 4 * period) == 2
+    assert recorder.flips[1][3] == pytest.approx(period)
+
+
+# flips requested after a pause (e.g. waiting for a key) have to appear
+# within one period after the request
+def test_flips_after_pause():
+
+    recorder = FlipRecorder(period)
+    recorder.record('intro', 0, 0.01)
+    assert recorder.record('feedback', 2, 2 + 0.9 * period) == 0
+    assert recorder.record('info', 5, 5 + 2.5 * period) == 2
+
+
+def test_summary(tmp_path):
+
+    recorder = FlipRecorder(period)
+    recorder.record('intro', 0, 0.01)
+    recorder.record('round', 1, 1.01)
+    recorder.record('round', 2, 2 + 3.5 * period)
+    summary = recorder.summary()
+
+    assert summary['all']['flips'] == 3
+    assert summary['round']['flips'] == 2
+    assert summary['round']['dropped'] == 3
+    assert summary['intro']['latency_p50'] == pytest.approx(0.01)
+    assert summary['round']['latency_max'] == pytest.approx(3.5 * period)
+    # the first flip has no interval
+    assert math.isnan(summary['intro']['interval_p50'])
+    assert summary['round']['interval_p50'] == pytest.approx(
+        (1 + 0.99 + 3.5 * period) / 2)
+    assert summary['all']['interval_max'] == pytest.approx(
+        0.99 + 3.5 * period)
+
+    recorder.write_summary(str(tmp_path / 'summary.csv'))
+    with open(tmp_path / 'summary.csv', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['phase', 'flips', 'dropped', 'interval_p50',
+                       'interval_p90', 'interval_p99', 'interval_max',
+                       'latency_p50', 'latency_p90', 'latency_p99',
+                       'latency_max']
+    assert len(rows) == 4
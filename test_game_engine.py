@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the headless matching pennies engine.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and variables
+
+import random
+
+import pytest
+
+from game_engine import MatchingPenniesEngine
+
+biases = ['bias_heads', 'bias_tails', 'bias_stick_to_prev_com_choice',
+          'bias_switch_from_prev_com_choice',
+          'bias_stick_to_prev_user_choice',
+          'bias_switch_from_prev_user_choice']
+
+# %% defines test functions
+
+
+def random_settings():
+    return {name: random.choice([True, False]) for name in biases}
+
+
+def state(engine):
+    return (engine.wins, engine.losses, engine.rounds,
+            engine.choice_change_subject, engine.choice_change_computer,
+            engine.prev_com_choice, engine.prev_subj_choice)
+
+
+# run has to give exactly the same results as calling step every round
+def test_run_equals_step():
+
+    settings = random_settings()
+    seed = random.randint(0, 10000)
+    subject_choices = [random.choice(['h', 't']) for i in range(500)]
+
+    stepped = MatchingPenniesEngine(bias=0.3, rng=random.Random(seed),
+                                    **settings)
+    step_choices = [stepped.step(choice) for choice in subject_choices]
+
+    batch = MatchingPenniesEngine(bias=0.3, rng=random.Random(seed),
+                                  **settings)
+    assert batch.run(subject_choices) == step_choices
+    assert state(batch) == state(stepped)
+
+
+def test_counters():
+
+    engine = MatchingPenniesEngine(rng=random.Random(1))
+    computer_choices = engine.run(['h', 'h', 't', 'h'])
+
+    assert engine.rounds == 5
+    assert engine.wins + engine.losses == 4
+    assert engine.choice_change_subject == 2
+    expected = sum(prev != choice for prev, choice in
+                   zip(computer_choices[:-1], ['h', 't', 'h']))
+    assert engine.choice_change_computer == expected
+
+
+def test_frustrator():
+
+    engine = MatchingPenniesEngine(frustrator=True)
+    engine.run([random.choice(['h', 't']) for i in range(100)])
+
+    assert engine.wins == 0
+    assert engine.losses == 100
+
+
+def test_full_bias_heads():
+
+    engine = MatchingPenniesEngine(bias=0.5, bias_heads=True)
+
+    assert engine.run(['t'] * 100) == ['h'] * 100
+
+
+def test_bad_settings():
+
+    with pytest.raises(ValueError):
+        MatchingPenniesEngine(bias=0.7)
+    with pytest.raises(ValueError):
+        MatchingPenniesEngine(bias_heads=True, frustrator=True)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the opponent predicting the subject's choice from the last rounds.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import random
+import time
+
+import pytest
+
+from game_engine import MatchingPenniesEngine
+from ngram_opponent import NGramOpponent
+from player_agents import AlternatingPlayer, BiasedPlayer, RandomPlayer
+
+# %% defines test functions
+
+
+def test_history():
+
+    opponent = NGramOpponent(k=2)
+    opponent.observe('t', 'h')
+    opponent.observe('h', 't')
+    assert opponent.history == 0b1001
+    # only the last k rounds are kept
+    opponent.observe('t', 't')
+    assert opponent.history == 0b0111
+
+
+def test_prediction():
+
+    opponent = NGramOpponent(k=1)
+    assert opponent.predict() is None
+    for i in range(3):
+        opponent.observe('h', 'h')
+    assert opponent.predict() == 'h'
+    assert opponent.choose() == 't'
+
+
+# a predictable subject has to lose nearly always, a random one about half of
+# the time
+@pytest.mark.parametrize('player, max_win_rate', [
+    (AlternatingPlayer(), 0.05), (BiasedPlayer(0.9, random.Random(1)), 0.2),
+    (RandomPlayer(random.Random(1)), 0.55)])
+def test_against_players(player, max_win_rate):
+
+    engine = MatchingPenniesEngine(opponent=NGramOpponent(k=3))
+    engine.play(player, 2000)
+
+    assert engine.wins / 2000 < max_win_rate
+
+
+# with decay, the opponent adapts to a subject changing their preference
+def test_decay():
+
+    opponent = NGramOpponent(k=1, decay=0.5)
+    for i in range(1000):
+        opponent.observe('h', 'h')
+    for i in range(5):
+        opponent.observe('t', 'h')
+    assert opponent.predict() == 't'
+    assert max(opponent.counts) < NGramOpponent.max_weight
+
+
+def test_fast_with_long_history():
+
+    opponent = NGramOpponent(k=8, decay=0.99)
+    start = time.perf_counter()
+    for i in range(10000):
+        opponent.observe(opponent.choose(), 'h')
+    assert (time.perf_counter() - start) / 10000 < 0.001
+
+
+def test_not_combined_with_biases():
+
+    with pytest.raises(ValueError):
+        MatchingPenniesEngine(bias_heads=True, opponent=NGramOpponent())
+    with pytest.raises(ValueError):
+        NGramOpponent(decay=0)
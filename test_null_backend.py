@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the whole game with a scripted subject and without a screen.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and variables
+
+import csv
+import glob
+import os
+import random
+import sys
+
+import numpy as np
+
+import assignment_psychopy
+from null_backend import NullBackend, ScriptedKeyboard, key_script
+from session_log import read_session_log
+
+folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# %% defines test functions
+
+
+def test_key_script():
+
+    script = list(key_script(['h', 't'], 2))
+    assert script == ['space', None, 'space', None, 'h', None, None, 'space',
+                      'space', 't', None, None, 'space', 'space', 'q']
+
+
+# keys are like psychopy's: they stay in the buffer until they are taken and
+# their duration is only known once they are released
+def test_scripted_keyboard():
+
+    kb = ScriptedKeyboard(['h', None, 't', None], hold=2)
+    keys = kb.getKeys(waitRelease=False, clear=False)
+    assert [key.name for key in keys] == ['h']
+    assert keys[0].duration is None
+    assert kb.getKeys(keyList=['h']) == []
+    # the key is released two frames after it was pressed
+    released = kb.getKeys(keyList=['h'])
+    assert [key.name for key in released] == ['h']
+    assert released[0].duration >= 0
+    assert [key.name for key in kb.getKeys(waitRelease=False)] == ['t']
+    kb.clearEvents()
+    # the subject quits once the script has run out
+    assert [key.name for key in kb.getKeys(waitRelease=False)] == ['q']
+    assert kb.pressed == 3
+
+
+def run_game(monkeypatch, tmp_path, keys, frame_rate=60.0, hold=1):
+    """
+    Runs the game with the log files in tmp_path and returns the backend and
+    the logged rounds.
+    """
+    monkeypatch.setattr(assignment_psychopy, 'log_folder', str(tmp_path))
+    monkeypatch.setattr(assignment_psychopy, 'texture_folder',
+                        str(tmp_path / 'textures'))
+    monkeypatch.setattr(assignment_psychopy, 'f_heads',
+                        os.path.join(folder, "penny_heads.png"))
+    monkeypatch.setattr(assignment_psychopy, 'f_tails',
+                        os.path.join(folder, "penny_tails.png"))
+    backend = NullBackend(keys, frame_rate=frame_rate, hold=hold)
+    assignment_psychopy.main(backend=backend)
+    f_log, = glob.glob(str(tmp_path / "trials_*.csv"))
+    with open(f_log, newline='') as f:
+        rows = list(csv.DictReader(f))
+    return backend, rows
+
+
+# the real game plays every scripted round and logs it
+def test_game(monkeypatch, tmp_path):
+
+    choices = [random.choice(['h', 't']) for i in range(200)]
+    delay = max(assignment_psychopy.delay_win, assignment_psychopy.delay_loss)
+    backend, rows = run_game(monkeypatch, tmp_path,
+                             key_script(choices, round(delay * 60)))
+
+    assert [row['choice_subject'] for row in rows] == choices
+    assert [int(row['round']) for row in rows] == list(range(1, 201))
+    results = [row['result'] for row in rows]
+    assert all(result == ('win' if row['choice_subject'] ==
+                          row['choice_computer'] else 'loss')
+               for row, result in zip(rows, results))
+    # every frame of the feedback delay is flipped
+    win = backend.windows[0]
+    assert win.flips > 200 * round(delay * 60)
+    # the session log is written when the game ends, not at exit
+    f_session_log, = glob.glob(str(tmp_path / "session_*.pennies"))
+    log = read_session_log(f_session_log)
+    assert ''.join(np.where(log.subject_choices, 'h', 't')) == ''.join(choices)
+    assert 'psychopy' not in sys.modules
+
+
+# the display of the round info and the keypress are logged on one clock
+def test_response_times(monkeypatch, tmp_path):
+
+    rows = run_game(monkeypatch, tmp_path, key_script(['h', 't'] * 5, 90))[1]
+    for row in rows:
+        t_onset, t_response = float(row['t_round_onset']), \
+            float(row['t_response'])
+        assert t_onset <= t_response
+        assert abs(t_response - t_onset - float(row['rt'])) < 0.005
+
+
+# keys pressed during the feedback delay are discarded, 'q' quits right away
+def test_quit(monkeypatch, tmp_path):
+
+    keys = ['space', None, 'space', None, 'h', 't', 't', None, 'space',
+            'space', 'q']
+    backend, rows = run_game(monkeypatch, tmp_path, keys, frame_rate=2)
+    assert [row['choice_subject'] for row in rows] == ['h']
+    assert backend.keyboards[0].pressed == len(keys) - 3
+
+
+# the flips are timed on one clock, so no frames are dropped without a screen
+def test_frame_timing(monkeypatch, tmp_path):
+
+    monkeypatch.setattr(assignment_psychopy, 'record_frame_timing', True)
+    run_game(monkeypatch, tmp_path, key_script(['h', 't', 'h'], 90))
+    f_summary, = glob.glob(str(tmp_path / "flips_*_summary.csv"))
+    with open(f_summary, newline='') as f:
+        summary = {row['phase']: row for row in csv.DictReader(f)}
+    assert set(summary) == {'all', 'intro', 'round', 'feedback', 'info',
+                            'end'}
+    assert int(summary['intro']['flips']) == 2
+    assert int(summary['all']['dropped']) == 0
+    assert 0 <= float(summary['all']['latency_p50']) <= \
+        float(summary['all']['latency_max'])
+    assert float(summary['all']['latency_max']) < 0.1
+    assert 0 < float(summary['round']['interval_p50']) <= \
+        float(summary['round']['interval_max'])
+
+
+# the duration of the choice key is logged if it was released during the
+# delay
+def test_key_duration(monkeypatch, tmp_path):
+
+    choices = ['h', 't'] * 5
+    rows = run_game(monkeypatch, tmp_path, key_script(choices, 90, hold=5),
+                    hold=5)[1]
+    assert len(rows) == 10
+    assert all(float(row['key_duration']) > 0 for row in rows)
+
+    # held for longer than the delay of a loss (60 frames)
+    (tmp_path / 'held').mkdir()
+    rows = run_game(monkeypatch, tmp_path / 'held',
+                    key_script(choices, 90, hold=80), hold=80)[1]
+    assert len(rows) == 10
+    for row in rows:
+        if row['result'] == 'loss':
+            assert row['key_duration'] == ''
+        else:
+            assert float(row['key_duration']) > 0
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the sweep over all bias settings.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import csv
+
+import numpy as np
+import pytest
+
+from parameter_sweep import (bias_combis_function, bias_names, bias_values,
+                             player_models, simulate_setting, sweep,
+                             write_table)
+
+# %% defines test functions
+
+
+# plain floats without -0.0
+def test_bias_values():
+
+    assert bias_values == [-0.5, -0.4, -0.3, -0.2, -0.1, 0.0, 0.1, 0.2, 0.3,
+                           0.4, 0.5]
+    assert all(type(value) is float for value in bias_values)
+    assert str(bias_values[5]) == '0.0'
+
+
+def test_bias_combis_function():
+
+    combis = bias_combis_function()
+
+    # 2**6 combinations without the frustrator, only one with it
+    assert len(combis) == 65
+    frustrated = [combi for combi in combis if combi['frustrator']]
+    assert len(frustrated) == 1
+    assert sum(frustrated[0].values()) == 1
+
+
+@pytest.mark.parametrize('player', list(player_models))
+def test_player_models(player):
+
+    choices = player_models[player](np.random.default_rng(0), 3, 10)
+
+    assert choices.shape == (3, 10)
+    assert choices.dtype == bool
+
+
+def test_alternating_player():
+
+    choices = player_models['alternating'](np.random.default_rng(0), 4, 10)
+
+    assert (choices[:, 1:] != choices[:, :-1]).all()
+
+
+# the results must only depend on the seed, not on the amount of processes
+def test_sweep(tmp_path):
+
+    rows = sweep(biases=[0, 0.5], players=['random', 'heads'], n_sessions=5,
+                 n_rounds=20, seed=1, workers=1)
+
+    assert len(rows) == 64 * 2 * 2 + 2
+    for row in rows:
+        if row['frustrator']:
+            assert row['win_rate'] == 0
+            assert row['bias'] is None
+        if row['bias'] == 0.5 and row['bias_heads'] and sum(
+                row[name] for name in ['bias_tails',
+                                       'bias_stick_to_prev_com_choice',
+                                       'bias_switch_from_prev_com_choice',
+                                       'bias_stick_to_prev_user_choice',
+                                       'bias_switch_from_prev_user_choice']
+        ) == 0:
+            assert row['switch_rate_computer'] == 0
+
+    assert sweep(biases=[0, 0.5], players=['random', 'heads'], n_sessions=5,
+                 n_rounds=20, seed=1, workers=2) == rows
+
+    # a single row can be reproduced from its seed and spawn_key
+    row = rows[7]
+    task = ({name: row[name] for name in bias_names}, row['bias'],
+            row['player'], 5, 20, row['seed'], row['spawn_key'])
+    assert simulate_setting(task) == row
+
+    write_table(rows, str(tmp_path / 'sweep.csv'))
+    with open(tmp_path / 'sweep.csv', newline='') as f:
+        assert len(list(csv.reader(f))) == len(rows) + 1
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the simulated subjects.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import random
+
+import pytest
+
+from game_engine import MatchingPenniesEngine
+from player_agents import (AlternatingPlayer, BiasedPlayer,
+                           CopyComputerPlayer, QLearningPlayer,
+                           WinStayLoseShiftPlayer, players)
+
+# %% defines test functions
+
+
+@pytest.mark.parametrize('name', list(players))
+def test_players_play(name):
+
+    if name == 'biased':
+        player = players[name](0.7)
+    else:
+        player = players[name]()
+    engine = MatchingPenniesEngine().play(player, 200)
+
+    assert engine.wins + engine.losses == 200
+    assert engine.rounds == 201
+    # no attributes outside of __slots__
+    assert not hasattr(player, '__dict__')
+
+
+def test_alternating_player():
+
+    engine = MatchingPenniesEngine().play(AlternatingPlayer(), 50)
+
+    assert engine.choice_change_subject == 49
+
+
+def test_win_stay_lose_shift_player():
+
+    player = WinStayLoseShiftPlayer()
+    player.observe('h', 'h')
+    assert player.choose() == 'h'
+    player.observe('h', 't')
+    assert player.choose() == 't'
+
+
+# copying the computer means never changing from its previous choice
+def test_copy_computer_player():
+
+    engine = MatchingPenniesEngine().play(CopyComputerPlayer(), 100)
+
+    assert engine.choice_change_computer == 0
+
+
+def test_biased_player():
+
+    player = BiasedPlayer(1)
+
+    assert {player.choose() for i in range(20)} == {'h'}
+
+
+# against a computer that always sticks to its previous choice, the learner
+# has to win nearly always after some rounds
+def test_q_learning_player():
+
+    player = QLearningPlayer(epsilon=0.05, rng=random.Random(0))
+    engine = MatchingPenniesEngine(bias=0.5,
+                                   bias_stick_to_prev_com_choice=True,
+                                   rng=random.Random(0))
+    engine.play(player, 2000)
+
+    assert engine.wins / 2000 > 0.8
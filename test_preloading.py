@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the preparation of the game in small steps.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and variables
+
+import threading
+
+import pytest
+
+from preloading import Preloader, wait_for
+
+# %% defines test functions
+
+
+# every step runs one part of the generator, until nothing is left
+def test_steps():
+
+    done = []
+
+    def steps():
+        for i in range(3):
+            done.append(i)
+            yield
+        return 'ready'
+
+    preloader = Preloader()
+    preloader.start(steps())
+    assert not preloader.done
+    assert preloader.step() and done == [0]
+    assert preloader.step() and done == [0, 1]
+    assert preloader.finish() == 'ready'
+    assert done == [0, 1, 2]
+    assert preloader.done and preloader.result == 'ready'
+    assert not preloader.step()
+
+
+# the generator waits for the background work without blocking a step
+def test_background():
+
+    event = threading.Event()
+
+    def steps(background):
+        future = background(lambda x: event.wait(5) and x * 2, 21)
+        yield from wait_for(future)
+        return future.result()
+
+    preloader = Preloader()
+    preloader.start(steps(preloader.background))
+    for i in range(3):
+        assert preloader.step()
+    assert not preloader.done
+    event.set()
+    assert preloader.finish() == 42
+
+
+def test_exception():
+
+    def steps(background):
+        future = background(int, 'heads')
+        yield from wait_for(future)
+        return future.result()
+
+    preloader = Preloader()
+    preloader.start(steps(preloader.background))
+    with pytest.raises(ValueError):
+        preloader.finish()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the statistics of the subject's play updated round by round.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import csv
+import math
+import random
+
+import pytest
+
+from assignment_psychopy import stats_text_function
+from running_stats import RunningStats
+from trial_logger import TrialLogger
+
+# %% defines test functions
+
+
+def test_empty():
+
+    stats = RunningStats()
+    assert stats.values() == (None,) * len(RunningStats.columns)
+    assert '-' in stats_text_function(stats)
+
+
+# the running statistics equal the ones computed from the whole sequence
+def test_against_sequence():
+
+    subject = [random.choice('ht') for i in range(1000)]
+    computer = [random.choice('ht') for i in range(1000)]
+    stats = RunningStats()
+    for choice_subject, choice_computer in zip(subject, computer):
+        stats.update(choice_subject, choice_computer)
+
+    wins = [s == c for s, c in zip(subject, computer)]
+    switches = [subject[i] != subject[i - 1] for i in range(1, 1000)]
+    after_win = [switches[i - 1] for i in range(1, 1000) if wins[i - 1]]
+    after_loss = [switches[i - 1] for i in range(1, 1000)
+                  if not wins[i - 1]]
+    p = subject.count('h') / 1000
+
+    assert stats.win_rate == sum(wins) / 1000
+    assert stats.switch_after_win == sum(after_win) / len(after_win)
+    assert stats.switch_after_loss == sum(after_loss) / len(after_loss)
+    assert stats.alternation_rate == sum(switches) / 999
+    assert stats.entropy == pytest.approx(-p * math.log2(p) -
+                                          (1 - p) * math.log2(1 - p))
+    low, high = stats.win_rate_interval()
+    assert low < stats.win_rate < high
+    # every statistic is shown on the info screen
+    assert '{:.0%} of the rounds'.format(
+        stats.alternation_rate) in stats_text_function(stats)
+
+
+def test_win_rate_interval():
+
+    stats = RunningStats()
+    for i in range(10):
+        stats.update('h', 'h' if i < 8 else 't')
+    # Wilson score interval of 8 out of 10
+    low, high = stats.win_rate_interval()
+    assert low == pytest.approx(0.4902, abs=1e-4)
+    assert high == pytest.approx(0.9433, abs=1e-4)
+    assert stats.entropy == 0
+
+
+def test_logged_stats(tmp_path):
+
+    path = tmp_path / 'trials.csv'
+    trial_logger = TrialLogger(str(path), extra_columns=RunningStats.columns)
+    stats = RunningStats()
+    for rounds in range(1, 4):
+        stats.update('h', 't')
+        trial_logger.log(rounds, 'h', 't', 0.5, 'loss', 0.3, 1.0, 1.3, 0.1,
+                         stats.values())
+    trial_logger.close()
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+    assert rows[0]['switch_after_loss'] == ''
+    assert rows[2]['win_rate'] == '0.0'
+    assert rows[2]['switch_after_loss'] == '0.0'
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the analyses of many sessions at once.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and variables
+
+import math
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from batch_simulation import simulate_sessions
+from session_analysis import (analyse_sessions, flatten_sessions,
+                              responsiveness, run_lengths, sequence_entropy,
+                              transition_matrices)
+
+# a fixed seed, so that a failure can be reproduced
+rng = np.random.default_rng(22)
+
+# sessions of different lengths, including empty ones
+lengths = [50, 0, 1, 2, 120, 37]
+sessions = [rng.random(n) < 0.6 for n in lengths]
+results = [rng.random(n) < 0.5 for n in lengths]
+starts = np.concatenate([[0], np.cumsum(lengths)])
+choices = np.concatenate(sessions)
+wins = np.concatenate(results)
+
+# %% defines test functions
+
+
+# every analysis has to give the same result as going through each session
+def test_against_loops():
+
+    analysis = analyse_sessions(SimpleNamespace(
+        subject_choices=choices, subject_wins=wins, starts=starts))
+    transitions = transition_matrices(choices, starts, normalize=False)
+    runs = run_lengths(choices, starts, max_length=5)
+    entropy = sequence_entropy(choices, starts, length=2)
+
+    for i, (session, result) in enumerate(zip(sessions, results)):
+        pairs = list(zip(session[:-1], session[1:]))
+        counts = Counter((int(a), int(b)) for a, b in pairs)
+        for a in [0, 1]:
+            for b in [0, 1]:
+                assert transitions[i, a, b] == counts[a, b]
+
+        after_win = [session[j] == session[j - 1]
+                     for j in range(1, len(session)) if result[j - 1]]
+        if after_win:
+            assert analysis.win_stay[i] == pytest.approx(np.mean(after_win))
+        else:
+            assert np.isnan(analysis.win_stay[i])
+
+        lengths_ = [len(list(group)) for group in
+                    np.split(session, np.flatnonzero(np.diff(session)) + 1)
+                    if len(group)]
+        expected = Counter(min(length, 5) for length in lengths_)
+        assert runs[i].tolist() == [expected[n] for n in range(1, 6)]
+
+        patterns = Counter(pairs)
+        if patterns:
+            expected = -sum(n / len(pairs) * math.log2(n / len(pairs))
+                            for n in patterns.values()) / 2
+            assert entropy[i] == pytest.approx(expected)
+        else:
+            assert np.isnan(entropy[i])
+
+        if len(session):
+            assert analysis.win_rate[i] == pytest.approx(result.mean())
+            assert analysis.heads_rate[i] == pytest.approx(session.mean())
+
+
+def test_simulated_sessions():
+
+    subject = rng.random((300, 100)) < 0.5
+    result = simulate_sessions(subject, bias_heads=True, bias=0.3, rng=rng)
+    log = flatten_sessions(subject, result.computer_choices)
+    analysis = analyse_sessions(log)
+    assert np.array_equal(analysis.win_rate, result.wins / 100)
+    assert np.array_equal(analysis.alternation_rate,
+                          result.choice_change_subject / 99)
+    # a random player is unpredictable
+    assert abs(np.mean(analysis.entropy) - 1) < 0.05
+    assert analysis.transitions.shape == (300, 2, 2)
+
+
+def test_responsiveness():
+
+    log = SimpleNamespace(subject_choices=choices, subject_wins=wins,
+                          starts=starts)
+    settings = [{'bias': 0.4, 'computer_strategies': ['bias_heads']},
+                {'bias': 0.4, 'computer_strategies': []}] * 3
+    analysis = analyse_sessions(log)
+    result = responsiveness(analysis, settings)
+    assert result.sessions.tolist() == [3, 3]
+    heads = result.configs.index((0.4, ('bias_heads',)))
+    expected = np.nanmean(analysis.win_rate[[0, 2, 4]])
+    assert result.win_rate[heads] == pytest.approx(expected)
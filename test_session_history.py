@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the compact record of the rounds of a session.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import random
+
+import numpy as np
+import pytest
+
+from game_engine import MatchingPenniesEngine
+from session_history import SessionHistory
+
+# %% defines test functions
+
+
+def test_append():
+
+    history = SessionHistory(capacity=2)
+    history.append('h', 't', 0.5)
+    history.append('t', 't')
+    history.append('h', 'h', 0.25)
+    assert len(history) == 3
+    assert history.subject_choices.tolist() == [True, False, True]
+    assert history.computer_choices.tolist() == [False, False, True]
+    assert history.subject_wins.tolist() == [False, True, True]
+    assert history.rts[0] == 0.5
+    assert np.isnan(history.rts[1])
+    assert history.rts.dtype == np.float32
+
+
+def test_views():
+
+    history = SessionHistory()
+    history.extend(['h', 't'], [True, True])
+    view = history.subject_choices
+    # no copy of the stored choices
+    assert np.shares_memory(view, history._subject)
+    history.append('t', 'h')
+    assert view.tolist() == [True, False]
+
+
+# a few bytes per round, even after the arrays grew many times
+def test_memory():
+
+    history = SessionHistory(capacity=1)
+    for i in range(100000):
+        history.append('h', 't', 0.4)
+    assert history.nbytes / len(history) < 10
+    with pytest.raises(AttributeError):
+        history.extra = 1
+
+
+# run and step record the same rounds as they play
+def test_engine_history():
+
+    choices = [random.choice('ht') for i in range(3000)]
+    engine = MatchingPenniesEngine(bias_tails=True, rng=random.Random(1),
+                                   record_history=True)
+    computer_choices = engine.run(iter(choices))
+    other = MatchingPenniesEngine(bias_tails=True, rng=random.Random(1),
+                                  record_history=True)
+    for choice in choices:
+        other.step(choice)
+    for history in [engine.history, other.history]:
+        assert history.subject_choices.tolist() == [choice == 'h' for
+                                                    choice in choices]
+        assert history.computer_choices.tolist() == [
+            choice == 'h' for choice in computer_choices]
+        assert history.subject_wins.sum() == engine.wins
+    engine.reset()
+    assert len(engine.history) == 0
+    assert MatchingPenniesEngine().history is None
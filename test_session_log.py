@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the binary log of whole sessions.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import random
+
+import numpy as np
+import pytest
+
+from game_engine import MatchingPenniesEngine
+from session_history import SessionHistory
+from session_log import (concatenate_session_logs, read_session_log,
+                         session_index, write_session_log)
+from session_random import SessionRandom
+from strategies import compose_strategy
+
+# %% defines test functions
+
+
+def play(names, n_rounds, seed):
+    """
+    Plays a session with random choices of the subject, returns the engine
+    and the cut-off of every round.
+    """
+    rng = SessionRandom(seed)
+    engine = MatchingPenniesEngine(strategy=compose_strategy(names, 0.3,
+                                                             rng=rng),
+                                   rng=rng, record_history=True)
+    cut_offs = []
+    for i in range(n_rounds):
+        cut_offs.append(engine.cut_off())
+        engine.step(random.choice('ht'))
+    return engine, cut_offs
+
+
+def test_write_and_read(tmp_path):
+
+    path = str(tmp_path / 'session.pennies')
+    engine, cut_offs = play(['bias_stick_to_prev_com_choice'], 500, 1)
+    engine.history._rts[:500] = np.random.random(500)
+    write_session_log(path, engine.history, engine.strategy,
+                      engine.rng.info())
+
+    log = read_session_log(path)
+    history = engine.history
+    assert log.rounds == 500
+    assert log.sessions[0]['bias'] == 0.3
+    assert log.sessions[0]['seed'] == 1
+    assert np.array_equal(log.subject_choices, history.subject_choices)
+    assert np.array_equal(log.computer_choices, history.computer_choices)
+    assert np.array_equal(log.subject_wins, history.subject_wins)
+    assert np.array_equal(log.rts, history.rts)
+    assert np.array_equal(log.cut_offs, np.float32(cut_offs))
+
+    # the columns are read-only views of the file, aligned in it
+    assert isinstance(log.rts, np.memmap)
+    assert not log.rts.flags.writeable
+    assert all(offset % 64 == 0 for name, dtype, offset in
+               log.header['columns'])
+
+
+def test_opponent_and_empty(tmp_path):
+
+    path = str(tmp_path / 'session.pennies')
+    engine, cut_offs = play(['ngram'], 50, 2)
+    write_session_log(path, engine.history, engine.strategy)
+    assert np.isnan(read_session_log(path).cut_offs).all()
+
+    write_session_log(path, SessionHistory())
+    log = read_session_log(path)
+    assert log.rounds == 0
+    assert len(log.subject_choices) == 0
+
+    with open(path, 'wb') as f:
+        f.write(b'round,choice_subject\n')
+    with pytest.raises(ValueError):
+        read_session_log(path)
+
+
+def test_concatenate(tmp_path):
+
+    paths = []
+    histories = []
+    for i, n_rounds in enumerate([30, 0, 70, 1]):
+        engine, cut_offs = play(['bias_heads'], n_rounds, i)
+        paths.append(str(tmp_path / 'session_{}.pennies'.format(i)))
+        write_session_log(paths[-1], engine.history, engine.strategy,
+                          engine.rng.info())
+        histories.append(engine.history)
+
+    path = str(tmp_path / 'all.pennies')
+    concatenate_session_logs(paths, path)
+    log = read_session_log(path)
+    assert log.rounds == 101
+    assert log.starts.tolist() == [0, 30, 30, 100, 101]
+    assert [session['seed'] for session in log.sessions] == [0, 1, 2, 3]
+    assert np.array_equal(log.subject_choices, np.concatenate(
+        [history.subject_choices for history in histories]))
+    assert np.array_equal(session_index(log),
+                          [0] * 30 + [2] * 70 + [3])
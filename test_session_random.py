@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the seeded source of random numbers of a session.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import random
+
+import numpy as np
+
+from batch_simulation import simulate_sessions
+from game_engine import MatchingPenniesEngine
+from session_random import SessionRandom
+from strategies import compose_strategy
+
+# %% defines test functions
+
+
+# the blocks don't change the stream, no matter how the floats are requested
+def test_stream():
+
+    expected = np.random.default_rng(np.random.SeedSequence(7)).random(100)
+    rng = SessionRandom(7, block_size=16)
+    floats = [rng.random() for i in range(10)]
+    floats.extend(rng.random(30))
+    floats.extend(rng.random() for i in range(20))
+    floats.extend(rng.random((4, 10)).ravel())
+    assert np.array_equal(floats, expected)
+    assert type(rng.random()) is float
+
+
+def test_seed():
+
+    rng = SessionRandom()
+    floats = [rng.random() for i in range(10)]
+    assert isinstance(rng.seed, int)
+    replay = SessionRandom(**rng.info())
+    assert [replay.random() for i in range(10)] == floats
+    assert rng.choice(['h', 't']) in ['h', 't']
+
+
+def test_spawn():
+
+    children = SessionRandom(3).spawn(3)
+    streams = [tuple(child.random(5)) for child in children]
+    assert len(set(streams)) == 3
+    # a child can be recreated from its seed and spawn_key
+    again = SessionRandom(**children[1].info())
+    assert tuple(again.random(5)) == streams[1]
+
+
+# a session is replayed exactly from its seed and the subject's choices
+def test_replay():
+
+    choices = [random.choice('ht') for i in range(500)]
+    for names in [['bias_stick_to_prev_user_choice'], ['ngram'],
+                  ['context_tree']]:
+        games = []
+        for i in range(2):
+            rng = SessionRandom(42)
+            strategy = compose_strategy(names, 0.3, rng=rng)
+            engine = MatchingPenniesEngine(strategy=strategy, rng=rng)
+            games.append([engine.step(choice) for choice in choices])
+        assert games[0] == games[1]
+
+    # the same stream in simulate_sessions gives the same choices
+    engine = MatchingPenniesEngine(bias_heads=True, rng=SessionRandom(5))
+    computer_choices = engine.run(choices)
+    result = simulate_sessions(choices, bias_heads=True, rng=SessionRandom(5))
+    assert np.array_equal(result.computer_choices[0],
+                          np.array(computer_choices) == 'h')
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the registry of the computer's strategies.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from batch_simulation import simulate_sessions
+from game_engine import MatchingPenniesEngine
+from game_logic import allowed_bias_combis, cut_off_table_function
+from ngram_opponent import NGramOpponent
+from parameter_sweep import bias_combis_function
+from strategies import (compose_strategy, register_strategy,
+                        strategy_names_function, strategy_registry)
+
+# %% defines test functions
+
+
+# the composed cut-offs have to be exactly the ones of the bias functions
+def test_cut_offs():
+
+    for combi in bias_combis_function():
+        frustrator = combi.pop('frustrator')
+        names = strategy_names_function(frustrator=frustrator, **combi)
+        for bias in [-0.5, -0.3, 0.1, 0.4, 0.5]:
+            strategy = compose_strategy(names, bias)
+            assert strategy.cut_offs == cut_off_table_function(bias, **combi)
+
+
+# the same combinations are valid as with the original bias settings
+def test_valid_combinations():
+
+    for combi in itertools.product([False, True], repeat=7):
+        names = strategy_names_function(*combi)
+        try:
+            allowed_bias_combis(*combi)
+        except ValueError:
+            with pytest.raises(ValueError):
+                compose_strategy(names)
+        else:
+            compose_strategy(names)
+
+
+def test_invalid_combinations():
+
+    with pytest.raises(ValueError):
+        compose_strategy(['frustrator', 'bias_heads'])
+    with pytest.raises(ValueError):
+        compose_strategy(['ngram', 'bias_tails'])
+    with pytest.raises(ValueError):
+        compose_strategy(['bias_heads'], opponent=NGramOpponent())
+    with pytest.raises(ValueError):
+        compose_strategy(['bias_sideways'])
+    with pytest.raises(ValueError):
+        compose_strategy(['bias_heads'], bias=0.7)
+
+
+def test_frustrator():
+
+    strategy = compose_strategy(['frustrator'])
+    for choice_subject in ['h', 't']:
+        choice_computer = strategy(choice_subject, 0, 0, random.random())
+        assert choice_computer != choice_subject
+
+
+def test_opponent_options():
+
+    strategy = compose_strategy(['ngram'], ngram_length=2, ngram_decay=0.9,
+                                context_depth=5)
+    assert strategy.opponent.k == 2
+    assert strategy.opponent.decay == 0.9
+    assert strategy.cut_off('h', 't') is None
+    strategy = compose_strategy(['context_tree'], context_depth=5)
+    assert strategy.opponent.max_depth == 5
+
+
+# the same strategy object is played by the engine and by simulate_sessions
+def test_shared_strategy():
+
+    strategy = compose_strategy(['bias_heads',
+                                 'bias_stick_to_prev_com_choice'], 0.3)
+    choices = [random.choice('ht') for i in range(200)]
+    floats = [random.random() for i in range(200)]
+
+    rng = random.Random()
+    rng.random = iter(floats).__next__
+    engine = MatchingPenniesEngine(strategy=strategy, rng=rng)
+    computer_choices = engine.run(choices)
+
+    result = simulate_sessions(choices, strategy=strategy, ran_floats=floats)
+    assert np.array_equal(result.computer_choices[0],
+                          np.array(computer_choices) == 'h')
+    assert result.wins[0] == engine.wins
+
+    with pytest.raises(ValueError):
+        simulate_sessions(choices, strategy=compose_strategy(['ngram']))
+
+
+# a new strategy only has to be registered to be usable everywhere
+def test_register_strategy():
+
+    @register_strategy('always_heads')
+    def always_heads(cut_off, bias, prev_com_choice, prev_subj_choice):
+        return 1.0
+
+    try:
+        strategy = compose_strategy(['always_heads'])
+        engine = MatchingPenniesEngine(strategy=strategy)
+        assert set(engine.run(['t'] * 50)) == {'h'}
+        assert engine.losses == 50
+    finally:
+        del strategy_registry['always_heads']
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the cache of penny images scaled to the size they are displayed
+at.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and variables
+
+import os
+import shutil
+
+import pytest
+
+from texture_cache import (cache_path_function, cached_texture,
+                           target_size_function)
+
+folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+f_heads = os.path.join(folder, "penny_heads.png")
+f_tails = os.path.join(folder, "penny_tails.png")
+
+# %% defines test functions
+
+
+def test_target_size():
+
+    assert target_size_function((800, 600), (0.68, 0.92)) == (272, 276)
+    assert target_size_function((1920, 1080), (2, 2)) == (1920, 1080)
+    assert target_size_function((10, 10), (0.001, 0.001)) == (1, 1)
+
+
+# the name depends on the content of the image and the size
+def test_cache_path(tmp_path):
+
+    copy = str(tmp_path / 'penny_heads.png')
+    shutil.copy(f_heads, copy)
+    path = cache_path_function(f_heads, (272, 276), 'cache')
+    assert path == cache_path_function(copy, (272, 276), 'cache')
+    assert path.endswith('_272x276.png')
+    assert path != cache_path_function(f_heads, (273, 276), 'cache')
+    assert path != cache_path_function(f_tails, (272, 276), 'cache')
+
+
+# a cached image is used without scaling the original again
+def test_cache_hit(tmp_path):
+
+    path = cache_path_function(f_tails, (100, 100), str(tmp_path))
+    with open(path, 'wb') as f:
+        f.write(b'cached')
+    assert cached_texture(f_tails, (100, 100), str(tmp_path)) == path
+
+
+def test_scaling(tmp_path):
+
+    Image = pytest.importorskip('PIL.Image')
+    folder = str(tmp_path / 'textures')
+    for f_image in [f_heads, f_tails]:
+        path = cached_texture(f_image, (272, 276), folder)
+        with Image.open(path) as image:
+            assert image.size == (272, 276)
+        assert cached_texture(f_image, (272, 276), folder) == path
+    # images that are small enough already aren't copied
+    assert cached_texture(f_tails, (2000, 2000), folder) == f_tails
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the logger writing every round to a csv file.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports
+
+import csv
+import gc
+import time
+import weakref
+
+from trial_logger import TrialLogger
+
+# %% defines test functions
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+# all rounds have to be in the file after closing the logger, no matter if
+# they filled a whole batch or not
+def test_close_writes_everything(tmp_path):
+
+    path = tmp_path / 'trials.csv'
+    trial_logger = TrialLogger(str(path), batch_size=10)
+    for rounds in range(1, 26):
+        trial_logger.log(rounds, 'h', 't', 0.5, 'loss', 0.3, 1.0, 1.3)
+    trial_logger.close()
+    trial_logger.close()
+
+    rows = read_rows(path)
+    assert rows[0] == list(TrialLogger.columns)
+    assert [row[0] for row in rows[1:]] == [str(i) for i in range(1, 26)]
+    assert rows[1] == ['1', 'h', 't', '0.5', 'loss', '0.3', '1.0', '1.3', '']
+
+
+# a full batch is written by the background thread without closing
+def test_batches_are_written_in_background(tmp_path):
+
+    path = tmp_path / 'trials.csv'
+    trial_logger = TrialLogger(str(path), batch_size=5)
+    for rounds in range(1, 6):
+        trial_logger.log(rounds, 't', 't', 0.5, 'win', 0.3, 1.0, 1.3)
+
+    for attempt in range(100):
+        if len(read_rows(path)) == 6:
+            break
+        time.sleep(0.01)
+    assert len(read_rows(path)) == 6
+    trial_logger.close()
+
+
+# closing removes the handler at exit, so that nothing keeps the logger alive
+def test_close_unregisters(tmp_path):
+
+    trial_logger = TrialLogger(str(tmp_path / 'trials.csv'))
+    trial_logger.close()
+    reference = weakref.ref(trial_logger)
+    del trial_logger
+    gc.collect()
+    assert reference() is None
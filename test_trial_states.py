@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of the phases of a round counted in frames.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+
+# %% Setup: Imports and functions
+
+from types import SimpleNamespace
+
+from trial_states import TrialStateMachine
+
+
+def keys(*names):
+    return [SimpleNamespace(name=name) for name in names]
+
+# %% defines test functions
+
+
+# a whole round: choice, delay, feedback, info and the next round
+def test_round():
+
+    states = TrialStateMachine()
+    states.new_round({'h': 3, 't': 2})
+
+    assert states.update(keys()) is None
+    # other keys than 'h', 't' and 'q' are ignored while choosing
+    assert states.update(keys('x', 't')) == 'delay'
+    assert states.choice_key.name == 't'
+
+    # keys during the delay are discarded
+    assert states.update(keys('space')) is None
+    assert states.update(keys('space')) == 'feedback'
+    assert states.discarded == 2
+
+    assert states.update(keys()) is None
+    assert states.update(keys('space')) == 'info'
+    assert states.update(keys('a', 'b')) == 'round'
+    assert states.key.name == 'a'
+    assert states.frames == 0
+
+
+# the feedback is shown for exactly as many frames as the delay for the
+# chosen key
+def test_delay_frames():
+
+    states = TrialStateMachine()
+    states.new_round({'h': 90, 't': 60})
+    states.update(keys('h'))
+
+    frames = 1
+    while states.update(keys()) is None:
+        frames += 1
+    assert frames == 90
+    assert states.phase == 'feedback'
+
+
+def test_quit():
+
+    for phase in ['round', 'feedback', 'info']:
+        states = TrialStateMachine()
+        states.phase = phase
+        assert states.update(keys('q')) == 'quit'
+
+    # no quitting during the delay
+    states = TrialStateMachine()
+    states.new_round({'h': 5, 't': 5})
+    states.update(keys('h'))
+    assert states.update(keys('q')) is None
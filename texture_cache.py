@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Penny images scaled to the size they are displayed at.
+
+The penny images are much bigger than they appear on the screen (and of
+different sizes), so decoding them and uploading them as textures takes
+longer and needs more memory of the graphics card than necessary.
+cached_texture scales an image down to the amount of pixels it covers in the
+window once and saves the result in a cache folder. The name of the cached
+file contains a hash of the original image and the size in pixels, so a
+changed image or a different window size gets a new file, and the game loads
+the small cached file from then on.
+
+PIL (which comes with psychopy) is only imported if an image actually has to
+be scaled. Without it, the original image is used.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import hashlib
+import math
+import os
+
+# %% functions
+
+
+def target_size_function(window_size, size):
+    """
+    Computes how many pixels a stimulus covers in the window
+
+    Parameters
+    ----------
+    window_size : tuple of int
+        width and height of the window in pixels, e.g. win.size.
+    size : tuple of float
+        width and height of the stimulus in normalized units (-1 to 1).
+
+    Returns
+    -------
+    target_size : tuple of int
+        width and height of the stimulus in pixels.
+    """
+    return tuple(max(1, math.ceil(abs(s) / 2 * pixels))
+                 for s, pixels in zip(size, window_size))
+
+
+def file_hash_function(path):
+    """
+    Returns the sha1 hash of the content of a file
+    """
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def cache_path_function(source, target_size, cache_folder):
+    """
+    Returns the path of the cached version of source in target_size, named
+    after the original image, its hash and the size in pixels.
+    """
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_folder, "{}_{}_{}x{}.png".format(
+        name, file_hash_function(source)[:16], *target_size))
+
+
+def cached_texture(source, target_size, cache_folder):
+    """
+    Returns the path of a version of the image source scaled to target_size,
+    creating it if it isn't cached yet.
+
+    Parameters
+    ----------
+    source : str
+        path of the original image.
+    target_size : tuple of int
+        width and height in pixels (see target_size_function).
+    cache_folder : str
+        folder of the scaled images, created if necessary.
+
+    Returns
+    -------
+    path : str
+        path of the scaled image, or source if PIL isn't available or the
+        image isn't bigger than target_size anyway.
+    """
+    path = cache_path_function(source, target_size, cache_folder)
+    if os.path.exists(path):
+        return path
+    try:
+        from PIL import Image
+    except ImportError:
+        return source
+
+    with Image.open(source) as image:
+        if image.width <= target_size[0] and image.height <= target_size[1]:
+            return source
+        scaled = image.convert('RGBA').resize(target_size, Image.LANCZOS)
+    os.makedirs(cache_folder, exist_ok=True)
+    # written to a temporary file first, so that an interrupted game never
+    # leaves a broken image in the cache
+    scaled.save(path + '.tmp', format='PNG')
+    os.replace(path + '.tmp', path)
+    return path
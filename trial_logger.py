@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Logging of every round of the matching pennies game.
+
+The TrialLogger only puts the data of a round into a buffer in memory. A
+background thread writes the buffered rounds to a csv file in batches, so
+writing to the disk never happens between the subject's keypress and the
+feedback on the screen.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% imports
+
+import atexit
+import csv
+import threading
+from collections import deque
+
+# %% logger
+
+
+class TrialLogger:
+    """
+    Writes one row per round to a csv file in the background.
+
+    The file is also completed when the program ends in any other way than
+    calling close, e.g. by pressing 'escape' (core.quit) or by an error, as
+    close is registered to run at exit.
+
+    Parameters
+    ----------
+    path : str
+        path of the csv file. An existing file is overwritten.
+    batch_size : int, optional
+        the background thread writes as soon as this many rounds are
+        buffered. The default is 20.
+    flush_interval : float, optional
+        seconds after which buffered rounds are written even if there are
+        less than batch_size of them. The default is 5.
+    extra_columns : tuple of str, optional
+        names of additional columns after the default ones, e.g.
+        RunningStats.columns (see running_stats.py). The default is ().
+    """
+
+    columns = ('round', 'choice_subject', 'choice_computer', 'cut_off',
+               'result', 'rt', 't_round_onset', 't_response', 'key_duration')
+
+    def __init__(self, path, batch_size=20, flush_interval=5,
+                 extra_columns=()):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # appending to and popping from a deque is thread-safe, so the game
+        # and the background thread don't have to wait for each other
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._closed = False
+
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns + tuple(extra_columns))
+
+        # the thread is a daemon so that it never keeps the program alive,
+        # close (also run at exit) writes whatever it left behind
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, rounds, choice_subject, choice_computer, cut_off, result,
+            rt, t_round_onset, t_response, key_duration=None, extra=()):
+        """
+        Buffers the data of one round. Nothing is written to the disk here.
+
+        Parameters
+        ----------
+        rounds : int
+            number of the round.
+        choice_subject, choice_computer : str
+            the decisions of the subject and the computer.
+        cut_off : float
+            the cut-off used for the computer's choice.
+        result : str
+            'win' or 'loss' from the subject's point of view.
+        rt : float
+            reaction time of the subject in seconds.
+        t_round_onset, t_response : float
+            times of the display of the round info and of the keypress.
+        key_duration : float, optional
+            how long the key was held down in seconds. The default is None,
+            i.e. unknown.
+        extra : tuple, optional
+            the values of the extra_columns. The default is ().
+        """
+        self._buffer.append((rounds, choice_subject, choice_computer, cut_off,
+                             result, rt, t_round_onset, t_response,
+                             key_duration) + tuple(extra))
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Asks the background thread to write all buffered rounds right away.
+        """
+        self._wake.set()
+
+    def close(self):
+        """
+        Stops the background thread and writes all remaining rounds. Can be
+        called several times.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._write_buffer()
+        self._file.close()
+        # a closed logger doesn't have to be kept alive until the exit
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_buffer()
+
+    def _write_buffer(self):
+        rows = []
+        while self._buffer:
+            rows.append(self._buffer.popleft())
+        if rows:
+            self._writer.writerows(rows)
+            self._file.flush()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Phases of a round of the matching pennies game, counted in frames.
+
+The main program draws the screen of the current phase and flips the window
+once per frame. After every flip it passes the keys pressed since the last
+frame to TrialStateMachine.update, which decides when the next phase starts.
+Waiting times are counted in frames instead of using core.wait, so the
+feedback is shown for an exact amount of refreshes of the screen and no key
+is lost or taken for the wrong screen.
+
+The phases of a round are:
+- 'round': the round info is shown until the subject presses 'h' or 't'.
+- 'delay': the feedback is shown for a fixed amount of frames, keys pressed
+    during that time are discarded.
+- 'feedback': the feedback is still shown until any key is pressed.
+- 'info': the infos of the game so far are shown until any key is pressed,
+    then the next round starts.
+Pressing 'q' in the phases 'round', 'feedback' or 'info' leads to the phase
+'quit'.
+
+The code has been checked to stick to the PEP 8 conventions using pycodestyle.
+"""
+# %% state machine
+
+
+class TrialStateMachine:
+    """
+    Keeps track of the phase of the current round.
+
+    Attributes
+    ----------
+    phase : str
+        the current phase, 'round', 'delay', 'feedback', 'info' or 'quit'.
+    frames : int
+        how many frames the current phase has been shown.
+    key : object
+        the key that started the current phase (None for 'delay'). Keys are
+        objects with the attribute name, e.g. psychopy's KeyPress.
+    choice_key : object
+        the key the subject chose heads or tails with in the current round.
+    discarded : int
+        the amount of keys discarded during the delay of the current round.
+    """
+
+    def __init__(self):
+        self.new_round({})
+
+    def new_round(self, delay_frames):
+        """
+        Starts the phase 'round' of a new round.
+
+        Parameters
+        ----------
+        delay_frames : dict
+            for 'h' and 't', the amount of frames the feedback is shown before
+            the subject can continue if they choose that key.
+        """
+        self.phase = 'round'
+        self.frames = 0
+        self.key = None
+        self.choice_key = None
+        self.discarded = 0
+        self.delay_frames = delay_frames
+
+    def update(self, keys):
+        """
+        Moves on by one frame. Has to be called once after every flip.
+
+        Parameters
+        ----------
+        keys : list
+            the keys pressed since the previous frame, oldest first.
+
+        Returns
+        -------
+        phase : str or None
+            the new phase if it changed in this frame, otherwise None. The new
+            phase is shown from the next frame on.
+        """
+        self.frames += 1
+
+        if self.phase == 'round':
+            for key in keys:
+                if key.name == 'q':
+                    return self._change('quit', key)
+                if key.name in ['h', 't']:
+                    self.choice_key = key
+                    return self._change('delay', key)
+
+        elif self.phase == 'delay':
+            self.discarded += len(keys)
+            if self.frames >= self.delay_frames[self.choice_key.name]:
+                return self._change('feedback', None)
+
+        elif self.phase in ['feedback', 'info'] and keys:
+            key = keys[0]
+            if key.name == 'q':
+                return self._change('quit', key)
+            if self.phase == 'feedback':
+                return self._change('info', key)
+            return self._change('round', key)
+
+        return None
+
+    def _change(self, phase, key):
+        self.phase = phase
+        self.frames = 0
+        self.key = key
+        return phase